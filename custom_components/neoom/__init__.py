@@ -4,14 +4,22 @@ Diese Integration verbindet Home Assistant mit den Systemen von neoom.
 Sie stellt eine hybride Verbindung her:
 1. Eine Cloud-Verbindung zur neoom AI API für z.B. Tarifdaten (selten aktualisiert).
 2. Eine lokale Netzwerkverbindung zum BEAAM Gateway für Live-Energiedaten (oft aktualisiert).
+
+Ein Eintrag kann mehrere Sites und mehrere BEAAM Gateways verwalten. Alle Abfragen
+laufen über einen gemeinsamen Taktgeber mit versetzten Phasen (siehe scheduler.py)
+und einen gemeinsamen Verbindungs-Pool mit Gesamtbegrenzung (siehe client.py).
 """
 
-from typing import Dict, Any
+import asyncio
+from typing import Any, Dict, List, Union
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from .const import (
     DOMAIN,
@@ -19,9 +27,38 @@ from .const import (
     CONF_SITE_ID,
     CONF_BEAAM_IP,
     CONF_BEAAM_KEY,
+    CONF_GATEWAYS,
+    CONF_SITES,
+    CONF_SCAN_INTERVAL_FAST,
+    CONF_SCAN_INTERVAL_NORMAL,
+    CONF_SCAN_INTERVAL_SLOW,
+    CONF_SCAN_INTERVAL_FLOW,
+    CONF_TRANSPORT,
+    CONF_CUSTOM_UNITS,
+    CONF_DEAD_BANDS,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_INTEGRATE_POWER,
+    CONF_ADAPTIVE_POLLING,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_MAX_DATA_AGE,
+    DEFAULT_DEAD_BANDS,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_FLOW,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
     LOGGER,
+    STORAGE_VERSION,
+    TRANSPORT_AUTO,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
 )
 from .coordinator import NeoomCloudCoordinator, NeoomLocalCoordinator
+from .devices import async_register_devices, beaam_config_storage_key, gateway_id
+from .publish_filter import dead_bands_from_option
+from .units import unit_mapper_from_option
 
 # Definiere die unterstützten Plattformen, die von dieser Integration geladen werden.
 # Wir unterstützen Sensoren (nur-lesen), Number-Entitäten (Zahleneingabe/Slider)
@@ -29,6 +66,43 @@ from .coordinator import NeoomCloudCoordinator, NeoomLocalCoordinator
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.NUMBER, Platform.SELECT]
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migriert die Daten eines Eintrags auf die aktuelle Version.
+
+    Version 1 kannte genau eine Site und ein Gateway direkt in `entry.data`.
+    Ab Version 2 stehen Sites und Gateways in Listen; die bisherigen Werte werden
+    zum jeweils ersten Eintrag, sodass Geräte, Entitäten und Cache erhalten bleiben.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der zu migrierende Konfigurationseintrag.
+
+    Returns:
+        True, wenn die Migration erfolgreich war.
+    """
+    if entry.version == 1:
+        data = dict(entry.data)
+        new_data = {
+            CONF_SITES: [
+                {
+                    CONF_SITE_ID: data.pop(CONF_SITE_ID),
+                    CONF_CLOUD_TOKEN: data.pop(CONF_CLOUD_TOKEN),
+                }
+            ],
+            CONF_GATEWAYS: [
+                {
+                    CONF_BEAAM_IP: data.pop(CONF_BEAAM_IP),
+                    CONF_BEAAM_KEY: data.pop(CONF_BEAAM_KEY),
+                }
+            ],
+            **data,
+        }
+        hass.config_entries.async_update_entry(entry, data=new_data, version=2)
+        LOGGER.info("neoom AI Eintrag %s auf Version 2 migriert.", entry.entry_id)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Richtet eine neoom AI Instanz basierend auf einem Konfigurationseintrag ein.
 
@@ -46,37 +120,96 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     LOGGER.debug("Starte das Setup für den neoom AI Eintrag: %s", entry.entry_id)
 
-    # 1. Cloud Coordinator instanziieren
+    # 1. Cloud Coordinators instanziieren (einer je Site)
     # Der Cloud-Coordinator holt Daten von der neoom AI API.
-    cloud_coordinator = NeoomCloudCoordinator(
-        hass,
-        token=entry.data[CONF_CLOUD_TOKEN],
-        site_id=entry.data[CONF_SITE_ID],
-    )
+    cloud_coordinators: List[NeoomCloudCoordinator] = [
+        NeoomCloudCoordinator(
+            hass,
+            token=site[CONF_CLOUD_TOKEN],
+            site_id=site[CONF_SITE_ID],
+        )
+        for site in entry.data[CONF_SITES]
+    ]
 
-    # 2. Local Coordinator instanziieren
+    # 2. Local Coordinators instanziieren (einer je Gateway)
     # Der Local-Coordinator holt Echtzeit-Daten direkt vom lokalen BEAAM Gateway im Netzwerk.
-    local_coordinator = NeoomLocalCoordinator(
-        hass,
-        ip=entry.data[CONF_BEAAM_IP],
-        key=entry.data[CONF_BEAAM_KEY],
+    # Die Intervalle der Abfrage-Stufen können über die Optionen angepasst werden;
+    # nicht gesetzte Stufen verwenden die Standardwerte des Koordinators.
+    # Die Optionen gelten für alle Gateways des Eintrags.
+    poll_intervals: Dict[str, int] = {
+        tier: entry.options[option]
+        for tier, option in (
+            (POLL_TIER_FAST, CONF_SCAN_INTERVAL_FAST),
+            (POLL_TIER_NORMAL, CONF_SCAN_INTERVAL_NORMAL),
+            (POLL_TIER_SLOW, CONF_SCAN_INTERVAL_SLOW),
+        )
+        if option in entry.options
+    }
+    unit_mapper = unit_mapper_from_option(entry.options.get(CONF_CUSTOM_UNITS))
+    dead_bands = dead_bands_from_option(entry.options.get(CONF_DEAD_BANDS, DEFAULT_DEAD_BANDS))
+    local_coordinators: List[NeoomLocalCoordinator] = [
+        NeoomLocalCoordinator(
+            hass,
+            entry_id=entry.entry_id,
+            ip=gateway[CONF_BEAAM_IP],
+            key=gateway[CONF_BEAAM_KEY],
+            poll_intervals=poll_intervals,
+            flow_interval=entry.options.get(CONF_SCAN_INTERVAL_FLOW, DEFAULT_SCAN_INTERVAL_FLOW),
+            transport_mode=entry.options.get(CONF_TRANSPORT, TRANSPORT_AUTO),
+            unit_mapper=unit_mapper,
+            gateway_id=gateway_id(index, gateway[CONF_BEAAM_IP]),
+            dead_bands=dead_bands,
+            min_publish_interval=entry.options.get(
+                CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+            ),
+            integrate_power=entry.options.get(CONF_INTEGRATE_POWER, True),
+            adaptive_polling=entry.options.get(CONF_ADAPTIVE_POLLING, True),
+            interval_bounds=(
+                entry.options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN),
+                entry.options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+            ),
+            max_data_age=entry.options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+        )
+        for index, gateway in enumerate(entry.data[CONF_GATEWAYS])
+    ]
+
+    # Die zuletzt bekannte Gerätestruktur aller Gateways parallel aus dem Cache laden. So
+    # können die Plattformen ihre Entitäten sofort anlegen, auch wenn ein Gateway beim
+    # Start nicht erreichbar ist.
+    await asyncio.gather(
+        *(local_coordinator.async_load_cached_config() for local_coordinator in local_coordinators)
     )
 
-    # Initiale Datenabfrage (Refresh) für beide Coordinators anstoßen
-    # Wir rufen async_config_entry_first_refresh auf, um sicherzustellen,
-    # dass beim Start von Home Assistant erste Daten vorhanden sind.
-    await cloud_coordinator.async_config_entry_first_refresh()
-
-    try:
-        # Die lokale Abfrage könnte fehlschlagen, wenn das Gateway gerade offline ist.
-        # Wir loggen den Fehler, lassen den Start aber nicht komplett scheitern.
-        await local_coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        LOGGER.warning(
-            "Fehler beim initialen Abruf der lokalen BEAAM Daten: %s. "
-            "Die Integration wird weiterhin mit den Cloud-Daten gestartet und versucht später einen Neuaufbau der Verbindung.",
-            err,
-        )
+    # Initiale Datenabfrage: Nur Gateways ohne zwischengespeicherte Gerätestruktur müssen
+    # vor dem Einrichten der Plattformen abgefragt werden, da ohne sie keine Entitäten
+    # angelegt werden können. Diese Abfragen laufen parallel. Alle übrigen Gateways und die
+    # Cloud werden im Hintergrund abgefragt, damit eine langsame oder nicht erreichbare
+    # Cloud den Start nicht verzögert; ihre Entitäten sind bis zur ersten Antwort nicht verfügbar.
+    uncached: List[NeoomLocalCoordinator] = [
+        local_coordinator for local_coordinator in local_coordinators
+        if local_coordinator.beaam_config is None
+    ]
+    results = await asyncio.gather(
+        *(local_coordinator.async_config_entry_first_refresh() for local_coordinator in uncached),
+        return_exceptions=True,
+    )
+    # Ein abgewiesener API Key bricht die Einrichtung ab, damit Home Assistant die
+    # erneute Anmeldung startet, statt den Eintrag mit toten Entitäten zu laden.
+    for result in results:
+        if isinstance(result, ConfigEntryAuthFailed):
+            raise result
+    for local_coordinator, result in zip(uncached, results):
+        if isinstance(result, (ConfigEntryNotReady, UpdateFailed)):
+            # Die lokale Abfrage kann fehlschlagen, wenn das Gateway gerade offline ist.
+            # Wir loggen den Fehler, lassen den Start aber nicht komplett scheitern.
+            LOGGER.warning(
+                "Fehler beim initialen Abruf der lokalen BEAAM Daten von %s: %s. "
+                "Die Integration wird trotzdem gestartet und versucht später einen Neuaufbau der Verbindung.",
+                local_coordinator.ip,
+                result,
+            )
+        elif isinstance(result, BaseException):
+            raise result
 
     # Bereite den Speicherort in hass.data für unsere Domain vor, falls noch nicht geschehen.
     hass.data.setdefault(DOMAIN, {})
@@ -84,40 +217,131 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Speichere unsere Coordinators unter der Eintrags-ID, damit die Plattformen (Sensor, Number)
     # später darauf zugreifen können.
     hass.data[DOMAIN][entry.entry_id] = {
-        "cloud": cloud_coordinator,
-        "local": local_coordinator,
+        "clouds": cloud_coordinators,
+        "locals": local_coordinators,
     }
 
     # --- EXPLIZITE GERÄTE-REGISTRIERUNG ---
-    # Wir registrieren das BEAAM Gateway vorab im Device Registry von Home Assistant.
-    # Dies ist wichtig, da spätere Geräte (z.B. Wechselrichter, Batterie) über das Attribut
-    # 'via_device' eine Verbindung aufbauen, um anzuzeigen, dass sie *über* das BEAAM Gerät kommunizieren.
-    # Wenn das BEAAM-Gerät hier nicht existiert, warnt Home Assistant, dass ein ungültiges via_device
-    # angegeben wurde.
-    device_registry = dr.async_get(hass)
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, "BEAAM Gateway")},  # Eindeutige ID für dieses Gerät.
-        manufacturer="neoom",
-        name="BEAAM Gateway",
-        model="BEAAM Edge Controller",
-        configuration_url=f"http://{entry.data[CONF_BEAAM_IP]}",
+    # Alle Geräte werden vorab in einem Durchgang im Device Registry angelegt, bevor die
+    # Plattformen ihre Entitäten registrieren. Die BEAAM Gateways stehen dabei an erster
+    # Stelle, da die übrigen Geräte (z.B. Wechselrichter, Batterie) über 'via_device'
+    # darauf verweisen, um anzuzeigen, dass sie *über* das BEAAM Gerät kommunizieren.
+    # Existiert es nicht, warnt Home Assistant vor einem ungültigen via_device.
+    async_register_devices(
+        hass,
+        entry,
+        [
+            *(local_coordinator.device_info for local_coordinator in local_coordinators),
+            *(cloud_coordinator.device_info for cloud_coordinator in cloud_coordinators),
+            *(
+                device_info
+                for local_coordinator in local_coordinators
+                for device_info in local_coordinator.thing_device_infos.values()
+            ),
+        ],
     )
-    LOGGER.debug("BEAAM Gateway im Device Registry angelegt oder abgerufen.")
+    LOGGER.debug("Geräte von %d Gateways im Device Registry angelegt oder abgerufen.", len(local_coordinators))
 
     # Weist Home Assistant an, die in PLATFORMS definierten Komponenten (Sensor, Number, Select)
     # asynchron für diesen Eintrag einzurichten.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Regelmäßige Abfragen beim gemeinsamen Taktgeber anmelden. Er versetzt die Takte
+    # aller Sites und Gateways gegeneinander, damit ihre Anfragen nicht gleichzeitig starten.
+    # Noch nicht abgefragte Koordinatoren melden sich erst nach ihrer ersten Abfrage an,
+    # die im Hintergrund läuft und beim Entladen des Eintrags abgebrochen wird.
+    for coordinator in (*cloud_coordinators, *local_coordinators):
+        if coordinator.data is None:
+            entry.async_create_background_task(
+                hass,
+                _async_first_refresh_and_poll(coordinator),
+                name=f"{DOMAIN} first refresh {coordinator.name}",
+            )
+        else:
+            coordinator.async_start_polling()
+
+    for local_coordinator in local_coordinators:
+        # Schnellen Pfad für den Energiefluss der Site starten (Polling bzw. Push-Kanal, falls
+        # das Gateway ihn anbietet). Er läuft unabhängig vom regulären Zyklus und wird beim
+        # Entladen mit dem Koordinator beendet.
+        local_coordinator.async_start_flow_stream()
+
+        # Die Plattformen gleichen ihre Entitäten selbst ab, hier werden nur die Geräte abgeglichen.
+        entry.async_on_unload(
+            local_coordinator.async_add_config_listener(
+                _async_device_sync_listener(hass, entry, local_coordinator)
+            )
+        )
+
+    # Geänderte Optionen (z.B. Abfrage-Intervalle) werden durch Neuladen des Eintrags übernommen.
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     LOGGER.info("neoom AI Einrichtung erfolgreich abgeschlossen.")
     return True
 
 
+async def _async_first_refresh_and_poll(
+    coordinator: Union[NeoomCloudCoordinator, NeoomLocalCoordinator]
+) -> None:
+    """Führt die erste Abfrage eines Koordinators aus und meldet danach die regelmäßige Abfrage an.
+
+    Fehler werden vom Koordinator protokolliert und machen seine Entitäten nicht
+    verfügbar; ein ungültiges Token bzw. ein abgewiesener API Key startet die erneute
+    Anmeldung. Die Einrichtung des Eintrags ist davon nicht betroffen.
+
+    Args:
+        coordinator: Der Cloud- oder lokale Koordinator.
+    """
+    await coordinator.async_refresh()
+    coordinator.async_start_polling()
+
+
+def _async_device_sync_listener(
+    hass: HomeAssistant, entry: ConfigEntry, local_coordinator: NeoomLocalCoordinator
+) -> CALLBACK_TYPE:
+    """Erzeugt den Listener, der die Geräte eines Gateways mit seiner Gerätestruktur abgleicht.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag.
+        local_coordinator: Der Koordinator des Gateways.
+    """
+    device_registry = dr.async_get(hass)
+
+    @callback
+    def _async_sync_devices() -> None:
+        """Gleicht die Geräte nach einer Änderung der Gerätestruktur ab.
+
+        Neue Geräte werden gesammelt angelegt, Geräte, die nicht mehr am BEAAM hängen, entfernt.
+        """
+        async_register_devices(hass, entry, local_coordinator.thing_device_infos.values())
+        gateway_device = device_registry.async_get_device(
+            identifiers={(DOMAIN, local_coordinator.gateway_id)}
+        )
+        if gateway_device is None:
+            return
+        things: Dict[str, Any] = local_coordinator.thing_device_infos
+        for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+            if device.via_device_id != gateway_device.id:
+                continue
+            if not any(
+                domain == DOMAIN and identifier in things
+                for domain, identifier in device.identifiers
+            ):
+                LOGGER.info("Entferne nicht mehr vorhandenes BEAAM Gerät: %s", device.name)
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+    return _async_sync_devices
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Entlädt einen Konfigurationseintrag.
     
     Wird aufgerufen, wenn der Benutzer die Integration über die UI löscht
-    oder neu lädt. Räumt die verwendeten Ressourcen (z.B. HTTP-Sessions) auf.
+    oder neu lädt. Die HTTP-Session gehört Home Assistant und wird von der
+    Integration nicht geschlossen, da sie mit anderen Einträgen geteilt wird.
     
     Args:
         hass: Die Home Assistant Instanz.
@@ -131,11 +355,35 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         # Wenn erfolgreich, entferne unsere gespeicherten Coordinators aus hass.data
         data: Dict[str, Any] = hass.data[DOMAIN].pop(entry.entry_id)
-        
-        # Schließe die HTTP-Sessions sauber
-        await data["cloud"].close()
-        await data["local"].close()
+
+        # Abfragen beim Taktgeber abmelden, noch wartende Steuerungsbefehle verwerfen und Timer beenden
+        for coordinator in (*data["clouds"], *data["locals"]):
+            await coordinator.async_shutdown()
         
         LOGGER.info("neoom AI Eintrag %s erfolgreich entladen.", entry.entry_id)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Lädt den Konfigurationseintrag neu, nachdem die Optionen geändert wurden.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag mit den neuen Optionen.
+    """
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Entfernt die persistenten Daten eines gelöschten Konfigurationseintrags.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der gelöschte Konfigurationseintrag.
+    """
+    for index, gateway in enumerate(entry.data.get(CONF_GATEWAYS, [])):
+        ip = gateway[CONF_BEAAM_IP]
+        await Store(
+            hass, STORAGE_VERSION, beaam_config_storage_key(entry.entry_id, gateway_id(index, ip), ip)
+        ).async_remove()
@@ -0,0 +1,117 @@
+"""Adaptive Regelung des Abfrage-Intervalls eines BEAAM Gateways.
+
+Die Intervalle der Abfrage-Stufen sind Ausgangswerte. Der Regler leitet nach jedem
+Zyklus, in dem Geräte abgefragt wurden, einen gemeinsamen Faktor ab, mit dem sie
+multipliziert werden:
+
+* Antwortet das Gateway langsam oder mit Fehlern, wird der Faktor verdoppelt, um es zu
+  entlasten (schnelles Zurückweichen). Als Fehler zählen nur solche des Gateways selbst
+  (Site-Status, überschrittene Frist des Zyklus, Ausfall der meisten Geräte). Ein
+  einzelnes defektes Gerät behandelt allein sein Circuit Breaker (siehe health.py),
+  damit es die Abfrage der gesunden Geräte nicht verlangsamt.
+* Ändert sich kaum etwas (z.B. nachts ohne PV), wächst der Faktor langsam.
+* Ändern sich viele Werte und antwortet das Gateway schnell, sinkt der Faktor langsam.
+* Sonst nähert er sich wieder 1, also den eingestellten Intervallen.
+
+Antwortzeit und Änderungsrate werden geglättet, damit einzelne Ausreißer die
+Intervalle nicht springen lassen.
+"""
+
+from typing import Any, Dict, Optional
+
+from .const import (
+    ADAPTIVE_ACTIVE_CHANGE_RATIO,
+    ADAPTIVE_FACTOR_MAX,
+    ADAPTIVE_FACTOR_MIN,
+    ADAPTIVE_FAST_LATENCY,
+    ADAPTIVE_IDLE_CHANGE_RATIO,
+    ADAPTIVE_SLOW_LATENCY,
+)
+
+# Gewicht eines neuen Messwerts in der exponentiellen Glättung.
+_SMOOTHING: float = 0.3
+
+
+class AdaptivePollController:
+    """Leitet aus Antwortzeit und Änderungsrate den Faktor der Abfrage-Intervalle ab."""
+
+    __slots__ = ("factor", "_enabled", "_min_factor", "_max_factor", "_latency", "_change_ratio")
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        min_factor: float = ADAPTIVE_FACTOR_MIN,
+        max_factor: float = ADAPTIVE_FACTOR_MAX,
+    ) -> None:
+        """Initialisiert den Regler mit Faktor 1 (eingestellte Intervalle).
+
+        Args:
+            enabled: False hält den Faktor dauerhaft bei 1.
+            min_factor: Kleinster Faktor (kürzeste Intervalle).
+            max_factor: Größter Faktor (längste Intervalle).
+        """
+        self.factor: float = 1.0
+        self._enabled = enabled
+        self._min_factor = min_factor if enabled else 1.0
+        self._max_factor = max_factor if enabled else 1.0
+        # Geglättete mittlere Antwortzeit (Sekunden) und Änderungsrate (Anteil 0..1).
+        self._latency: Optional[float] = None
+        self._change_ratio: Optional[float] = None
+
+    @property
+    def min_factor(self) -> float:
+        """Kleinster möglicher Faktor."""
+        return self._min_factor
+
+    def record(self, latency: Optional[float], change_ratio: Optional[float], failed: bool) -> float:
+        """Wertet einen Zyklus aus und passt den Faktor an.
+
+        Args:
+            latency: Mittlere Antwortzeit (Sekunden) der Anfragen des Zyklus (None, wenn
+                keine Anfrage erfolgreich war).
+            change_ratio: Anteil der abgefragten Datenpunkte, deren Wert sich geändert hat
+                (None, wenn keine Geräte abgefragt wurden).
+            failed: True, wenn das Gateway als Ganzes nicht oder zu spät geantwortet hat.
+
+        Returns:
+            Der neue Faktor.
+        """
+        if not self._enabled:
+            return self.factor
+
+        if latency is not None:
+            self._latency = latency if self._latency is None else (
+                self._latency + _SMOOTHING * (latency - self._latency)
+            )
+        if change_ratio is not None:
+            self._change_ratio = change_ratio if self._change_ratio is None else (
+                self._change_ratio + _SMOOTHING * (change_ratio - self._change_ratio)
+            )
+
+        factor = self.factor
+        if failed or (self._latency is not None and self._latency >= ADAPTIVE_SLOW_LATENCY):
+            factor *= 2
+        elif self._change_ratio is None:
+            pass
+        elif self._change_ratio < ADAPTIVE_IDLE_CHANGE_RATIO:
+            factor *= 1.25
+        elif (
+            self._change_ratio >= ADAPTIVE_ACTIVE_CHANGE_RATIO
+            and self._latency is not None
+            and self._latency <= ADAPTIVE_FAST_LATENCY
+        ):
+            factor *= 0.8
+        else:
+            factor += (1.0 - factor) * 0.25
+
+        self.factor = min(max(factor, self._min_factor), self._max_factor)
+        return self.factor
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt den Zustand des Reglers zurück (für den Diagnose-Download)."""
+        return {
+            "enabled": self._enabled,
+            "factor": round(self.factor, 3),
+            "latency_ms": round(self._latency * 1000, 1) if self._latency is not None else None,
+            "change_ratio": round(self._change_ratio, 3) if self._change_ratio is not None else None,
+        }
@@ -0,0 +1,115 @@
+"""Gemeinsamer HTTP-Verbindungs-Pool für Cloud- und Gateway-Anfragen.
+
+Alle Koordinatoren (auch über mehrere Konfigurationseinträge hinweg) verwenden
+die von Home Assistant verwaltete ClientSession. Diese hält Verbindungen per
+Keep-Alive offen und cached DNS-Auflösungen, sodass nicht bei jedem Zyklus neue
+TCP-Verbindungen aufgebaut werden müssen. Zusätzlich begrenzt der Pool die Anzahl
+gleichzeitiger Anfragen je Host, damit das BEAAM Gateway beim parallelen Abruf
+vieler Geräte nicht überlastet wird, sowie die Anzahl gleichzeitiger Anfragen
+insgesamt, wenn mehrere Gateways und Sites abgefragt werden.
+"""
+
+import asyncio
+from types import TracebackType
+from typing import Dict, Optional, Type
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN, MAX_CONCURRENT_REQUESTS_PER_HOST, MAX_CONCURRENT_REQUESTS_TOTAL
+
+# Schlüssel in hass.data, unter dem der gemeinsame Pool abgelegt wird.
+DATA_HTTP_POOL: str = f"{DOMAIN}_http_pool"
+
+
+class RequestLimit:
+    """Begrenzt die Anfragen an einen Host und zugleich die Anfragen insgesamt.
+
+    Wird wie eine Semaphore mit `async with` verwendet. Zuerst wird ein Platz beim
+    Host belegt, dann ein Platz im Gesamtkontingent, damit Anfragen an ein
+    ausgelastetes Gateway keine Plätze der anderen Gateways blockieren.
+    """
+
+    __slots__ = ("_host", "_total")
+
+    def __init__(self, host: asyncio.Semaphore, total: asyncio.Semaphore) -> None:
+        """Initialisiert die Begrenzung.
+
+        Args:
+            host: Die Semaphore des Hosts.
+            total: Die Semaphore des Gesamtkontingents.
+        """
+        self._host = host
+        self._total = total
+
+    async def __aenter__(self) -> None:
+        """Belegt je einen Platz beim Host und im Gesamtkontingent."""
+        await self._host.acquire()
+        try:
+            await self._total.acquire()
+        except BaseException:
+            self._host.release()
+            raise
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Gibt beide Plätze wieder frei."""
+        self._total.release()
+        self._host.release()
+
+
+class NeoomHttpPool:
+    """Teilt eine HTTP-Session und begrenzt die Parallelität je Host."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        limit_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+        limit_total: int = MAX_CONCURRENT_REQUESTS_TOTAL,
+    ) -> None:
+        """Initialisiert den Pool.
+
+        Args:
+            session: Die (von Home Assistant verwaltete) HTTP-Session.
+            limit_per_host: Maximale Anzahl gleichzeitiger Anfragen je Host.
+            limit_total: Maximale Anzahl gleichzeitiger Anfragen insgesamt.
+        """
+        self.session = session
+        self._limit_per_host = limit_per_host
+        self._total_limit = asyncio.Semaphore(limit_total)
+        self._host_limits: Dict[str, RequestLimit] = {}
+
+    def host_limit(self, host: str) -> RequestLimit:
+        """Gibt die Begrenzung der gleichzeitigen Anfragen an einen Host zurück.
+
+        Alle Koordinatoren, die denselben Host ansprechen, teilen sich dieselbe Begrenzung;
+        alle Hosts zusammen teilen sich das Gesamtkontingent.
+
+        Args:
+            host: Hostname oder IP-Adresse (z.B. die IP des BEAAM Gateways).
+        """
+        if host not in self._host_limits:
+            self._host_limits[host] = RequestLimit(
+                asyncio.Semaphore(self._limit_per_host), self._total_limit
+            )
+        return self._host_limits[host]
+
+
+def async_get_http_pool(hass: HomeAssistant) -> NeoomHttpPool:
+    """Gibt den gemeinsamen HTTP-Pool zurück und legt ihn beim ersten Aufruf an.
+
+    Die Session selbst gehört Home Assistant und wird beim Beenden automatisch
+    geschlossen; sie darf daher nicht von der Integration geschlossen werden.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+    """
+    if DATA_HTTP_POOL not in hass.data:
+        hass.data[DATA_HTTP_POOL] = NeoomHttpPool(async_get_clientsession(hass))
+    return hass.data[DATA_HTTP_POOL]
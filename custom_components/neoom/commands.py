@@ -0,0 +1,143 @@
+"""Bündelung von Steuerungsbefehlen an das BEAAM Gateway.
+
+Zieht der Benutzer einen Slider oder setzt eine Automation mehrere Werte kurz
+hintereinander, würde jeder Wert einen eigenen POST und einen vollständigen
+Refresh auslösen. Stattdessen werden Befehle kurz gesammelt:
+- mehrere Schreibvorgänge auf denselben Schlüssel werden zusammengefasst
+  (der letzte Wert gewinnt),
+- alle wartenden Befehle für dasselbe Thing gehen in einem einzigen Request raus
+  (die BEAAM API akzeptiert ein JSON-Array),
+- nach dem gesamten Stapel wird genau einmal aktualisiert.
+
+Es ist immer höchstens ein Stapel unterwegs. Befehle, die währenddessen eintreffen,
+gehen mit dem nächsten Stapel raus, der nach dem laufenden gestartet wird.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import COMMAND_DEBOUNCE_DELAY, DOMAIN
+
+
+class CommandBatcher:
+    """Sammelt Befehle je Thing und sendet sie gebündelt nach einer kurzen Wartezeit."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send_commands: Callable[[str, List[Dict[str, Any]]], Awaitable[None]],
+        after_batch: Callable[[List[str]], Awaitable[None]],
+        delay: float = COMMAND_DEBOUNCE_DELAY,
+    ) -> None:
+        """Initialisiert den Sammler.
+
+        Args:
+            hass: Die Home Assistant Instanz.
+            send_commands: Sendet eine Liste von Befehlen ({"key", "value"}) an ein Thing.
+            after_batch: Wird einmal je Stapel mit den erfolgreich beschriebenen Things aufgerufen.
+            delay: Wartezeit (Sekunden), in der weitere Befehle gesammelt werden.
+        """
+        self._hass = hass
+        self._send_commands = send_commands
+        self._after_batch = after_batch
+        self._delay = delay
+        # Wartende Befehle je Thing: {thing_id: {key: value}}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Je Thing ein Future, auf das alle Aufrufer des aktuellen Stapels warten.
+        self._futures: Dict[str, asyncio.Future[None]] = {}
+        # Sammel-Timer bis zum nächsten Stapel bzw. der gerade gesendete Stapel.
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task[None]] = None
+
+    async def async_send(self, thing_id: str, key: str, value: Any) -> None:
+        """Reiht einen Befehl ein und wartet, bis der zugehörige Stapel gesendet wurde.
+
+        Args:
+            thing_id: Die ID des Ziel-Things.
+            key: Der Schlüssel des Parameters.
+            value: Der neue Wert.
+
+        Raises:
+            Exception: Wenn das Senden des Stapels für dieses Thing fehlgeschlagen ist.
+        """
+        self._pending.setdefault(thing_id, {})[key] = value
+        future = self._futures.get(thing_id)
+        if future is None:
+            future = self._futures[thing_id] = self._hass.loop.create_future()
+
+        self._async_schedule_flush()
+        await future
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Startet den Sammel-Timer, sofern weder er noch ein Stapel bereits läuft.
+
+        Läuft gerade ein Stapel, startet dieser den Timer nach seinem Ende erneut.
+        """
+        if self._timer is None and self._flush_task is None:
+            self._timer = self._hass.loop.call_later(self._delay, self._async_start_flush)
+
+    @callback
+    def _async_start_flush(self) -> None:
+        """Startet nach Ablauf des Sammel-Timers das Senden des Stapels."""
+        self._timer = None
+        self._flush_task = self._hass.async_create_task(
+            self._async_flush(), name=f"{DOMAIN} command batch"
+        )
+
+    async def _async_flush(self) -> None:
+        """Sendet alle gesammelten Befehle und plant ggf. den nächsten Stapel ein."""
+        try:
+            await self._async_send_batch()
+        finally:
+            self._flush_task = None
+            # Während des Sendens eingereihte Befehle gehen mit dem nächsten Stapel raus.
+            if self._pending:
+                self._async_schedule_flush()
+
+    async def _async_send_batch(self) -> None:
+        """Sendet die gesammelten Befehle (ein Request je Thing) und stößt danach ein Update an."""
+        pending, self._pending = self._pending, {}
+        futures, self._futures = self._futures, {}
+        if not pending:
+            return
+
+        thing_ids = list(pending)
+        results = await asyncio.gather(
+            *(
+                self._send_commands(
+                    thing_id,
+                    [{"key": key, "value": value} for key, value in pending[thing_id].items()],
+                )
+                for thing_id in thing_ids
+            ),
+            return_exceptions=True,
+        )
+
+        succeeded: List[str] = []
+        for thing_id, result in zip(thing_ids, results):
+            future = futures[thing_id]
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)
+                succeeded.append(thing_id)
+
+        if succeeded:
+            await self._after_batch(succeeded)
+
+    def async_shutdown(self) -> None:
+        """Bricht den Sammel-Timer ab und weist noch wartende Befehle zurück."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(
+                    HomeAssistantError("neoom Integration wurde entladen, Befehl nicht gesendet.")
+                )
+        self._pending.clear()
+        self._futures.clear()
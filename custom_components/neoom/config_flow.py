@@ -4,12 +4,14 @@ Diese Datei steuert den Einrichtungsassistenten, der dem Benutzer in der
 Home Assistant Oberfläche angezeigt wird, wenn er die Integration hinzufügt.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
@@ -17,8 +19,43 @@ from .const import (
     CONF_CLOUD_TOKEN,
     CONF_BEAAM_IP,
     CONF_BEAAM_KEY,
+    CONF_GATEWAYS,
+    CONF_SITES,
+    CONF_SCAN_INTERVAL_FAST,
+    CONF_SCAN_INTERVAL_NORMAL,
+    CONF_SCAN_INTERVAL_SLOW,
+    CONF_SCAN_INTERVAL_FLOW,
+    CONF_TRANSPORT,
+    CONF_CUSTOM_UNITS,
+    CONF_DEAD_BANDS,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_INTEGRATE_POWER,
+    CONF_ADAPTIVE_POLLING,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_MAX_DATA_AGE,
+    DEFAULT_DEAD_BANDS,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_FAST,
+    DEFAULT_SCAN_INTERVAL_FLOW,
+    DEFAULT_SCAN_INTERVAL_LOCAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SCAN_INTERVAL_SLOW,
     LOGGER,
+    STORAGE_VERSION,
+    TRANSPORT_AUTO,
+    TRANSPORT_POLLING,
 )
+from .devices import (
+    async_remove_gateway_devices,
+    async_remove_site_device,
+    beaam_config_storage_key,
+    gateway_id,
+)
+from .publish_filter import parse_dead_bands
+from .units import parse_custom_units
 
 
 class NeoomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -28,8 +65,17 @@ class NeoomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     durchlaufen muss, um die Integration zu konfigurieren.
     """
 
-    # Version des Konfigurationsschemas. Nützlich für zukünftige Migrationen.
-    VERSION = 1
+    # Version des Konfigurationsschemas. Version 2 verwaltet Sites und Gateways als Listen
+    # (Migration von Version 1 siehe async_migrate_entry in __init__.py).
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> "NeoomOptionsFlow":
+        """Liefert den Options-Flow, über den der Eintrag nachträglich angepasst wird."""
+        return NeoomOptionsFlow(config_entry)
 
     async def async_step_user(
         self, user_input: Optional[Dict[str, Any]] = None
@@ -60,9 +106,24 @@ class NeoomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 
                 # Erstellt den Eintrag in der Home Assistant Registry.
                 # 'title' ist der Name, der in der Integrationsübersicht angezeigt wird.
+                # Die erste Site und das erste Gateway werden hier erfasst; weitere
+                # lassen sich anschließend über die Optionen hinzufügen.
                 return self.async_create_entry(
-                    title="neoom System", 
-                    data=user_input
+                    title="neoom System",
+                    data={
+                        CONF_SITES: [
+                            {
+                                CONF_SITE_ID: user_input[CONF_SITE_ID],
+                                CONF_CLOUD_TOKEN: user_input[CONF_CLOUD_TOKEN],
+                            }
+                        ],
+                        CONF_GATEWAYS: [
+                            {
+                                CONF_BEAAM_IP: user_input[CONF_BEAAM_IP],
+                                CONF_BEAAM_KEY: user_input[CONF_BEAAM_KEY],
+                            }
+                        ],
+                    },
                 )
             except Exception as e:
                 LOGGER.exception("Unerwarteter Fehler im Config Flow: %s", e)
@@ -87,3 +148,276 @@ class NeoomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema, 
             errors=errors
         )
+
+
+class NeoomOptionsFlow(config_entries.OptionsFlow):
+    """Behandelt die Optionen (nachträgliche Einstellungen) eines neoom AI Eintrags.
+
+    Hier können u.a. die Intervalle der gestaffelten lokalen Abfrage angepasst sowie
+    weitere Sites und BEAAM Gateways hinzugefügt oder entfernt werden.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialisiert den Options-Flow.
+
+        Args:
+            config_entry: Der Konfigurationseintrag, dessen Optionen bearbeitet werden.
+        """
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Zeigt das Menü der Optionen an.
+
+        Args:
+            user_input: Wird für Menüs nicht verwendet.
+
+        Returns:
+            Ein FlowResult, das das Menü anzeigt.
+        """
+        menu_options = ["settings", "add_gateway", "add_site"]
+        if len(self._entry.data[CONF_GATEWAYS]) > 1:
+            menu_options.append("remove_gateway")
+        if len(self._entry.data[CONF_SITES]) > 1:
+            menu_options.append("remove_site")
+        return self.async_show_menu(step_id="init", menu_options=menu_options)
+
+    async def async_step_settings(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Zeigt das Optionsformular an bzw. speichert die eingegebenen Optionen.
+
+        Args:
+            user_input: Die vom Benutzer im Formular eingegebenen Daten.
+
+        Returns:
+            Ein FlowResult, das entweder das Formular anzeigt oder die Optionen speichert.
+        """
+        errors: Dict[str, str] = {}
+
+        if user_input is not None:
+            # Eigene Einheiten vor dem Speichern prüfen, damit Tippfehler sofort auffallen.
+            try:
+                parse_custom_units(user_input.get(CONF_CUSTOM_UNITS))
+            except ValueError as err:
+                LOGGER.debug("Ungültige eigene Einheiten: %s", err)
+                errors[CONF_CUSTOM_UNITS] = "invalid_custom_units"
+            try:
+                parse_dead_bands(user_input.get(CONF_DEAD_BANDS))
+            except ValueError as err:
+                LOGGER.debug("Ungültige Totbänder: %s", err)
+                errors[CONF_DEAD_BANDS] = "invalid_dead_bands"
+            if user_input.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN) > user_input.get(
+                CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX
+            ):
+                errors[CONF_SCAN_INTERVAL_MAX] = "invalid_interval_bounds"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input if user_input is not None else self._entry.options
+
+        # Abfrage-Intervalle in Sekunden. Untergrenze 1 s, um das Gateway nicht zu überlasten.
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_FAST,
+                    default=options.get(CONF_SCAN_INTERVAL_FAST, DEFAULT_SCAN_INTERVAL_FAST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_NORMAL,
+                    default=options.get(CONF_SCAN_INTERVAL_NORMAL, DEFAULT_SCAN_INTERVAL_LOCAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_SLOW,
+                    default=options.get(CONF_SCAN_INTERVAL_SLOW, DEFAULT_SCAN_INTERVAL_SLOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=86400)),
+                # Schneller Pfad für den Energiefluss der Site; 0 deaktiviert ihn.
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_FLOW,
+                    default=options.get(CONF_SCAN_INTERVAL_FLOW, DEFAULT_SCAN_INTERVAL_FLOW),
+                ): vol.All(vol.Coerce(float), vol.Any(0, vol.Range(min=0.5, max=3600))),
+                # "auto" nutzt den Push-Kanal des Gateways, sofern vorhanden.
+                vol.Optional(
+                    CONF_TRANSPORT,
+                    default=options.get(CONF_TRANSPORT, TRANSPORT_AUTO),
+                ): vol.In([TRANSPORT_AUTO, TRANSPORT_POLLING]),
+                # Zusätzliche Einheiten, z.B. "degF=°F:temperature; m3=m³:gas:total_increasing"
+                vol.Optional(
+                    CONF_CUSTOM_UNITS,
+                    default=options.get(CONF_CUSTOM_UNITS, ""),
+                ): str,
+                # Totbänder je Device Class, z.B. "power=0.5%; voltage=0.5" (leer = aus)
+                vol.Optional(
+                    CONF_DEAD_BANDS,
+                    default=options.get(CONF_DEAD_BANDS, DEFAULT_DEAD_BANDS),
+                ): str,
+                # Mindestabstand zwischen zwei Zustandsänderungen eines Datenpunkts; 0 = aus.
+                vol.Optional(
+                    CONF_MIN_PUBLISH_INTERVAL,
+                    default=options.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+                # Energiezähler (kWh) für Geräte, die nur ihre Leistung liefern.
+                vol.Optional(
+                    CONF_INTEGRATE_POWER,
+                    default=options.get(CONF_INTEGRATE_POWER, True),
+                ): bool,
+                # Adaptive Abfrage: Intervalle folgen Antwortzeit und Änderungsrate,
+                # begrenzt auf [min, max] Sekunden je Gerät.
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, True),
+                ): bool,
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_MIN,
+                    default=options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=3600)),
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_MAX,
+                    default=options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=86400)),
+                # Höchstalter der Werte, danach gilt ein Datenpunkt als nicht verfügbar;
+                # 0 = automatisch aus dem Intervall des Geräts.
+                vol.Optional(
+                    CONF_MAX_DATA_AGE,
+                    default=options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+            }
+        )
+
+        return self.async_show_form(step_id="settings", data_schema=data_schema, errors=errors)
+
+    async def async_step_add_gateway(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Fügt dem Eintrag ein weiteres BEAAM Gateway hinzu.
+
+        Args:
+            user_input: IP-Adresse und API Key des Gateways.
+
+        Returns:
+            Ein FlowResult, das entweder das Formular anzeigt oder den Eintrag aktualisiert.
+        """
+        errors: Dict[str, str] = {}
+        gateways: List[Dict[str, str]] = list(self._entry.data[CONF_GATEWAYS])
+
+        if user_input is not None:
+            if any(gateway[CONF_BEAAM_IP] == user_input[CONF_BEAAM_IP] for gateway in gateways):
+                errors[CONF_BEAAM_IP] = "already_configured"
+            else:
+                gateways.append(
+                    {CONF_BEAAM_IP: user_input[CONF_BEAAM_IP], CONF_BEAAM_KEY: user_input[CONF_BEAAM_KEY]}
+                )
+                return self._async_update_data({CONF_GATEWAYS: gateways})
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_BEAAM_IP): str,
+                vol.Required(CONF_BEAAM_KEY): str,
+            }
+        )
+        return self.async_show_form(step_id="add_gateway", data_schema=data_schema, errors=errors)
+
+    async def async_step_add_site(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Fügt dem Eintrag eine weitere Site der neoom AI Cloud hinzu.
+
+        Args:
+            user_input: Site ID und Token der Site.
+
+        Returns:
+            Ein FlowResult, das entweder das Formular anzeigt oder den Eintrag aktualisiert.
+        """
+        errors: Dict[str, str] = {}
+        sites: List[Dict[str, str]] = list(self._entry.data[CONF_SITES])
+
+        if user_input is not None:
+            if any(site[CONF_SITE_ID] == user_input[CONF_SITE_ID] for site in sites):
+                errors[CONF_SITE_ID] = "already_configured"
+            else:
+                sites.append(
+                    {CONF_SITE_ID: user_input[CONF_SITE_ID], CONF_CLOUD_TOKEN: user_input[CONF_CLOUD_TOKEN]}
+                )
+                return self._async_update_data({CONF_SITES: sites})
+
+        # Das Token der ersten Site ist vorbelegt, da mehrere Sites meist zu einem Konto gehören.
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_SITE_ID): str,
+                vol.Required(CONF_CLOUD_TOKEN, default=sites[0][CONF_CLOUD_TOKEN]): str,
+            }
+        )
+        return self.async_show_form(step_id="add_site", data_schema=data_schema, errors=errors)
+
+    async def async_step_remove_gateway(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Entfernt ein zusätzliches BEAAM Gateway samt seiner Geräte.
+
+        Das erste Gateway kann nicht entfernt werden, da seine Geräte die bisherige
+        Kennung "BEAAM Gateway" tragen.
+
+        Args:
+            user_input: Die IP-Adresse des zu entfernenden Gateways.
+
+        Returns:
+            Ein FlowResult, das entweder das Formular anzeigt oder den Eintrag aktualisiert.
+        """
+        gateways: List[Dict[str, str]] = list(self._entry.data[CONF_GATEWAYS])
+
+        if user_input is not None:
+            index = next(
+                i for i, gateway in enumerate(gateways) if gateway[CONF_BEAAM_IP] == user_input[CONF_BEAAM_IP]
+            )
+            ip = gateways.pop(index)[CONF_BEAAM_IP]
+            async_remove_gateway_devices(self.hass, self._entry, gateway_id(index, ip))
+            await Store(
+                self.hass,
+                STORAGE_VERSION,
+                beaam_config_storage_key(self._entry.entry_id, gateway_id(index, ip), ip),
+            ).async_remove()
+            return self._async_update_data({CONF_GATEWAYS: gateways})
+
+        data_schema = vol.Schema(
+            {vol.Required(CONF_BEAAM_IP): vol.In([gateway[CONF_BEAAM_IP] for gateway in gateways[1:]])}
+        )
+        return self.async_show_form(step_id="remove_gateway", data_schema=data_schema)
+
+    async def async_step_remove_site(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Entfernt eine Site samt ihres Cloud-Geräts.
+
+        Args:
+            user_input: Die ID der zu entfernenden Site.
+
+        Returns:
+            Ein FlowResult, das entweder das Formular anzeigt oder den Eintrag aktualisiert.
+        """
+        sites: List[Dict[str, str]] = list(self._entry.data[CONF_SITES])
+
+        if user_input is not None:
+            sites = [site for site in sites if site[CONF_SITE_ID] != user_input[CONF_SITE_ID]]
+            async_remove_site_device(self.hass, self._entry, user_input[CONF_SITE_ID])
+            return self._async_update_data({CONF_SITES: sites})
+
+        data_schema = vol.Schema(
+            {vol.Required(CONF_SITE_ID): vol.In([site[CONF_SITE_ID] for site in sites])}
+        )
+        return self.async_show_form(step_id="remove_site", data_schema=data_schema)
+
+    @callback
+    def _async_update_data(self, changes: Dict[str, Any]) -> FlowResult:
+        """Übernimmt geänderte Sites bzw. Gateways in die Eintragsdaten.
+
+        Die Optionen bleiben unverändert. Das Aktualisieren des Eintrags lädt ihn neu,
+        sodass die Koordinatoren mit den neuen Daten angelegt werden.
+
+        Args:
+            changes: Die geänderten Schlüssel der Eintragsdaten.
+        """
+        self.hass.config_entries.async_update_entry(
+            self._entry, data={**self._entry.data, **changes}
+        )
+        return self.async_create_entry(title="", data=dict(self._entry.options))
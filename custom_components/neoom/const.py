@@ -1,6 +1,7 @@
 """Konstanten für die neoom AI Integration."""
 
 from logging import Logger, getLogger
+from typing import Dict, FrozenSet, List, Tuple
 
 # Zentraler Logger für die gesamte Integration, erleichtert das Debugging.
 LOGGER: Logger = getLogger(__package__)
@@ -27,6 +28,12 @@ CONF_BEAAM_IP: str = "beaam_ip"
 # Der API-Schlüssel (Token) für den lokalen Zugriff auf das BEAAM Gateway.
 CONF_BEAAM_KEY: str = "beaam_key"
 
+# Ab Version 2 der Eintragsdaten verwaltet ein Eintrag mehrere Sites und Gateways.
+# Die Daten enthalten dann Listen mit je einem Dictionary aus den obigen Schlüsseln:
+# {"sites": [{"site_id", "cloud_token"}], "gateways": [{"beaam_ip", "beaam_key"}]}
+CONF_SITES: str = "sites"
+CONF_GATEWAYS: str = "gateways"
+
 
 # --- API Endpunkte und Ports ---
 
@@ -38,13 +45,239 @@ CLOUD_API_URL: str = "https://api.ntuity.io/v1"
 # dient aber der Dokumentation.
 LOCAL_API_PORT: int = 80
 
+# Maximale Anzahl gleichzeitiger HTTP-Anfragen je Host (z.B. je BEAAM Gateway).
+# Begrenzt den parallelen Abruf vieler Geräte, damit das Gateway nicht überlastet wird.
+MAX_CONCURRENT_REQUESTS_PER_HOST: int = 4
+# Maximale Anzahl gleichzeitiger HTTP-Anfragen der gesamten Integration (alle Gateways
+# und Cloud Sites zusammen), damit mehrere Gateways die Event-Loop nicht fluten.
+MAX_CONCURRENT_REQUESTS_TOTAL: int = 12
+
+
+# --- Verfügbarkeit einzelner Geräte (Circuit Breaker) ---
+
+# Anzahl aufeinanderfolgender Fehler, ab der ein Gerät ("Thing") nicht mehr abgefragt wird.
+CIRCUIT_FAILURE_THRESHOLD: int = 2
+
+# Wartezeit in Sekunden, bevor ein pausiertes Gerät erneut probeweise abgefragt wird.
+# Verdoppelt sich mit jedem weiteren Fehler bis zur Obergrenze.
+CIRCUIT_BACKOFF_BASE: int = 30
+CIRCUIT_BACKOFF_MAX: int = 900
+
+
+# --- Zeitgrenzen ---
+
+# Frist (Sekunden) eines lokalen Abfragezyklus (Site-Status und alle fälligen Geräte).
+# Bis dahin gelieferte Ergebnisse werden übernommen; noch offene Anfragen werden
+# abgebrochen und zählen als Fehler des jeweiligen Geräts.
+LOCAL_CYCLE_TIMEOUT: int = 20
+
+# Timeout (Sekunden) einer einzelnen Anfrage an das Gateway (Site-Status, Zustände eines Geräts).
+LOCAL_REQUEST_TIMEOUT: int = 5
+
+# Timeout (Sekunden) für die Anfragen eines Cloud-Zyklus.
+CLOUD_CYCLE_TIMEOUT: int = 10
+
+
+# --- Steuerungsbefehle ---
+
+# Wartezeit in Sekunden, in der Befehle gesammelt und danach gebündelt gesendet werden.
+# Kurz genug, um in der UI nicht aufzufallen, lang genug für Slider-Bewegungen.
+COMMAND_DEBOUNCE_DELAY: float = 0.3
+
+
+# --- Persistenter Speicher ---
+
+# Version des Speicherformats (HA Store). Bei inkompatiblen Änderungen erhöhen.
+STORAGE_VERSION: int = 1
+
+# Speicherschlüssel für den Cache der BEAAM Konfiguration (je Konfigurationseintrag).
+STORAGE_KEY_BEAAM_CONFIG: str = DOMAIN + ".{entry_id}.beaam_config"
+
 
 # --- Standard Aktualisierungsintervalle ---
 
-# Das Intervall in Sekunden, in dem Daten aus der Cloud abgerufen werden.
-# Da sich diese Daten (wie Preise oder Tarife) selten ändern, genügen 5 Minuten.
+# Das Intervall in Sekunden, in dem der Energiefluss aus der Cloud abgerufen wird.
 DEFAULT_SCAN_INTERVAL_CLOUD: int = 300  
 
+# Das Intervall in Sekunden, in dem die Site-Daten (Tarife, Adressen) aus der Cloud
+# abgerufen werden. Da sich diese Daten selten ändern, genügt eine Stunde.
+DEFAULT_SCAN_INTERVAL_CLOUD_SITE: int = 3600
+
 # Das Intervall in Sekunden, in dem Live-Daten vom lokalen BEAAM Gateway
 # abgerufen werden. Ein kurzer Intervall ist wichtig für Live-Energieflüsse.
+# Entspricht der "normalen" Stufe der gestaffelten Abfrage (siehe unten).
 DEFAULT_SCAN_INTERVAL_LOCAL: int = 15
+
+# Intervall der "schnellen" Stufe für sich rasch ändernde Werte (Leistung, Ströme).
+DEFAULT_SCAN_INTERVAL_FAST: int = 2
+
+# Intervall der "langsamen" Stufe für (nahezu) statische Werte (Typenschild, Modi, Grenzwerte).
+DEFAULT_SCAN_INTERVAL_SLOW: int = 60
+
+# Intervall (Sekunden) des schnellen Pfads für den Energiefluss der Site
+# (`/api/v1/site/state`: Netzbezug/Einspeisung, PV, Speicher). Die Antwort ist klein
+# und wird unabhängig von der Abfrage der einzelnen Geräte gelesen. 0 = deaktiviert.
+DEFAULT_SCAN_INTERVAL_FLOW: float = 1
+
+# Gilt der Energiefluss des schnellen Pfads als veraltet (älter als dieses Vielfache
+# seines Intervalls), liest der reguläre Zyklus den Site-Status selbst.
+FLOW_STALE_FACTOR: int = 3
+
+# Das Intervall in Sekunden, in dem die Gerätestruktur des BEAAM Gateways im
+# Hintergrund auf Änderungen (neue oder entfernte Geräte) geprüft wird.
+CONFIG_REVALIDATE_INTERVAL: int = 600
+
+# Mindestabstand (Sekunden) zwischen zwei Zustandsänderungen der Diagnose-Sensoren,
+# damit die Kennzahlen der Kommunikation die Recorder-Datenbank nicht füllen.
+DIAGNOSTIC_UPDATE_INTERVAL: int = 60
+
+# Kontext, mit dem sich Listener anmelden, die nur nach dem regulären Abfragezyklus
+# benachrichtigt werden (nicht nach schnellem Pfad, Push-Nachrichten oder Befehlen).
+LISTENER_CONTEXT_CYCLE: str = "cycle"
+
+
+# --- Transport (Zugriff auf das BEAAM Gateway) ---
+
+# Betriebsarten: "auto" nutzt den Push-Kanal des Gateways, sofern es ihn anbietet,
+# und fällt sonst (oder bei Verbindungsabbruch) auf Polling zurück.
+TRANSPORT_AUTO: str = "auto"
+TRANSPORT_POLLING: str = "polling"
+
+# Sendet das Gateway über den Push-Kanal so lange (Sekunden) nichts, auch keine
+# Keep-Alives, gilt die Verbindung als abgerissen.
+PUSH_IDLE_TIMEOUT: int = 30
+
+# Wartezeit (Sekunden) vor einem erneuten Verbindungsversuch des Push-Kanals.
+# Verdoppelt sich mit jedem Fehlschlag bis zur Obergrenze.
+PUSH_RECONNECT_MIN: int = 5
+PUSH_RECONNECT_MAX: int = 300
+
+
+# --- Gestaffelte Abfrage (Polling-Tiers) ---
+# Nicht jedes Gerät ("Thing") am BEAAM muss gleich oft abgefragt werden.
+# Jeder Datenpunkt wird einer Stufe zugeordnet; ein Thing wird so oft abgefragt,
+# wie es sein schnellster Datenpunkt verlangt.
+
+POLL_TIER_FAST: str = "fast"
+POLL_TIER_NORMAL: str = "normal"
+POLL_TIER_SLOW: str = "slow"
+
+# Options-Schlüssel, unter denen der Benutzer die Intervalle der Stufen anpassen kann.
+CONF_SCAN_INTERVAL_FAST: str = "scan_interval_fast"
+CONF_SCAN_INTERVAL_NORMAL: str = "scan_interval_normal"
+CONF_SCAN_INTERVAL_SLOW: str = "scan_interval_slow"
+CONF_SCAN_INTERVAL_FLOW: str = "scan_interval_flow"
+CONF_TRANSPORT: str = "transport"
+# Eigene (herstellerspezifische) Einheiten, Format siehe units.parse_custom_units.
+CONF_CUSTOM_UNITS: str = "custom_units"
+# Totbänder je Device Class, Format siehe publish_filter.parse_dead_bands.
+CONF_DEAD_BANDS: str = "dead_bands"
+# Mindestabstand (Sekunden) zwischen zwei Zustandsänderungen eines Datenpunkts.
+CONF_MIN_PUBLISH_INTERVAL: str = "min_publish_interval"
+# Leistung von Geräten ohne Energiezähler zu Energiezählern integrieren (Standard: an).
+CONF_INTEGRATE_POWER: str = "integrate_power"
+
+# Standard-Totbänder: Änderungen innerhalb dieser Grenzen werden nicht an die Entitäten
+# weitergegeben (keine Zustandsänderung, kein Recorder-Eintrag). Absolute Grenzen gelten
+# in der Einheit des Gateways. Leistung wird nur relativ gefiltert, da das Gateway sie in
+# W oder kW liefern kann; Spannung (V), Strom (A), Frequenz (Hz) und Temperatur (°C)
+# haben eine feste Einheit und absolute Grenzen.
+DEFAULT_DEAD_BANDS: str = "power=0.5%; voltage=0.5; current=0.05; frequency=0.01; temperature=0.1"
+
+# Standardmäßig ohne Mindestabstand, damit der schnelle Pfad jede Änderung zeigt.
+DEFAULT_MIN_PUBLISH_INTERVAL: float = 0
+
+# Standard-Stufe je Gerätetyp. Greift nur, wenn der Schlüssel eines Datenpunkts
+# weder explizit noch über ein Muster (siehe unten) zugeordnet ist.
+THING_TYPE_POLL_TIERS: Dict[str, str] = {
+    "INVERTER": POLL_TIER_FAST,
+    "BATT_INVERTER": POLL_TIER_FAST,
+    "ELECTRICITY_METER": POLL_TIER_FAST,
+    "CHARGING_STATION": POLL_TIER_NORMAL,
+    "HEAT_PUMP": POLL_TIER_NORMAL,
+}
+
+# Explizite Zuordnung einzelner Datenpunkt-Schlüssel zu einer Stufe.
+# Hat Vorrang vor den Mustern, z.B. damit Grenzwerte mit "POWER" im Namen
+# nicht in die schnelle Stufe fallen.
+DATAPOINT_KEY_POLL_TIERS: Dict[str, str] = {
+    "MIN_SOC": POLL_TIER_SLOW,
+    "MAX_SOC": POLL_TIER_SLOW,
+    "MAX_POWER_CHARGE_FALLBACK": POLL_TIER_SLOW,
+    "PHASE_SWITCHING_MODE": POLL_TIER_SLOW,
+    "SERIAL_NUMBER": POLL_TIER_SLOW,
+    "FIRMWARE_VERSION": POLL_TIER_SLOW,
+}
+
+# Teilstring-Muster für Datenpunkt-Schlüssel. Das erste passende Muster gewinnt.
+DATAPOINT_KEY_POLL_PATTERNS: List[Tuple[str, str]] = [
+    ("NOMINAL", POLL_TIER_SLOW),
+    ("CAPACITY", POLL_TIER_SLOW),
+    ("_LIMIT", POLL_TIER_SLOW),
+    ("_MODE", POLL_TIER_SLOW),
+    ("POWER", POLL_TIER_FAST),
+    ("CURRENT", POLL_TIER_FAST),
+    ("ENERGY", POLL_TIER_NORMAL),
+    ("SOC", POLL_TIER_NORMAL),
+]
+
+
+# Leistungen, die in beide Richtungen fließen (Laden/Entladen, Bezug/Einspeisung), werden
+# nicht zu Energiezählern integriert: Ein einzelner Zähler bildet nur eine Richtung ab.
+# Erkannt werden sie am Gerätetyp bzw. an Mustern im Schlüssel des Datenpunkts.
+BIDIRECTIONAL_POWER_THING_TYPES: FrozenSet[str] = frozenset({"BATT_INVERTER", "ELECTRICITY_METER"})
+BIDIRECTIONAL_POWER_KEY_PATTERNS: Tuple[str, ...] = ("GRID", "STORAGE", "BATTERY")
+
+# --- Energiefluss der Site und abgeleitete Kennzahlen ---
+
+# Schlüssel der Datenpunkte im Energiefluss der Site (`/site/state`, "energyFlow").
+# Vorzeichen: POWER_GRID > 0 bedeutet Netzbezug, < 0 Einspeisung;
+# POWER_STORAGE > 0 bedeutet Entladen des Speichers, < 0 Laden.
+FLOW_KEY_PRODUCTION: str = "POWER_PRODUCTION"
+FLOW_KEY_CONSUMPTION: str = "POWER_CONSUMPTION"
+FLOW_KEY_GRID: str = "POWER_GRID"
+FLOW_KEY_STORAGE: str = "POWER_STORAGE"
+
+# Lücken zwischen zwei Abrufen einer Leistung, die länger sind (Sekunden), werden beim
+# Aufsummieren zu Energie übersprungen (z.B. Gateway oder Gerät nicht erreichbar).
+MAX_INTEGRATION_GAP: int = 300
+
+
+# --- Adaptive Abfrage ---
+# Der lokale Koordinator passt die Intervalle aller Stufen mit einem gemeinsamen Faktor
+# an: kürzer, solange sich Werte ändern und das Gateway schnell antwortet; länger, wenn
+# sich nichts ändert (z.B. nachts ohne PV) oder das Gateway langsam antwortet.
+
+# Adaptive Abfrage ein-/ausschalten und Grenzen (Sekunden) für das Intervall jedes Geräts.
+CONF_ADAPTIVE_POLLING: str = "adaptive_polling"
+CONF_SCAN_INTERVAL_MIN: str = "scan_interval_min"
+CONF_SCAN_INTERVAL_MAX: str = "scan_interval_max"
+DEFAULT_SCAN_INTERVAL_MIN: float = 1
+DEFAULT_SCAN_INTERVAL_MAX: float = 300
+
+# Grenzen des Faktors, mit dem die Intervalle der Stufen multipliziert werden.
+ADAPTIVE_FACTOR_MIN: float = 0.5
+ADAPTIVE_FACTOR_MAX: float = 8.0
+
+# Mittlere Antwortzeit (Sekunden) eines Geräts, ab der das Gateway als langsam bzw. bis
+# zu der es als schnell gilt.
+ADAPTIVE_SLOW_LATENCY: float = 2.0
+ADAPTIVE_FAST_LATENCY: float = 0.5
+
+# Anteil geänderter Datenpunkte je Abfrage, unter dem die Werte als ruhend bzw. ab dem
+# sie als bewegt gelten.
+ADAPTIVE_IDLE_CHANGE_RATIO: float = 0.05
+ADAPTIVE_ACTIVE_CHANGE_RATIO: float = 0.25
+
+
+# --- Veraltete Werte ---
+# Ein Datenpunkt gilt als nicht verfügbar, wenn sein letzter gelieferter Wert älter als
+# das Höchstalter ist. Antwortet ein einzelnes Gerät nicht, behält es seine Werte bis dahin.
+
+# Höchstalter (Sekunden) der Werte; 0 = automatisch (DATA_STALE_FACTOR × Abfrage-Intervall
+# des jeweiligen Geräts).
+CONF_MAX_DATA_AGE: str = "max_data_age"
+DEFAULT_MAX_DATA_AGE: float = 0
+
+# Vielfaches des Abfrage-Intervalls, ab dem ein Wert bei automatischem Höchstalter veraltet ist.
+DATA_STALE_FACTOR: int = 3
@@ -7,27 +7,119 @@ Das verhindert, dass jede Entität eigene Netzwerk-Anfragen stellt, was die Syst
 """
 
 import asyncio
-from datetime import timedelta
-from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import time
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 
 import aiohttp
 import async_timeout
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util.json import json_loads
 
+from .adaptive import AdaptivePollController
+from .client import async_get_http_pool
+from .commands import CommandBatcher
+from .descriptors import EMPTY_TABLE, DataPointDescriptor, DescriptorTable, build_descriptor_table
+from .devices import (
+    PRIMARY_GATEWAY_ID,
+    beaam_config_storage_key,
+    build_thing_device_infos,
+    gateway_device_info,
+    site_device_info,
+)
+from .energy_integration import PowerIntegrator
+from .health import ThingHealthTracker
+from .kpi import EnergyKpiCalculator
+from .metrics import GatewayMetrics
+from .publish_filter import DeadBand, PublishFilter
+from .scheduler import async_get_scheduler
+from .state_store import QUALITY_GOOD, DataPointStore, StateItem
+from .transport import BeaamAuthError, BeaamTransport, create_transport
+from .units import DEFAULT_UNIT_MAPPER, UnitMapper
 from .const import (
+    BIDIRECTIONAL_POWER_KEY_PATTERNS,
+    BIDIRECTIONAL_POWER_THING_TYPES,
     CLOUD_API_URL,
+    CLOUD_CYCLE_TIMEOUT,
+    CONFIG_REVALIDATE_INTERVAL,
+    DATA_STALE_FACTOR,
+    DATAPOINT_KEY_POLL_PATTERNS,
+    DATAPOINT_KEY_POLL_TIERS,
     DEFAULT_SCAN_INTERVAL_CLOUD,
+    DEFAULT_SCAN_INTERVAL_CLOUD_SITE,
+    DEFAULT_SCAN_INTERVAL_FAST,
+    DEFAULT_SCAN_INTERVAL_FLOW,
+    DEFAULT_MAX_DATA_AGE,
     DEFAULT_SCAN_INTERVAL_LOCAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SCAN_INTERVAL_SLOW,
     DOMAIN,
+    FLOW_STALE_FACTOR,
+    LISTENER_CONTEXT_CYCLE,
+    LOCAL_CYCLE_TIMEOUT,
     LOGGER,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
+    PUSH_RECONNECT_MAX,
+    PUSH_RECONNECT_MIN,
+    STORAGE_VERSION,
+    THING_TYPE_POLL_TIERS,
+    TRANSPORT_AUTO,
 )
 
+# Standard-Intervalle (Sekunden) der einzelnen Abfrage-Stufen.
+DEFAULT_POLL_INTERVALS: Dict[str, int] = {
+    POLL_TIER_FAST: DEFAULT_SCAN_INTERVAL_FAST,
+    POLL_TIER_NORMAL: DEFAULT_SCAN_INTERVAL_LOCAL,
+    POLL_TIER_SLOW: DEFAULT_SCAN_INTERVAL_SLOW,
+}
+
+
+def _hash_config(config: Dict[str, Any]) -> str:
+    """Berechnet einen stabilen Inhalts-Hash der BEAAM Konfiguration.
+
+    Die Schlüssel werden sortiert, damit dieselbe Struktur unabhängig von der
+    Reihenfolge in der API-Antwort denselben Hash ergibt.
+    """
+    serialized = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def resolve_poll_tier(thing_type: str, key: str) -> str:
+    """Bestimmt die Abfrage-Stufe eines Datenpunkts.
+
+    Reihenfolge: explizite Zuordnung des Schlüssels, dann das erste passende
+    Schlüssel-Muster, dann die Standard-Stufe des Gerätetyps, sonst "normal".
+
+    Args:
+        thing_type: Der Typ des Geräts (z.B. "INVERTER").
+        key: Der Schlüssel des Datenpunkts (z.B. "POWER_AC").
+
+    Returns:
+        Eine der Stufen POLL_TIER_FAST, POLL_TIER_NORMAL oder POLL_TIER_SLOW.
+    """
+    if key in DATAPOINT_KEY_POLL_TIERS:
+        return DATAPOINT_KEY_POLL_TIERS[key]
+
+    for pattern, tier in DATAPOINT_KEY_POLL_PATTERNS:
+        if pattern in key:
+            return tier
+
+    return THING_TYPE_POLL_TIERS.get(thing_type, POLL_TIER_NORMAL)
+
 
 class NeoomCloudCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
     """Koordinator für den Abruf von Daten aus der neoom AI Cloud."""
@@ -43,19 +135,107 @@ class NeoomCloudCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         super().__init__(
             hass,
             LOGGER,
-            name=f"{DOMAIN}_cloud",
-            # Aktualisierungsintervall für Cloud-Daten (seltenere Änderungen wie Tarife)
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL_CLOUD),
+            name=f"{DOMAIN}_cloud_{site_id}",
+            # Der Takt kommt vom gemeinsamen Taktgeber (siehe async_start_polling).
+            update_interval=None,
         )
         self.token = token
         self.site_id = site_id
-        # ClientSession für asynchrone HTTP-Anfragen. Muss später geschlossen werden.
-        self.session = aiohttp.ClientSession()
+        # Aktualisierungsintervall für den Cloud-Energiefluss. Die Site-Daten
+        # (Tarife, Adressen) werden nur alle DEFAULT_SCAN_INTERVAL_CLOUD_SITE Sekunden geholt.
+        self.poll_interval: float = DEFAULT_SCAN_INTERVAL_CLOUD
+        self._poll_unsub: Optional[CALLBACK_TYPE] = None
+        # Gerät, unter dem alle Cloud-Sensoren gruppiert werden (einmal erzeugt, von allen geteilt).
+        self.device_info = site_device_info(site_id)
+        # Gemeinsame, von Home Assistant verwaltete ClientSession (Keep-Alive, DNS-Cache).
+        # Sie wird von Home Assistant geschlossen, nicht von der Integration.
+        self._http = async_get_http_pool(hass)
+        self.session = self._http.session
+        self._host_limit = self._http.host_limit(urlparse(CLOUD_API_URL).hostname or CLOUD_API_URL)
+
+        # Zuletzt erhaltene Antworten je URL und ihre Validatoren (ETag / Last-Modified)
+        # für bedingte Anfragen. Antwortet die API mit "304 Not Modified", wird die
+        # zwischengespeicherte Antwort weiterverwendet.
+        self._responses: Dict[str, Dict[str, Any]] = {}
+        self._validators: Dict[str, Dict[str, str]] = {}
+        # Zeitpunkt (time.monotonic()), ab dem die Site-Daten wieder abgerufen werden.
+        self._site_due_at: float = 0.0
+        # Antwortzeiten, Fehler und empfangene Bytes je Endpunkt (für die Diagnose).
+        self.metrics = GatewayMetrics(cycle_timeout=CLOUD_CYCLE_TIMEOUT)
+
+    async def _async_get_json(self, endpoint: str, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Ruft eine JSON-Ressource der Cloud ab, bedingt, sofern Validatoren bekannt sind.
+
+        Args:
+            endpoint: Der Name des Endpunkts für die Kennzahlen (z.B. "site").
+            url: Die abzurufende URL.
+            headers: Authorization-Header für die API.
+
+        Returns:
+            Die (ggf. aus dem Zwischenspeicher stammende) Antwort.
+
+        Raises:
+            ConfigEntryAuthFailed: Wenn das Token ungültig ist (Status 401).
+            aiohttp.ClientError: Bei anderen HTTP-Fehlern.
+        """
+        request_headers = dict(headers)
+        cached = self._responses.get(url)
+        validators = self._validators.get(url, {})
+        if cached is not None:
+            if "ETag" in validators:
+                request_headers["If-None-Match"] = validators["ETag"]
+            if "Last-Modified" in validators:
+                request_headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        async with self._host_limit:
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=request_headers) as resp:
+                    if resp.status == 401:
+                        # Ein 401-Fehler deutet auf ein ungültiges Token hin.
+                        # Wir werfen ConfigEntryAuthFailed, damit HA den Benutzer zur erneuten Anmeldung auffordert.
+                        raise ConfigEntryAuthFailed("neoom AI Cloud Token ist ungültig oder abgelaufen.")
+                    if resp.status == 304 and cached is not None:
+                        self.metrics.record_success(endpoint, time.perf_counter() - start, 0)
+                        return cached
+
+                    # Bei anderen HTTP-Fehlern (4xx, 5xx) wirft raise_for_status eine Exception.
+                    resp.raise_for_status()
+                    body = await resp.read()
+                    data: Dict[str, Any] = json_loads(body)
+            except Exception as err:
+                self.metrics.record_failure(endpoint, err)
+                raise
+            self.metrics.record_success(endpoint, time.perf_counter() - start, len(body))
+
+            self._responses[url] = data
+            self._validators[url] = {
+                name: resp.headers[name]
+                for name in ("ETag", "Last-Modified")
+                if name in resp.headers
+            }
+            return data
+
+    @callback
+    def async_start_polling(self) -> None:
+        """Meldet die regelmäßige Abfrage beim gemeinsamen Taktgeber an."""
+        if self._poll_unsub is None:
+            self._poll_unsub = async_get_scheduler(self.hass).async_schedule(
+                f"cloud {self.site_id}", self.poll_interval, self.async_refresh
+            )
+
+    async def async_shutdown(self) -> None:
+        """Meldet die Abfrage beim Taktgeber ab und beendet den Koordinator."""
+        if self._poll_unsub is not None:
+            self._poll_unsub()
+            self._poll_unsub = None
+        await super().async_shutdown()
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Ruft die neuesten Daten von der neoom AI Cloud ab.
 
-        Wird vom DataUpdateCoordinator in den konfigurierten Intervallen (DEFAULT_SCAN_INTERVAL_CLOUD) aufgerufen.
+        Wird vom gemeinsamen Taktgeber im Intervall `poll_interval` (DEFAULT_SCAN_INTERVAL_CLOUD) aufgerufen.
+        Energiefluss und (falls fällig) Site-Daten werden parallel abgerufen.
 
         Returns:
             Ein Dictionary mit den gesammelten Daten (z.B. 'site' und 'flow').
@@ -64,29 +244,28 @@ class NeoomCloudCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             UpdateFailed: Wenn beim Abruf der Daten ein Netzwerkfehler aufgetreten ist.
             ConfigEntryAuthFailed: Wenn das Token ungültig ist (Status 401).
         """
+        headers = {"Authorization": f"Bearer {self.token}"}
+        url_site = f"{CLOUD_API_URL}/sites/{self.site_id}"
+        url_flow = f"{CLOUD_API_URL}/sites/{self.site_id}/energy-flow/latest"
+
+        # Die Site-Informationen (Tarife, Adressen, etc.) ändern sich selten und
+        # werden daher nur alle DEFAULT_SCAN_INTERVAL_CLOUD_SITE Sekunden neu geholt.
+        now = time.monotonic()
+        fetch_site = url_site not in self._responses or now >= self._site_due_at
+
         try:
             # Setze ein asynchrones Timeout von 10 Sekunden für alle Cloud-Anfragen,
             # um zu verhindern, dass die Update-Schleife blockiert wird, wenn die Server langsam antworten.
-            async with async_timeout.timeout(10):
-                headers = {"Authorization": f"Bearer {self.token}"}
-                
-                # 1. Allgemeine Site-Informationen abrufen (enthält u.a. Tarife, Adressen, etc.)
-                url_site = f"{CLOUD_API_URL}/sites/{self.site_id}"
-                async with self.session.get(url_site, headers=headers) as resp:
-                    if resp.status == 401:
-                        # Ein 401-Fehler deutet auf ein ungültiges Token hin.
-                        # Wir werfen ConfigEntryAuthFailed, damit HA den Benutzer zur erneuten Anmeldung auffordert.
-                        raise ConfigEntryAuthFailed("neoom AI Cloud Token ist ungültig oder abgelaufen.")
-                    
-                    # Bei anderen HTTP-Fehlern (4xx, 5xx) wirft raise_for_status eine Exception.
-                    resp.raise_for_status()
-                    site_data: Dict[str, Any] = await resp.json()
-
-                # 2. Den letzten Energiefluss abrufen (aktuelle Übersichtswerte wie Gesamtverbrauch etc.)
-                url_flow = f"{CLOUD_API_URL}/sites/{self.site_id}/energy-flow/latest"
-                async with self.session.get(url_flow, headers=headers) as resp:
-                    resp.raise_for_status()
-                    flow_data: Dict[str, Any] = await resp.json()
+            async with async_timeout.timeout(CLOUD_CYCLE_TIMEOUT):
+                if fetch_site:
+                    site_data, flow_data = await asyncio.gather(
+                        self._async_get_json("site", url_site, headers),
+                        self._async_get_json("energy_flow", url_flow, headers),
+                    )
+                    self._site_due_at = now + DEFAULT_SCAN_INTERVAL_CLOUD_SITE
+                else:
+                    site_data = self._responses[url_site]
+                    flow_data = await self._async_get_json("energy_flow", url_flow, headers)
 
             # Wir bündeln beide API-Antworten in einem einzigen Dictionary,
             # das dann unseren Entitäten über `coordinator.data` zur Verfügung steht.
@@ -103,90 +282,783 @@ class NeoomCloudCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             # Fängt Überschreitungen des async_timeout ab
             raise UpdateFailed("Timeout bei der Verbindung zur neoom AI API.") from err
 
-    async def close(self) -> None:
-        """Schließt die aufrechterhaltene HTTP-Session.
-        
-        Sollte aufgerufen werden, wenn die Integration entladen wird,
-        um Verbindungslecks (Resource Leaks) zu verhindern.
-        """
-        await self.session.close()
-
 
 class NeoomLocalCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
     """Koordinator für den Abruf von lokalen Live-Daten vom BEAAM Gateway."""
 
-    def __init__(self, hass: HomeAssistant, ip: str, key: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        ip: str,
+        key: str,
+        poll_intervals: Optional[Mapping[str, int]] = None,
+        flow_interval: float = DEFAULT_SCAN_INTERVAL_FLOW,
+        transport_mode: str = TRANSPORT_AUTO,
+        unit_mapper: UnitMapper = DEFAULT_UNIT_MAPPER,
+        gateway_id: str = PRIMARY_GATEWAY_ID,
+        dead_bands: Optional[Mapping[str, DeadBand]] = None,
+        min_publish_interval: float = 0.0,
+        integrate_power: bool = True,
+        adaptive_polling: bool = True,
+        interval_bounds: Tuple[float, float] = (DEFAULT_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MAX),
+        max_data_age: float = DEFAULT_MAX_DATA_AGE,
+    ) -> None:
         """Initialisiert den lokalen Koordinator.
 
         Args:
             hass: Die Home Assistant Instanz.
+            entry_id: Die ID des Konfigurationseintrags (für den Konfigurations-Cache).
             ip: Die IP-Adresse des lokalen BEAAM Gateways.
             key: Der Local-API-Key für die Authentifizierung.
+            poll_intervals: Intervalle (Sekunden) je Abfrage-Stufe. Fehlende Stufen
+                verwenden die Standardwerte aus DEFAULT_POLL_INTERVALS.
+            flow_interval: Intervall (Sekunden) des schnellen Pfads für den
+                Energiefluss der Site. 0 deaktiviert den schnellen Pfad.
+            transport_mode: TRANSPORT_AUTO (Push-Kanal, falls das Gateway ihn anbietet)
+                oder TRANSPORT_POLLING (ausschließlich HTTP-Abfragen).
+            unit_mapper: Ordnet die Einheiten der Datenpunkte den Home Assistant
+                Einheiten und Klassen zu (inkl. eigener Einheiten aus den Optionen).
+            gateway_id: Kennung des Gateways im Device Registry. Das erste Gateway eines
+                Eintrags behält die bisherige Kennung PRIMARY_GATEWAY_ID.
+            dead_bands: Totband je Device Class (z.B. "power"). Änderungen innerhalb
+                des Totbands werden nicht an die Entitäten weitergegeben.
+            min_publish_interval: Mindestabstand (Sekunden) zwischen zwei
+                Benachrichtigungen der Entitäten eines Datenpunkts. 0 = aus.
+            integrate_power: Integriert die Leistung von Geräten ohne eigenen
+                Energiezähler zu Energiezählern (kWh).
+            adaptive_polling: Passt die Intervalle der Stufen an Antwortzeit des
+                Gateways und Änderungsrate der Werte an (siehe adaptive.py).
+            interval_bounds: Kürzestes und längstes Intervall (Sekunden), das die
+                adaptive Abfrage für ein Gerät wählen darf.
+            max_data_age: Höchstalter (Sekunden) der Werte, nach dem ein Datenpunkt als
+                nicht verfügbar gilt. 0 = automatisch aus dem Intervall des Geräts.
         """
+        self.poll_intervals: Dict[str, int] = {
+            **DEFAULT_POLL_INTERVALS,
+            **(poll_intervals or {}),
+        }
+
         super().__init__(
             hass,
             LOGGER,
-            name=f"{DOMAIN}_local",
-            # Häufigeres Update-Intervall für echtzeitnahe Energiedaten.
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL_LOCAL),
+            name=f"{DOMAIN}_local_{ip}",
+            # Der Takt kommt vom gemeinsamen Taktgeber (siehe async_start_polling).
+            update_interval=None,
+        )
+        # Adaptive Abfrage: Ein gemeinsamer Faktor verlängert bzw. verkürzt die Intervalle
+        # aller Stufen innerhalb der Grenzen `interval_bounds`.
+        self.adaptive = AdaptivePollController(adaptive_polling)
+        self._interval_bounds = interval_bounds
+        # Der Koordinator "tickt" im Takt der schnellsten Stufe (beim kleinsten Faktor).
+        # Bei jedem Tick werden nur die Geräte abgefragt, deren eigenes Intervall
+        # abgelaufen ist; ist nichts fällig, entfällt der Zyklus (siehe _async_tick).
+        self.tick_interval: float = min(
+            self._effective_interval(interval, self.adaptive.min_factor)
+            for interval in self.poll_intervals.values()
         )
+        # Nächster Fälligkeitszeitpunkt (time.monotonic()) des Site-Status im regulären
+        # Zyklus, falls der schnelle Pfad ihn nicht aktuell hält.
+        self._next_site_poll: float = 0.0
+        self._poll_unsub: Optional[CALLBACK_TYPE] = None
         self.ip = ip
         self.key = key
-        self.session = aiohttp.ClientSession()
+        self.gateway_id = gateway_id
+        # Gemeinsame HTTP-Session; die Semaphore begrenzt die parallelen Anfragen an dieses Gateway,
+        # auch wenn mehrere Einträge dasselbe Gateway ansprechen.
+        self._http = async_get_http_pool(hass)
+        # Antwortzeiten je Endpunkt und Gerät, Fehler, Timeouts, Bytes und Zyklusdauer.
+        # Werden als Diagnose-Sensoren am BEAAM Gateway und im Diagnose-Download angezeigt.
+        self.metrics = GatewayMetrics(cycle_timeout=LOCAL_CYCLE_TIMEOUT)
+        # Sämtliche Zugriffe auf das Gateway laufen über den Transport (Polling bzw. Push).
+        self.transport: BeaamTransport = create_transport(
+            self._http.session, self._http.host_limit(ip), ip, key, transport_mode, self.metrics
+        )
         
         # Speichert die statische Konfiguration des Gateways,
         # da sich die Struktur der angebundenen Geräte (Wechselrichter, Speicher) 
         # selten ändert und nicht bei jedem Zyklus neu geladen werden muss.
         self.beaam_config: Optional[Dict[str, Any]] = None
+        # Einmalig je Konfiguration erstellte Beschreibung aller Datenpunkte (Plattform,
+        # Name, Einheit, Klassen, Grenzen). Alle Plattformen legen ihre Entitäten daraus an.
+        self.descriptors: DescriptorTable = EMPTY_TABLE
+        self.unit_mapper = unit_mapper
+        # Geräte-Beschreibungen des Gateways und je Thing. Alle Entitäten eines Geräts
+        # verweisen auf dasselbe Objekt.
+        self.device_info = gateway_device_info(ip, gateway_id)
+        self.thing_device_infos: Dict[str, DeviceInfo] = {}
+
+        # Persistenter Cache der Konfiguration inkl. Inhalts-Hash. Ermöglicht einen
+        # schnellen Start ohne Netzwerkzugriff auf dem kritischen Pfad.
+        self._entry_id = entry_id
+        self._config_store: Store = Store(
+            hass, STORAGE_VERSION, beaam_config_storage_key(entry_id, gateway_id, ip)
+        )
+        self._config_hash: Optional[str] = None
+        self._config_etag: Optional[str] = None
+        # Zeitpunkt (time.monotonic()) der letzten Bestätigung durch das Gateway.
+        # None, solange die Konfiguration in dieser Sitzung nicht bestätigt wurde.
+        self._config_validated_at: Optional[float] = None
+        self._config_revalidation: Optional[asyncio.Task[None]] = None
+        # Listener, die über eine geänderte Gerätestruktur informiert werden.
+        self._config_listeners: List[CALLBACK_TYPE] = []
+
+        # Abfrage-Plan: Intervall (Sekunden) je Thing und der nächste Fälligkeitszeitpunkt
+        # (time.monotonic()). Wird beim Laden der Konfiguration aufgebaut.
+        self._thing_intervals: Dict[str, float] = {}
+        self._next_poll: Dict[str, float] = {}
+        # Die Slots der Datenpunkte je Thing, um bei fehlgeschlagenen Abfragen gezielt
+        # die Werte genau dieses Geräts verwerfen zu können.
+        self._thing_slots: Dict[str, List[int]] = {}
+        # Slot je (Thing, Schlüssel), um geschriebene Werte sofort im Speicher abzubilden.
+        self._key_slots: Dict[Tuple[str, str], int] = {}
+        # Die Slots der Datenpunkte des Energieflusses der Site.
+        self._flow_slots: List[int] = []
+        # Höchstalter der Werte (siehe _max_data_age); 0 = automatisch.
+        self._max_age = max_data_age
+
+        # Circuit Breaker je Thing: nicht antwortende Geräte werden mit Backoff pausiert,
+        # damit sie nicht in jedem Zyklus den vollen Timeout kosten.
+        self.thing_health = ThingHealthTracker()
+
+        # Sammelt Steuerungsbefehle kurz und sendet sie gebündelt je Thing.
+        self._command_batcher = CommandBatcher(
+            hass, self._async_post_commands, self._async_after_commands
+        )
+
+        # Kompakter Speicher aller aktuellen Datenpunkt-Werte. Die Slots der Datenpunkte
+        # werden beim Laden der Konfiguration vergeben und bleiben danach stabil.
+        self.state_store = DataPointStore()
+        # Abgeleitete Kennzahlen (Eigenverbrauch, Autarkie, ...) aus dem Energiefluss.
+        # Sie liegen in eigenen Slots desselben Speichers.
+        self.kpis = EnergyKpiCalculator(self.state_store)
+        # Energiezähler für Geräte, die nur ihre Leistung liefern (ebenfalls eigene Slots).
+        self._integrate_power = integrate_power
+        self.energy_integrator = PowerIntegrator(self.state_store)
+
+        # Index Slot -> Listener. Entitäten melden sich mit dem Slot ihres Datenpunkts
+        # als Kontext an; Listener ohne Kontext (None) werden immer benachrichtigt,
+        # Listener mit LISTENER_CONTEXT_CYCLE nur nach dem regulären Zyklus.
+        self._listener_index: Dict[Any, List[CALLBACK_TYPE]] = {}
+        # True, solange außerhalb des regulären Zyklus benachrichtigt wird.
+        self._notifying_out_of_cycle: bool = False
+        # Die Slots der im letzten Zyklus geänderten Datenpunkte. None bedeutet
+        # "alle benachrichtigen" (z.B. nach einem Fehler oder beim ersten Abruf).
+        self._changed_datapoints: Optional[Set[int]] = None
+        self._last_notified_success: Optional[bool] = None
+        # Hält kleine Schwankungen (Totband) und zu häufige Änderungen (Mindestabstand)
+        # zurück, bevor Entitäten benachrichtigt werden. Die Totbänder je Slot werden
+        # beim Laden der Konfiguration aus den Device Classes abgeleitet.
+        self._dead_bands: Mapping[str, DeadBand] = dead_bands or {}
+        self._publish_filter = PublishFilter(min_publish_interval)
+
+        # Schneller Pfad: Der Energiefluss der Site (Netzbezug/Einspeisung) wird in einer
+        # eigenen Schleife gelesen, unabhängig vom regulären Zyklus mit allen Geräten.
+        self.flow_interval = flow_interval
+        self._flow_unsub: Optional[CALLBACK_TYPE] = None
+        # Zeitpunkt (time.monotonic()) des letzten erfolgreichen Abrufs im schnellen Pfad.
+        self._flow_updated_at: Optional[float] = None
+        # Push-Kanal: Solange er verbunden ist, ersetzt er den schnellen Pfad.
+        self._push_task: Optional[asyncio.Task[None]] = None
+        self._push_connected: bool = False
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Registriert einen Listener und nimmt ihn in den Datenpunkt-Index auf.
+
+        Args:
+            update_callback: Die Funktion, die bei Änderungen aufgerufen wird.
+            context: Der Slot des Datenpunkts, auf den sich der Listener bezieht (oder None).
+
+        Returns:
+            Eine Funktion, die den Listener wieder entfernt.
+        """
+        remove = super().async_add_listener(update_callback, context)
+        self._listener_index.setdefault(context, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            listeners = self._listener_index.get(context)
+            if listeners and update_callback in listeners:
+                listeners.remove(update_callback)
+                if not listeners:
+                    del self._listener_index[context]
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Benachrichtigt nur die Listener der Datenpunkte, die sich geändert haben.
+
+        Ändert sich die Erreichbarkeit des Gateways (Erfolg <-> Fehler) oder ist nicht
+        bekannt, was sich geändert hat, werden wie gewohnt alle Listener benachrichtigt.
+        """
+        changed = self._changed_datapoints
+        self._changed_datapoints = None
+        store = self.state_store
+
+        if changed is None or self.last_update_success != self._last_notified_success:
+            self._last_notified_success = self.last_update_success
+            # Alle Entitäten zeigen danach den aktuellen Wert: Er wird zur neuen Referenz.
+            self._publish_filter.mark_published(range(len(store)), store, time.monotonic())
+            super().async_update_listeners()
+            return
+
+        self._publish_filter.mark_published(changed, store, time.monotonic())
+
+        callbacks: List[CALLBACK_TYPE] = list(self._listener_index.get(None, []))
+        if not self._notifying_out_of_cycle:
+            callbacks.extend(self._listener_index.get(LISTENER_CONTEXT_CYCLE, []))
+        for slot in changed:
+            callbacks.extend(self._listener_index.get(slot, []))
+
+        for update_callback in callbacks:
+            update_callback()
+
+    @callback
+    def _async_notify_slots(self, changed: Set[int]) -> None:
+        """Benachrichtigt außerhalb des regulären Zyklus die Entitäten geänderter Datenpunkte.
+
+        Args:
+            changed: Die Slots der geänderten Datenpunkte.
+        """
+        if not changed:
+            return
+        self._changed_datapoints = changed
+        self._notifying_out_of_cycle = True
+        try:
+            self.async_update_listeners()
+        finally:
+            self._notifying_out_of_cycle = False
+
+    @callback
+    def _async_publish_slots(self, changed: Set[int]) -> None:
+        """Benachrichtigt die Entitäten geänderter Datenpunkte, sofern der Filter sie durchlässt.
+
+        Args:
+            changed: Die Slots der geänderten Datenpunkte.
+        """
+        self._async_notify_slots(
+            self._publish_filter.filter(self.state_store, changed, time.monotonic())
+        )
+
+    @callback
+    def _async_config_loaded(self) -> None:
+        """Leitet nach dem Laden bzw. Ändern der Konfiguration alle abhängigen Strukturen ab."""
+        self.descriptors = build_descriptor_table(self.beaam_config, self.unit_mapper)
+        self.thing_device_infos = build_thing_device_infos(self.beaam_config, self.gateway_id)
+        self._build_poll_schedule()
+        self.kpis.configure(self.beaam_config)
+        self.energy_integrator.configure(
+            self._power_without_energy() if self._integrate_power else ()
+        )
+        self._publish_filter.set_dead_bands(
+            {
+                self.state_store.resolve(descriptor.dp_id): self._dead_bands[descriptor.device_class.value]
+                for descriptor in self.descriptors
+                if descriptor.data_type == "NUMBER"
+                and descriptor.device_class is not None
+                and descriptor.device_class.value in self._dead_bands
+            }
+        )
+
+    def _power_without_energy(self) -> List[DataPointDescriptor]:
+        """Wählt die Leistungs-Datenpunkte aus, die zu Energiezählern integriert werden.
+
+        Integriert werden gemessene Leistungen (schnelle Stufe, nicht steuerbar) von
+        Geräten, die selbst keinen Energiezähler liefern. Grenzwerte wie
+        MAX_POWER_CHARGE sind steuerbar bzw. in der langsamen Stufe und fallen heraus.
+        Leistungen in beide Richtungen (Speicher, Netz) werden ebenfalls übergangen, da
+        ein Zähler unter dem Namen "Energy" nur eine Richtung abbilden würde.
+        """
+        with_energy = {
+            descriptor.thing_id
+            for descriptor in self.descriptors
+            if descriptor.device_class == SensorDeviceClass.ENERGY
+        }
+        return [
+            descriptor
+            for descriptor in self.descriptors
+            if descriptor.device_class == SensorDeviceClass.POWER
+            and not descriptor.controllable
+            and descriptor.thing_id not in with_energy
+            and resolve_poll_tier(descriptor.thing_type, descriptor.key) == POLL_TIER_FAST
+            and descriptor.thing_type not in BIDIRECTIONAL_POWER_THING_TYPES
+            and not any(pattern in descriptor.key for pattern in BIDIRECTIONAL_POWER_KEY_PATTERNS)
+        ]
+
+    def _build_poll_schedule(self) -> None:
+        """Leitet aus der Konfiguration das Abfrage-Intervall jedes Things ab.
+
+        Ein Thing wird so oft abgefragt, wie es sein schnellster Datenpunkt verlangt,
+        da die BEAAM API die Zustände immer nur für das gesamte Gerät liefert.
+        """
+        self._thing_intervals = {}
+        self._thing_slots = {}
+        self._key_slots = {}
+
+        things: Dict[str, Any] = (self.beaam_config or {}).get("things", {})
+        for thing_id, thing_data in things.items():
+            thing_data = thing_data or {}
+            thing_type: str = thing_data.get("type", "")
+            datapoints: Dict[str, Any] = thing_data.get("dataPoints", {})
+
+            tiers = {
+                resolve_poll_tier(thing_type, (dp_data or {}).get("key", ""))
+                for dp_data in datapoints.values()
+            }
+            if not tiers:
+                tiers = {THING_TYPE_POLL_TIERS.get(thing_type, POLL_TIER_NORMAL)}
+
+            self._thing_intervals[thing_id] = min(self.poll_intervals[tier] for tier in tiers)
+            self._thing_slots[thing_id] = [self.state_store.resolve(dp_id) for dp_id in datapoints]
+            for dp_id, dp_data in datapoints.items():
+                if dp_data and dp_data.get("key"):
+                    self._key_slots[(thing_id, dp_data["key"])] = self.state_store.resolve(dp_id)
+
+        flow_datapoints: Dict[str, Any] = (
+            ((self.beaam_config or {}).get("energyFlow") or {}).get("dataPoints") or {}
+        )
+        self._flow_slots = [self.state_store.resolve(dp_id) for dp_id in flow_datapoints]
+
+        # Alle Things sind beim ersten Zyklus sofort fällig.
+        self._next_poll = {}
+        LOGGER.debug("BEAAM Abfrage-Plan (Sekunden je Thing): %s", self._thing_intervals)
+
+    def _effective_interval(self, interval: float, factor: Optional[float] = None) -> float:
+        """Gibt das Intervall einer Stufe nach Anwendung des adaptiven Faktors zurück.
+
+        Args:
+            interval: Das eingestellte Intervall (Sekunden).
+            factor: Der Faktor; None = aktueller Faktor des Reglers. Bei Faktor 1 bleibt
+                das eingestellte Intervall unverändert, auch außerhalb der Grenzen.
+        """
+        factor = self.adaptive.factor if factor is None else factor
+        if factor == 1.0:
+            return interval
+        lower, upper = self._interval_bounds
+        # Die Grenzen dürfen das eingestellte Intervall nicht in die Gegenrichtung verschieben.
+        if factor < 1.0:
+            return min(max(interval * factor, lower), interval)
+        return max(min(interval * factor, upper), interval)
+
+    @callback
+    def async_mark_all_due(self) -> None:
+        """Macht alle Things und den Site-Status im nächsten Zyklus fällig.
+
+        Things mit offenem Circuit Breaker bleiben pausiert. Gedacht für Benchmarks
+        (tools/) und einen vollständigen Abruf auf Anforderung.
+        """
+        self._next_poll.clear()
+        self._next_site_poll = 0.0
+
+    def _due_things(self, now: float) -> List[str]:
+        """Gibt die Things zurück, deren Abfrage-Intervall abgelaufen ist, und plant sie neu ein.
+
+        Ein halber Tick Toleranz verhindert, dass ein Gerät wegen Millisekunden
+        Verspätung einen ganzen Tick zu spät abgefragt wird. Things, deren Circuit
+        Breaker offen ist, werden übersprungen, bis ihre Wartezeit abgelaufen ist.
+        Das Intervall jedes Things wird mit dem adaptiven Faktor angepasst.
+
+        Args:
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        tolerance = self.tick_interval / 2
+        due: List[str] = []
+        for thing_id, interval in self._thing_intervals.items():
+            if self._next_poll.get(thing_id, 0.0) - now <= tolerance:
+                self._next_poll[thing_id] = now + self._effective_interval(interval)
+                if self.thing_health.allow(thing_id, now):
+                    due.append(thing_id)
+        return due
+
+    @callback
+    def async_add_config_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Registriert einen Listener, der bei geänderter Gerätestruktur aufgerufen wird.
+
+        Die Plattformen nutzen dies, um Entitäten für neue Geräte/Datenpunkte anzulegen
+        und für weggefallene zu entfernen, ohne den Eintrag neu zu laden.
+
+        Args:
+            update_callback: Die Funktion, die nach einer Konfigurationsänderung aufgerufen wird.
+
+        Returns:
+            Eine Funktion, die den Listener wieder entfernt.
+        """
+        self._config_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._config_listeners:
+                self._config_listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_load_cached_config(self) -> None:
+        """Lädt die zuletzt bekannte Gerätestruktur aus dem lokalen Speicher (HA Store).
+
+        Dadurch stehen die Geräte und Datenpunkte sofort beim Start zur Verfügung,
+        auch wenn das Gateway (noch) nicht erreichbar ist. Die Konfiguration wird
+        anschließend im Hintergrund beim Gateway revalidiert.
+        """
+        cached: Optional[Dict[str, Any]] = await self._config_store.async_load()
+        if not cached or not cached.get("config"):
+            return
+
+        self.beaam_config = cached["config"]
+        self._config_hash = cached.get("hash")
+        self._config_etag = cached.get("etag")
+        self._async_config_loaded()
+        LOGGER.debug("BEAAM Konfiguration aus dem Cache geladen (Hash %s).", self._config_hash)
 
     async def _ensure_config_loaded(self) -> None:
         """Stellt sicher, dass die Gerätestruktur ("Konfiguration") vom Gateway geladen wurde.
         
         Diese Konfiguration enhält Informationen über alle verbundenden Geräte ("Things")
         und ihre verfügbaren Datenpunkte ("DataPoints").
-        Diese Methode ruft die API nur dann auf, wenn `self.beaam_config` noch leer (None) ist.
+        Diese Methode ruft die API nur dann direkt auf, wenn `self.beaam_config` noch leer (None) ist.
+        Ansonsten wird die Konfiguration beim Start (Cache) und danach alle
+        CONFIG_REVALIDATE_INTERVAL Sekunden im Hintergrund revalidiert,
+        ohne den aktuellen Abfragezyklus zu verzögern.
         """
         if self.beaam_config is not None:
+            revalidation_due = (
+                self._config_validated_at is None
+                or time.monotonic() - self._config_validated_at >= CONFIG_REVALIDATE_INTERVAL
+            )
+            if revalidation_due and self._config_revalidation is None:
+                self._config_revalidation = self.hass.async_create_background_task(
+                    self._async_revalidate_config(),
+                    name=f"{DOMAIN} BEAAM configuration revalidation",
+                )
             return  # Konfiguration ist bereits geladen
 
-        url = f"http://{self.ip}/api/v1/site/configuration"
-        headers = {"Authorization": f"Bearer {self.key}"}
-        
+        config, etag = await self._async_fetch_config(conditional=False)
+        # Ohne Cache und mit beim Start nicht erreichbarem Gateway wurden die Plattformen
+        # ohne Konfiguration eingerichtet: Sie legen ihre Entitäten jetzt an.
+        if config is not None and await self._async_apply_config(config, etag):
+            self._async_notify_config_listeners()
+
+    async def _async_fetch_config(
+        self, conditional: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Ruft die Gerätestruktur vom Gateway ab.
+
+        Args:
+            conditional: Sendet das zuletzt bekannte ETag mit (If-None-Match), sodass
+                das Gateway bei unveränderter Konfiguration nur "304 Not Modified" antwortet.
+
+        Returns:
+            Ein Tupel aus Konfiguration (None bei "304 Not Modified") und ETag der Antwort.
+
+        Raises:
+            UpdateFailed: Wenn die Konfiguration nicht geladen werden konnte.
+        """
         try:
-            # Längeres Timeout für den initialen Konfigurationsabruf
-            async with async_timeout.timeout(10):
-                async with self.session.get(url, headers=headers) as resp:
-                    if resp.status == 401:
-                        raise ConfigEntryAuthFailed("Lokaler BEAAM API Key ist ungültig oder abgewiesen.")
-                    
-                    resp.raise_for_status()
-                    self.beaam_config = await resp.json()
-                    LOGGER.info("BEAAM Konfiguration (Gerätestruktur) erfolgreich geladen.")
+            config, etag = await self.transport.async_get_configuration(
+                self._config_etag if conditional else None
+            )
+        except BeaamAuthError as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
         except Exception as err:
             # Wird an die aufrufende Methode (_async_update_data) weitergereicht.
             raise UpdateFailed(f"Konnte BEAAM Konfiguration nicht laden: {err}") from err
 
-    async def _fetch_thing_state(self, thing_id: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if config is not None:
+            LOGGER.debug("BEAAM Konfiguration (Gerätestruktur) erfolgreich geladen.")
+        return config, etag
+
+    async def _async_apply_config(self, config: Dict[str, Any], etag: Optional[str]) -> bool:
+        """Übernimmt eine frisch geladene Konfiguration und speichert sie bei Änderungen im Cache.
+
+        Args:
+            config: Die vom Gateway geladene Konfiguration.
+            etag: Das ETag der Antwort (falls vom Gateway geliefert).
+
+        Returns:
+            True, wenn sich die Konfiguration gegenüber der bisherigen geändert hat.
+        """
+        config_hash = _hash_config(config)
+        self._config_validated_at = time.monotonic()
+        if config_hash == self._config_hash and etag == self._config_etag:
+            return False
+
+        changed = config_hash != self._config_hash
+        self.beaam_config = config
+        self._config_hash = config_hash
+        self._config_etag = etag
+        if changed:
+            LOGGER.info("BEAAM Konfiguration (Gerätestruktur) geladen bzw. geändert.")
+            self._async_config_loaded()
+        await self._config_store.async_save(
+            {"hash": config_hash, "etag": etag, "config": config}
+        )
+        return changed
+
+    async def _async_revalidate_config(self) -> None:
+        """Vergleicht die bekannte Konfiguration im Hintergrund mit der des Gateways.
+
+        Hat sich die Gerätestruktur geändert, werden die registrierten Config-Listener
+        benachrichtigt, die daraufhin Entitäten inkrementell hinzufügen oder entfernen.
+        Schlägt der Abruf fehl, wird es im nächsten Zyklus erneut versucht.
+        """
+        try:
+            config, etag = await self._async_fetch_config()
+        except UpdateFailed as err:
+            LOGGER.debug("Revalidierung der BEAAM Konfiguration fehlgeschlagen: %s", err)
+            return
+        finally:
+            self._config_revalidation = None
+
+        if config is None:
+            # 304 Not Modified: Die Konfiguration ist unverändert.
+            self._config_validated_at = time.monotonic()
+            return
+
+        if await self._async_apply_config(config, etag):
+            self._async_notify_config_listeners()
+
+    @callback
+    def _async_notify_config_listeners(self) -> None:
+        """Informiert die Plattformen über eine neue bzw. geänderte Gerätestruktur."""
+        for update_callback in list(self._config_listeners):
+            update_callback()
+
+    async def _async_fetch_site_state(self, changed: Set[int]) -> None:
+        """Ruft den globalen Site-Status ab und übernimmt den Energiefluss in den Speicher.
+
+        Args:
+            changed: Menge, in die die Slots geänderter Datenpunkte eingetragen werden.
+
+        Raises:
+            ConfigEntryAuthFailed: Wenn der API Key abgewiesen wird.
+            aiohttp.ClientError: Bei anderen HTTP-Fehlern.
+        """
+        try:
+            flow_states = await self.transport.async_get_site_state()
+        except BeaamAuthError as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
+
+        # Die übergeordneten Datenpunkte (Energy-Flow) in den Speicher übernehmen
+        # und die davon abgeleiteten Kennzahlen nachziehen.
+        self.state_store.apply(flow_states, changed)
+        self.kpis.update(changed, time.monotonic(), flow_refreshed=True)
+
+    @callback
+    def async_start_polling(self) -> None:
+        """Meldet die regelmäßige Abfrage beim gemeinsamen Taktgeber an.
+
+        Der Taktgeber versetzt die Ticks mehrerer Gateways gegeneinander, damit ihre
+        Abfragen nicht im selben Moment starten.
+        """
+        if self._poll_unsub is None:
+            self._poll_unsub = async_get_scheduler(self.hass).async_schedule(
+                f"BEAAM {self.ip}", self.tick_interval, self._async_tick
+            )
+
+    async def _async_tick(self) -> None:
+        """Startet einen Zyklus, sofern in diesem Takt etwas fällig ist.
+
+        Der Takt läuft im kürzesten möglichen Intervall (beim kleinsten adaptiven Faktor).
+        Takte ohne fälliges Gerät, ohne fälligen Site-Status und ohne zurückgehaltene
+        Änderung lösen keinen Zyklus aus. Sie würden sonst die Zyklusdauer in den
+        Diagnosen verfälschen und die Listener ohne Anlass benachrichtigen.
+        """
+        if self._cycle_due(time.monotonic()):
+            await self.async_refresh()
+
+    def _cycle_due(self, now: float) -> bool:
+        """Prüft, ob ein Gerät, der Site-Status oder eine zurückgehaltene Änderung fällig ist.
+
+        Geräte mit offenem Circuit Breaker zählen als fällig, damit ihre Werte im
+        Zyklus weiterhin auf ihr Höchstalter geprüft werden.
+
+        Args:
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        if self._publish_filter.pending or self._site_poll_due(now):
+            return True
+        tolerance = self.tick_interval / 2
+        return any(
+            self._next_poll.get(thing_id, 0.0) - now <= tolerance for thing_id in self._thing_intervals
+        )
+
+    def _site_poll_due(self, now: float) -> bool:
+        """Prüft, ob der reguläre Zyklus den Site-Status selbst lesen muss.
+
+        Das ist der Fall, wenn weder Push-Kanal noch schneller Pfad den Energiefluss
+        aktuell halten und das (adaptive) Intervall der schnellsten Stufe abgelaufen ist.
+
+        Args:
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        return (
+            not self._flow_stream_fresh(now)
+            and self._next_site_poll - now <= self.tick_interval / 2
+        )
+
+    @callback
+    def async_start_flow_stream(self) -> None:
+        """Startet den schnellen Pfad für den Energiefluss der Site.
+
+        Der Energiefluss (Netzbezug/Einspeisung, PV, Speicher) wird im Takt
+        `flow_interval` gelesen, während die Abfrage aller Geräte in ihren eigenen,
+        langsameren Stufen läuft. So sehen z.B. Lastmanagement-Automationen
+        Netzwerte, die höchstens eine Sekunde alt sind.
+
+        Unterstützt der Transport Push-Nachrichten, wird parallel geprüft, ob das
+        Gateway den Push-Kanal anbietet. Ist er verbunden, ersetzt er das Polling
+        des Energieflusses; reißt er ab, übernimmt wieder das Polling.
+        """
+        self._async_start_flow_timer()
+        if self.transport.supports_push and self._push_task is None:
+            self._push_task = self.hass.async_create_background_task(
+                self._async_run_push(), name=f"{DOMAIN} BEAAM push"
+            )
+
+    @callback
+    def _async_start_flow_timer(self) -> None:
+        """Startet das Polling des Energieflusses (sofern aktiviert und nicht bereits aktiv)."""
+        if self.flow_interval <= 0 or self._flow_unsub is not None:
+            return
+        # Läuft ein Abruf noch, wenn der nächste Takt fällig ist (das Gateway antwortet
+        # langsamer als das Intervall), lässt der Taktgeber den Takt aus statt zu stapeln.
+        self._flow_unsub = async_get_scheduler(self.hass).async_schedule(
+            f"BEAAM {self.ip} energy flow", self.flow_interval, self._async_refresh_flow
+        )
+
+    @callback
+    def _async_stop_flow_timer(self) -> None:
+        """Beendet das Polling des Energieflusses."""
+        if self._flow_unsub is not None:
+            self._flow_unsub()
+            self._flow_unsub = None
+
+    async def _async_refresh_flow(self) -> None:
+        """Liest den Energiefluss der Site und benachrichtigt die Entitäten geänderter Werte.
+
+        Fehler werden nur protokolliert: Ist der schnelle Pfad veraltet, liest der
+        reguläre Zyklus den Site-Status selbst und meldet Verbindungsfehler wie gewohnt.
+        """
+        changed: Set[int] = set()
+        try:
+            async with async_timeout.timeout(5):
+                await self._async_fetch_site_state(changed)
+        except (ConfigEntryAuthFailed, aiohttp.ClientError, asyncio.TimeoutError) as err:
+            # aiohttp.ClientError umfasst auch ungültige Antworten (BeaamPayloadError).
+            LOGGER.debug("Schneller Abruf des BEAAM Energieflusses fehlgeschlagen: %s", err)
+            return
+
+        self._flow_updated_at = time.monotonic()
+        # Vor dem ersten regulären Zyklus gibt es noch keine Entitäten zu benachrichtigen.
+        if self.data is not None and self.last_update_success:
+            self._async_publish_slots(changed)
+
+    async def _async_run_push(self) -> None:
+        """Hält den Push-Kanal zum Gateway offen und verbindet sich bei Abbruch neu.
+
+        Bietet das Gateway keinen Push-Kanal an, bleibt es dauerhaft beim Polling. Weist
+        das Gateway den API Key ab, endet der Push-Kanal und die erneute Anmeldung wird
+        gestartet (wie beim Polling).
+        """
+        if not await self.transport.async_probe_push():
+            LOGGER.debug("BEAAM Gateway bietet keinen Push-Kanal an, verwende Polling.")
+            self._push_task = None
+            return
+
+        LOGGER.info("BEAAM Push-Kanal verfügbar, Energiefluss wird ohne Polling empfangen.")
+        backoff: float = PUSH_RECONNECT_MIN
+        while True:
+            try:
+                await self.transport.async_listen(self._async_handle_push)
+                LOGGER.debug("BEAAM Push-Kanal vom Gateway geschlossen.")
+            except asyncio.CancelledError:
+                raise
+            except BeaamAuthError as err:
+                LOGGER.warning("BEAAM Push-Kanal beendet: %s", err)
+                self._push_task = None
+                if self._push_connected:
+                    self._push_connected = False
+                    self._async_start_flow_timer()
+                if self.config_entry is not None:
+                    self.config_entry.async_start_reauth(self.hass)
+                return
+            except Exception as err:
+                LOGGER.debug("BEAAM Push-Kanal unterbrochen: %s", err)
+
+            if self._push_connected:
+                # Es kamen Nachrichten an: Der nächste Versuch beginnt wieder mit kurzer Wartezeit.
+                backoff = PUSH_RECONNECT_MIN
+                self._push_connected = False
+                self._async_start_flow_timer()
+            else:
+                backoff = min(backoff * 2, PUSH_RECONNECT_MAX)
+
+            await asyncio.sleep(backoff)
+
+    @callback
+    def _async_handle_push(self, states: List[StateItem], energy_flow: bool) -> None:
+        """Übernimmt die Zustände einer Push-Nachricht des Gateways in den Speicher.
+
+        Args:
+            states: Die Zustände als (dataPointId, value, timestamp).
+            energy_flow: True, wenn es sich um den Energiefluss der Site handelt.
+        """
+        if not self._push_connected:
+            self._push_connected = True
+            self._async_stop_flow_timer()
+
+        changed: Set[int] = set()
+        self.state_store.apply(states, changed)
+        if energy_flow:
+            self._flow_updated_at = time.monotonic()
+            self.kpis.update(changed, self._flow_updated_at, flow_refreshed=True)
+        else:
+            # Zustände eines Geräts: Stützpunkte für die Energiezähler.
+            self.energy_integrator.sample(
+                (self.state_store.slot(dp_id) for dp_id, _, _ in states), time.monotonic(), changed
+            )
+
+        if self.data is not None and self.last_update_success:
+            self._async_publish_slots(changed)
+
+    @property
+    def push_connected(self) -> bool:
+        """Gibt an, ob der Push-Kanal zum Gateway aktuell verbunden ist."""
+        return self._push_connected
+
+    def _flow_stream_fresh(self, now: float) -> bool:
+        """Prüft, ob der Push-Kanal oder der schnelle Pfad den Energiefluss aktuell hält.
+
+        Args:
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        if self._push_connected:
+            return True
+        return (
+            self._flow_unsub is not None
+            and self._flow_updated_at is not None
+            and now - self._flow_updated_at <= FLOW_STALE_FACTOR * self.flow_interval
+        )
+
+    async def _fetch_thing_state(self, thing_id: str) -> Optional[List[StateItem]]:
         """Hilfsfunktion: Ruft den detaillierten Status eines einzelnen Geräts ('Thing') auf dem BEAAM ab.
 
         Args:
             thing_id: Die eindeutige ID des Geräts (aus der Konfiguration).
-            headers: Authorization-Header für die API.
 
         Returns:
-            Das vom Gateway zurückgegebene Dictionary mit den Gerätestatusdaten,
+            Die Zustände der Datenpunkte des Geräts als (dataPointId, value, timestamp),
             oder None, wenn der Aufruf fehlschlägt.
         """
-        url = f"http://{self.ip}/api/v1/things/{thing_id}/states"
         try:
-            # Wir geben einzelnen Geräten einen kurzen Timeout (5 Sekunden).
-            # Wenn ein Gerät im rs485 Bus hängt, soll es nicht den Rest blockieren.
-            async with async_timeout.timeout(5):
-                async with self.session.get(url, headers=headers) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
+            return await self.transport.async_get_thing_states(thing_id)
         except Exception as err:
             # Wir loggen den Fehler nur als DEBUG, um das Log nicht mit Fehlern unzugänglicher Geräte zu fluten.
+            # Gezählt wird er trotzdem (siehe metrics) und ist in den Diagnose-Sensoren sichtbar.
             # Das Gerät wird in diesem Update-Zyklus ignoriert.
             LOGGER.debug("Konnte Status für Thing '%s' nicht abrufen: %s", thing_id, err)
         return None
@@ -196,86 +1068,258 @@ class NeoomLocalCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
 
         Der Ablauf ist:
         1. Stelle sicher, dass wir wissen, welche Geräte es gibt (Konfiguration laden).
-        2. Hole den globalen "Site-State" (Zusammenfassung der Energieflüsse).
-        3. Parallel: Hole detaillierte Statusdaten für alle bekannten Geräte einzeln.
+        2. Parallel: Hole den globalen "Site-State" (Zusammenfassung der Energieflüsse),
+           sofern ihn nicht bereits der schnelle Pfad aktuell hält, und detaillierte
+           Statusdaten für alle Geräte, deren Abfrage-Intervall abgelaufen ist.
+           Nicht fällige Geräte behalten ihre Werte aus dem vorherigen Zyklus.
+        3. Markiere Datenpunkte, deren Wert sein Höchstalter überschritten hat, als
+           nicht verfügbar. Ein einzelnes nicht antwortendes Gerät verwirft so weder
+           die Ergebnisse der anderen noch sofort seine eigenen Werte.
         
         Returns:
             Ein Dictionary enthaltend die statische Konfiguration und
-            eine Map (Wörterbuch) aller aktuellen Sensorwerte:
-            {"config": {...}, "states": { "dataPointId": state_object, ... }}
+            den Speicher aller aktuellen Datenpunkt-Werte:
+            {"config": {...}, "states": DataPointStore}
             
         Raises:
-            UpdateFailed: Bei allgemeinen Kommunikationsproblemen.
+            UpdateFailed: Wenn keine Anfrage gelingt und keine gültigen Werte mehr vorliegen.
             ConfigEntryAuthFailed: Wenn die Zugangsdaten falsch sind.
         """
+        # Bis der Zyklus erfolgreich war, ist unbekannt, welche Datenpunkte sich geändert haben.
+        self._changed_datapoints = None
+        cycle_start = time.perf_counter()
+
         # Stelle sicher, dass die Gerätestruktur im Speicher ist
         await self._ensure_config_loaded()
 
-        headers = {"Authorization": f"Bearer {self.key}"}
-        
-        # In diesem Dictionary sammeln wir aggregiert alle Datenpunkte 
-        # (egal ob sie von der Site-Übersicht oder von Detail-Abfragen stammen).
-        # Key: dataPointId (die interne Sensor-ID), Value: Das komplette Objekt des Werts
-        state_map: Dict[str, Any] = {}
+        # Alle Datenpunkte (egal ob sie von der Site-Übersicht oder von Detail-Abfragen stammen)
+        # werden direkt im Speicher aktualisiert. Nicht fällige Geräte behalten so ihre Werte.
+        # Gesammelt werden nur die Slots, deren Wert sich tatsächlich geändert hat.
+        store = self.state_store
+        changed: Set[int] = set()
 
+        # Jede Anfrage hat ihr eigenes Timeout (siehe transport.py). Für den Zyklus gilt
+        # zusätzlich eine Frist: Was bis dahin geliefert wurde, wird übernommen; noch offene
+        # Anfragen werden abgebrochen und zählen nur für ihr eigenes Gerät als Fehler.
+        site_task: Optional[asyncio.Task[None]] = None
+        thing_tasks: Dict[str, asyncio.Task[Optional[List[StateItem]]]] = {}
         try:
-            # Gesamt-Timeout für den gesamten Refresh-Zyklus
-            async with async_timeout.timeout(20):
-                
-                # 1. Globalen Site-Status abrufen
-                url_site = f"http://{self.ip}/api/v1/site/state"
-                async with self.session.get(url_site, headers=headers) as resp:
-                    if resp.status == 401:
-                        raise ConfigEntryAuthFailed("Lokaler BEAAM API Key ist ungültig.")
-                    resp.raise_for_status()
-                    site_data: Dict[str, Any] = await resp.json()
-                    
-                    # Extrahiere die übergeordneten Datenpunkte (Energy-Flow) aus der Antwort
-                    if "energyFlow" in site_data and "states" in site_data["energyFlow"]:
-                        for item in site_data["energyFlow"]["states"]:
-                            state_map[item["dataPointId"]] = item
-
-                # 2. Detail-Status für einzelne Geräte ("Things") abrufen
-                # Wir sammeln alle API-Aufrufe als "Tasks" und starten sie dann gleichzeitig (parallel),
-                # anstatt darauf zu warten, dass jedes Gerät nacheinander antwortet.
-                if self.beaam_config and "things" in self.beaam_config:
-                    tasks: List[asyncio.Task[Optional[Dict[str, Any]]]] = []
-                    
-                    for thing_id in self.beaam_config["things"]:
-                        # Erstellt ein asynchrones Task-Objekt
-                        tasks.append(
-                            asyncio.create_task(
-                                self._fetch_thing_state(thing_id, headers)
-                            )
-                        )
-                    
-                    if tasks:
-                        # asyncio.gather wartet, bis alle Tasks beendet sind.
-                        # Rückgabe ist eine Liste der Resultate jedes Tasks (Gleiche Reihenfolge wie in `tasks`).
-                        results = await asyncio.gather(*tasks)
-                        
-                        # Verarbeite die Ergebnisse und mittle sie in die state_map ein
-                        for res in results:
-                            if res and "states" in res:
-                                for item in res["states"]:
-                                    state_map[item["dataPointId"]] = item
-
-                # Returniere die fertige Datenstruktur für unsere Entitäts-Klassen
-                return {
-                    "config": self.beaam_config,
-                    "states": state_map
-                }
+            # 1. Globalen Site-Status abrufen. Läuft der schnelle Pfad, ist der
+            # Energiefluss bereits aktuell; nur wenn er ausbleibt, liest der
+            # reguläre Zyklus ihn selbst (und erkennt so Verbindungsfehler),
+            # im (adaptiven) Intervall der schnellsten Stufe.
+            now = time.monotonic()
+            if self._site_poll_due(now):
+                self._next_site_poll = now + self._effective_interval(
+                    min(self.poll_intervals.values())
+                )
+                site_task = asyncio.create_task(self._async_fetch_site_state(changed))
 
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Kommunikationsfehler (Netzwerk/HTTP) mit BEAAM Gateway: {err}") from err
-        except asyncio.TimeoutError as err:
-            raise UpdateFailed("Timeout beim Erfassen lokaler Daten via BEAAM.") from err
+            # 2. Detail-Status für einzelne Geräte ("Things") abrufen
+            # Wir sammeln alle API-Aufrufe als "Tasks" und starten sie gleichzeitig (parallel)
+            # mit dem Site-Status, anstatt darauf zu warten, dass jedes Gerät nacheinander antwortet.
+            due_things = self._due_things(now)
+            # Stand der Antwortzeiten vor den Abfragen, um die dieses Zyklus zu ermitteln.
+            count_before, total_before = self.metrics.request_snapshot("thing_states")[:2]
+            for thing_id in due_things:
+                thing_tasks[thing_id] = asyncio.create_task(self._fetch_thing_state(thing_id))
+
+            tasks: List[asyncio.Task[Any]] = list(thing_tasks.values())
+            if site_task is not None:
+                tasks.append(site_task)
+            expired = 0
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=LOCAL_CYCLE_TIMEOUT)
+                expired = len(pending)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+            # Mindestens eine Anfrage muss gelingen, damit der Zyklus als erfolgreich gilt.
+            succeeded = False
+            site_error: Optional[str] = None
+            if site_task is not None:
+                if site_task.cancelled():
+                    site_error = "Frist des Zyklus überschritten"
+                else:
+                    err = site_task.exception()
+                    if err is None:
+                        succeeded = True
+                    elif isinstance(err, ConfigEntryAuthFailed):
+                        raise err
+                    elif isinstance(err, (aiohttp.ClientError, asyncio.TimeoutError)):
+                        # Inkl. ungültiger Antworten (BeaamPayloadError).
+                        site_error = str(err) or type(err).__name__
+                    else:
+                        raise UpdateFailed(
+                            f"Unerwarteter Fehler beim Abruf des BEAAM Site-Status: {err!r}"
+                        ) from err
+                if site_error is not None:
+                    LOGGER.debug("Konnte Site-Status des BEAAM Gateways nicht abrufen: %s", site_error)
+
+            # Verarbeite die Ergebnisse und übernimm sie in den Speicher
+            now = time.monotonic()
+            failed_things = self._apply_thing_results(
+                {
+                    thing_id: None if task.cancelled() else task.result()
+                    for thing_id, task in thing_tasks.items()
+                },
+                now,
+                changed,
+            )
+            if failed_things < len(thing_tasks):
+                succeeded = True
+
+            if thing_tasks or site_error is not None:
+                # Antwortzeit und Änderungsrate der abgefragten Geräte an die adaptive
+                # Abfrage übergeben; sie bestimmt die Intervalle der nächsten Zyklen.
+                # Als Fehler zählen nur Signale des Gateways selbst: Fehler beim Site-Status,
+                # überschrittene Frist oder der Ausfall der meisten abgefragten Geräte.
+                # Einzelne defekte Geräte (inkl. der Probe-Abfragen ihres Circuit Breakers)
+                # verlängern so nicht die Intervalle der gesunden Geräte.
+                count, total = self.metrics.request_snapshot("thing_states")[:2]
+                polled_slots = [
+                    slot for thing_id in due_things for slot in self._thing_slots.get(thing_id, ())
+                ]
+                self.adaptive.record(
+                    (total - total_before) / (count - count_before) if count > count_before else None,
+                    sum(1 for slot in polled_slots if slot in changed) / len(polled_slots)
+                    if polled_slots
+                    else None,
+                    site_error is not None
+                    or expired > 0
+                    or failed_things * 2 > len(thing_tasks) > 0,
+                )
 
+            # 3. Werte, die ihr Höchstalter überschritten haben, als nicht verfügbar markieren
+            # und die davon abgeleiteten Kennzahlen nachziehen.
+            self._expire_stale(now, changed)
+            self.kpis.update(changed, now)
+
+            # Antwortet das Gateway gar nicht, gilt der Zyklus erst als fehlgeschlagen, wenn
+            # auch keine noch gültigen Werte mehr vorliegen (oder es noch keine gab).
+            if tasks and not succeeded and not self._has_valid_data():
+                raise UpdateFailed(
+                    f"Keine Antwort vom BEAAM Gateway ({len(tasks)} Anfragen, davon {expired} "
+                    f"nach Ablauf der Frist abgebrochen)."
+                    + (f" Site-Status: {site_error}" if site_error else "")
+                )
+
+            # Beim ersten Abruf gibt es nichts zu vergleichen: dann alle benachrichtigen.
+            # Sonst nur die Datenpunkte, deren Änderung der Filter durchlässt.
+            if self.data is not None:
+                self._changed_datapoints = self._publish_filter.filter(
+                    store, changed, time.monotonic()
+                )
+
+            LOGGER.debug(
+                "BEAAM Zyklus: %d von %d Things abgefragt (%d abgebrochen), %s Datenpunkte geändert, "
+                "Intervall-Faktor %.2f.",
+                len(due_things),
+                len(self._thing_intervals),
+                expired,
+                "alle" if self._changed_datapoints is None else len(self._changed_datapoints),
+                self.adaptive.factor,
+            )
+
+            # Returniere die fertige Datenstruktur für unsere Entitäts-Klassen
+            return {
+                "config": self.beaam_config,
+                "states": store
+            }
+
+        finally:
+            # Wird der Zyklus selbst abgebrochen (z.B. beim Entladen), keine Anfragen zurücklassen.
+            for task in (*thing_tasks.values(), site_task):
+                if task is not None and not task.done():
+                    task.cancel()
+            # Nur Zyklen mit Anfragen zählen für die Zyklusdauer (z.B. nicht, wenn alle
+            # fälligen Geräte durch ihren Circuit Breaker pausiert sind).
+            if thing_tasks or site_task is not None:
+                self.metrics.record_cycle(time.perf_counter() - cycle_start)
+
+    def _apply_thing_results(
+        self, results: Mapping[str, Optional[List[StateItem]]], now: float, changed: Set[int]
+    ) -> int:
+        """Übernimmt die Antworten abgefragter Things in Speicher, Circuit Breaker und Energiezähler.
+
+        Gemeinsamer Schritt des regulären Zyklus und des gezielten Lesens nach Befehlen.
+
+        Args:
+            results: Die Zustände je Thing (None, wenn das Thing nicht geantwortet hat).
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+            changed: Menge, in die die Slots geänderter Datenpunkte eingetragen werden.
+
+        Returns:
+            Die Anzahl der Things ohne Antwort.
+        """
+        failed = 0
+        for thing_id, res in results.items():
+            slots = self._thing_slots.get(thing_id, ())
+            if res is not None:
+                self.thing_health.record_success(thing_id)
+                self.state_store.apply(res, changed)
+                # Jeder Abruf ist ein Stützpunkt der Energiezähler.
+                self.energy_integrator.sample(slots, now, changed)
+            else:
+                # Ein nicht erreichbares Gerät liefert keine Werte. Seine letzten Werte
+                # bleiben stehen, bis sie ihr Höchstalter überschreiten (siehe _expire_stale);
+                # der Circuit Breaker pausiert es, die Energiezähler setzen neu auf.
+                self.thing_health.record_failure(thing_id, now)
+                self.energy_integrator.interrupt(slots)
+                failed += 1
+        return failed
+
+    def _max_data_age(self, interval: float) -> float:
+        """Gibt das Höchstalter (Sekunden) der Werte eines Geräts mit dem gegebenen Intervall zurück.
+
+        Ein eingestelltes Höchstalter gilt für alle Datenpunkte, wird aber nie kürzer als
+        ein Abfrage-Intervall plus die Frist des Zyklus, damit Geräte mit langem Intervall
+        nicht zwischen zwei regulären Abfragen als nicht verfügbar gelten.
+
+        Args:
+            interval: Das eingestellte Abfrage-Intervall (Sekunden) des Geräts.
+        """
+        effective = self._effective_interval(interval)
+        if self._max_age <= 0:
+            return DATA_STALE_FACTOR * effective
+        return max(self._max_age, effective + LOCAL_CYCLE_TIMEOUT)
+
+    def _expire_stale(self, now: float, changed: Set[int]) -> None:
+        """Markiert die Datenpunkte als nicht verfügbar, deren Wert sein Höchstalter überschritten hat.
+
+        Args:
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+            changed: Menge, in die die Slots verworfener Werte eingetragen werden.
+        """
+        store = self.state_store
+        for thing_id, interval in self._thing_intervals.items():
+            store.expire(self._thing_slots.get(thing_id, ()), now - self._max_data_age(interval), changed)
+        # Über den Push-Kanal kommen nur Änderungen; ein gleichbleibender Wert veraltet dort nicht.
+        if not self._push_connected:
+            store.expire(
+                self._flow_slots, now - self._max_data_age(min(self.poll_intervals.values())), changed
+            )
+
+    def _has_valid_data(self) -> bool:
+        """Prüft, ob noch mindestens ein Datenpunkt des Gateways einen gültigen Wert hat."""
+        qualities = self.state_store.qualities
+        return any(
+            qualities[slot] == QUALITY_GOOD
+            for slots in (*self._thing_slots.values(), self._flow_slots)
+            for slot in slots
+        )
 
     async def async_send_command(self, thing_id: str, key: str, value: Any) -> None:
         """Sendet einen Steuerungsbefehl an die BEAAM API (ändert z.B. einen Wert am Wechselrichter).
         
         Wird beispielsweise von Number- (Slider) oder Select-Entitäten aufgerufen.
+        Der neue Wert wird sofort (optimistisch) im Werte-Speicher übernommen, damit die
+        Oberfläche ihn ohne Verzögerung anzeigt; schlägt das Senden fehl, wird er
+        zurückgenommen. Befehle werden kurz (COMMAND_DEBOUNCE_DELAY) gesammelt:
+        Schnell aufeinanderfolgende Werte für denselben Schlüssel werden zusammengefasst
+        und alle Befehle für dasselbe Gerät in einem einzigen Request gesendet.
 
         Args:
             thing_id: Die eindeutige ID des Zielgeräts.
@@ -285,37 +1329,74 @@ class NeoomLocalCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         Raises:
             Exception: Wenn der der HTTP-Aufruf nicht erfolgreich ist (Statuscode ungleich 2xx) oder ein Timeout auftritt.
         """
-        url = f"http://{self.ip}/api/v1/things/{thing_id}/commands"
-        headers = {
-            "Authorization": f"Bearer {self.key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Die BEAAM API erwartet eine Liste von Befehlen als JSON Array
-        payload = [
-            {
-                "key": key,
-                "value": value
-            }
-        ]
-        
-        LOGGER.debug("Sende Befehl an lokales BEAAM Gerät '%s': '%s' = '%s'", thing_id, key, value)
-        
+        LOGGER.debug("Reihe Befehl für lokales BEAAM Gerät '%s' ein: '%s' = '%s'", thing_id, key, value)
+
+        store = self.state_store
+        slot = self._key_slots.get((thing_id, key))
+        previous: Optional[Tuple[Any, Optional[str], int]] = None
+        if slot is not None:
+            previous = (store.values[slot], store.timestamps[slot], store.qualities[slot])
+            if store.update(slot, value, None):
+                self._async_notify_slots({slot})
+
         try:
-            async with async_timeout.timeout(10):
-                async with self.session.post(url, headers=headers, json=payload) as resp:
-                    resp.raise_for_status()
-                    LOGGER.info("Befehl an BEAAM erfolgreich gesendet: %s -> %s", key, value)
-                    
-                    # Wenn wir einen Wert erfolgreich geschrieben haben, signalisieren wir 
-                    # dem Koordinator, dass er sofort frische Daten vom Gateway holen soll.
-                    # Dadurch kann die Home Assistant Oberfläche den geänderten Wert ohne
-                    # große Verzögerung anziegen.
-                    await self.async_request_refresh()
+            await self._command_batcher.async_send(thing_id, key, value)
+        except Exception:
+            # Rollback, sofern der Wert nicht inzwischen vom Gateway oder einem
+            # neueren Befehl überschrieben wurde.
+            if slot is not None and previous is not None and store.values[slot] == value:
+                store.values[slot], store.timestamps[slot], store.qualities[slot] = previous
+                self._async_notify_slots({slot})
+            raise
+
+    async def _async_post_commands(self, thing_id: str, commands: List[Dict[str, Any]]) -> None:
+        """Sendet eine Liste von Befehlen in einem einzigen Request an ein Gerät.
+
+        Args:
+            thing_id: Die eindeutige ID des Zielgeräts.
+            commands: Die Befehle als Liste von {"key": ..., "value": ...}.
+
+        Raises:
+            Exception: Wenn der HTTP-Aufruf nicht erfolgreich ist oder ein Timeout auftritt.
+        """
+        try:
+            await self.transport.async_send_commands(thing_id, commands)
+            LOGGER.info("Befehle an BEAAM Gerät '%s' erfolgreich gesendet: %s", thing_id, commands)
         except Exception as err:
             LOGGER.error("Schwerwiegender Fehler beim Senden des Befehls an '%s': %s", thing_id, err)
             raise
 
-    async def close(self) -> None:
-        """Schließt die aufrechterhaltene HTTP-Session."""
-        await self.session.close()
+    async def _async_after_commands(self, thing_ids: List[str]) -> None:
+        """Wird einmal nach jedem gesendeten Befehls-Stapel aufgerufen.
+
+        Statt eines vollständigen Refreshs (Site-State und alle Geräte) werden nur die
+        beschriebenen Geräte neu gelesen. Der tatsächliche Wert des Gateways bestätigt
+        den optimistisch gesetzten Wert oder ersetzt ihn (z.B. wenn das Gerät den Wert
+        begrenzt hat). Schlägt das Lesen fehl, korrigiert der nächste reguläre Zyklus.
+        Die Antworten durchlaufen dieselbe Verarbeitung wie im regulären Zyklus
+        (Circuit Breaker, Energiezähler, Totband-Filter).
+
+        Args:
+            thing_ids: Die Geräte, an die erfolgreich Befehle gesendet wurden.
+        """
+        results = await asyncio.gather(
+            *(self._fetch_thing_state(thing_id) for thing_id in thing_ids)
+        )
+
+        now = time.monotonic()
+        changed: Set[int] = set()
+        self._apply_thing_results(dict(zip(thing_ids, results)), now, changed)
+        self.kpis.update(changed, now)
+        self._async_publish_slots(changed)
+
+    async def async_shutdown(self) -> None:
+        """Beendet Abfrage, schnellen Pfad und Push-Kanal, verwirft noch nicht gesendete Befehle und beendet den Koordinator."""
+        if self._poll_unsub is not None:
+            self._poll_unsub()
+            self._poll_unsub = None
+        self._async_stop_flow_timer()
+        if self._push_task is not None:
+            self._push_task.cancel()
+            self._push_task = None
+        self._command_batcher.async_shutdown()
+        await super().async_shutdown()
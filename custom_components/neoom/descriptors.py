@@ -0,0 +1,192 @@
+"""Einmalige Klassifizierung der BEAAM Datenpunkte für alle Plattformen.
+
+Statt dass Sensor-, Number- und Select-Plattform die Gerätestruktur jeweils selbst
+durchlaufen und jede Entität Namen, Einheit und Klassen in ihrem Konstruktor neu
+ableitet, wird die Konfiguration beim Laden genau einmal ausgewertet. Das Ergebnis
+ist eine unveränderliche Tabelle `dp_id -> DataPointDescriptor`, die der Koordinator
+zwischenspeichert und alle Plattformen verwenden.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from homeassistant.components.number import NumberDeviceClass, NumberMode
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import Platform
+
+from .units import DEFAULT_UNIT_MAPPER, UnitMapper
+
+# Diese Schlüssel werden konsequent ignoriert, auch wenn die API sie als "controllable" (steuerbar) markiert.
+# Grund: Oft sind diese Werte kritisch für das Batteriemanagementsystem oder
+# sollten nicht manuell von einem übergeordneten System wie Home Assistant permanent überschrieben werden.
+IGNORE_NUMBER_KEYS: FrozenSet[str] = frozenset({"MIN_SOC", "MAX_POWER_CHARGE_FALLBACK", "TARGET_POWER"})
+
+# Bekannte Optionen für spezifische Schlüssel.
+# Da die API uns leider keine Liste der erlaubten Werte in der Konfiguration
+# mitliefert, müssen wir diese hier ("hardcoded") definieren.
+# Neue umschaltbare Parameter müssen hier ergänzt werden.
+KNOWN_SELECT_OPTIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "PHASE_SWITCHING_MODE": ("AUTO", "FORCE_1_PHASE", "FORCE_3_PHASE"),
+})
+
+# Suffix der unique_id je Plattform. Sensoren verwenden (historisch) keinen Suffix.
+UNIQUE_ID_SUFFIXES: Mapping[Platform, str] = MappingProxyType({
+    Platform.SENSOR: "",
+    Platform.NUMBER: "_number",
+    Platform.SELECT: "_select",
+})
+
+
+class DataPointDescriptor(NamedTuple):
+    """Unveränderliche Beschreibung eines Datenpunkts und seiner Entitäten."""
+
+    dp_id: str
+    thing_id: str
+    thing_type: str
+    key: str
+    # Anzeigename, z.B. "Batt Inverter State Of Charge"
+    name: str
+    data_type: str
+    controllable: bool
+    # Einheit, wie sie das Gateway liefert (z.B. "kWh")
+    unit_raw: str
+    # Plattformen, die für diesen Datenpunkt eine Entität anlegen
+    platforms: FrozenSet[Platform]
+
+    # Sensor
+    native_unit: Optional[str]
+    device_class: Optional[SensorDeviceClass]
+    state_class: Optional[SensorStateClass]
+
+    # Number
+    number_unit: Optional[str]
+    number_device_class: Optional[NumberDeviceClass]
+    min_value: Optional[float]
+    max_value: Optional[float]
+    step: Optional[float]
+    number_mode: Optional[NumberMode]
+
+    # Select
+    options: Tuple[str, ...]
+
+    def unique_id(self, platform: Platform) -> str:
+        """Gibt die unique_id der Entität dieses Datenpunkts auf einer Plattform zurück."""
+        return f"{self.thing_id}_{self.dp_id}{UNIQUE_ID_SUFFIXES[platform]}"
+
+
+class DescriptorTable:
+    """Unveränderliche Tabelle aller Datenpunkt-Beschreibungen einer Konfiguration."""
+
+    __slots__ = ("_by_dp_id", "_by_platform")
+
+    def __init__(self, descriptors: List[DataPointDescriptor]) -> None:
+        """Initialisiert die Tabelle und gruppiert die Beschreibungen je Plattform."""
+        self._by_dp_id: Mapping[str, DataPointDescriptor] = MappingProxyType(
+            {descriptor.dp_id: descriptor for descriptor in descriptors}
+        )
+        by_platform: Dict[Platform, List[DataPointDescriptor]] = {}
+        for descriptor in descriptors:
+            for platform in descriptor.platforms:
+                by_platform.setdefault(platform, []).append(descriptor)
+        self._by_platform: Mapping[Platform, Tuple[DataPointDescriptor, ...]] = MappingProxyType(
+            {platform: tuple(items) for platform, items in by_platform.items()}
+        )
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der beschriebenen Datenpunkte zurück."""
+        return len(self._by_dp_id)
+
+    def __iter__(self) -> Iterator[DataPointDescriptor]:
+        """Iteriert über alle Beschreibungen."""
+        return iter(self._by_dp_id.values())
+
+    def get(self, dp_id: str) -> Optional[DataPointDescriptor]:
+        """Gibt die Beschreibung eines Datenpunkts zurück (oder None)."""
+        return self._by_dp_id.get(dp_id)
+
+    def for_platform(self, platform: Platform) -> Tuple[DataPointDescriptor, ...]:
+        """Gibt die Beschreibungen aller Datenpunkte zurück, die auf der Plattform eine Entität haben."""
+        return self._by_platform.get(platform, ())
+
+
+# Leere Tabelle, solange keine Konfiguration geladen ist.
+EMPTY_TABLE = DescriptorTable([])
+
+
+def _describe(
+    thing_id: str, thing_type: str, dp_id: str, dp_data: Mapping[str, Any], unit_mapper: UnitMapper
+) -> Optional[DataPointDescriptor]:
+    """Klassifiziert einen einzelnen Datenpunkt (None, wenn keine Plattform ihn abbildet)."""
+    data_type: str = dp_data.get("dataType", "")
+    controllable: bool = dp_data.get("controllable", False)
+    key: str = dp_data.get("key", "")
+    unit_raw: str = dp_data.get("unitOfMeasure", "")
+
+    platforms = set()
+    # Wir erstellen Sensoren für Zahlen (Leistung, Prozente) und Strings (Betriebsmodi)
+    if data_type in ("NUMBER", "STRING"):
+        platforms.add(Platform.SENSOR)
+    # Steuerbare ("controllable": true) Zahlen werden zu Number-Entitäten, sofern nicht ignoriert
+    if data_type == "NUMBER" and controllable and key not in IGNORE_NUMBER_KEYS:
+        platforms.add(Platform.NUMBER)
+    # Steuerbare Texte werden nur zu Select-Entitäten, wenn wir ihre Optionen kennen
+    if data_type == "STRING" and controllable and key in KNOWN_SELECT_OPTIONS:
+        platforms.add(Platform.SELECT)
+    if not platforms:
+        return None
+
+    # Mache den Namen benutzerfreundlich (z.B. BATT_INVERTER -> Batt Inverter)
+    name = f"{thing_type.replace('_', ' ').title()} {key.replace('_', ' ').title()}"
+
+    # Einheit und Klassen aus der (zwischengespeicherten) Einheiten-Tabelle
+    units = unit_mapper.resolve(unit_raw, key)
+    number_range = unit_mapper.number_range(unit_raw) if Platform.NUMBER in platforms else None
+
+    return DataPointDescriptor(
+        dp_id=dp_id,
+        thing_id=thing_id,
+        thing_type=thing_type,
+        key=key,
+        name=name,
+        data_type=data_type,
+        controllable=controllable,
+        unit_raw=unit_raw,
+        platforms=frozenset(platforms),
+        native_unit=units.unit,
+        device_class=units.device_class,
+        state_class=units.state_class,
+        number_unit=units.unit if number_range else None,
+        number_device_class=units.number_device_class if number_range else None,
+        min_value=number_range.min_value if number_range else None,
+        max_value=number_range.max_value if number_range else None,
+        step=number_range.step if number_range else None,
+        number_mode=number_range.mode if number_range else None,
+        options=KNOWN_SELECT_OPTIONS.get(key, ()),
+    )
+
+
+def build_descriptor_table(
+    beaam_config: Optional[Mapping[str, Any]], unit_mapper: UnitMapper = DEFAULT_UNIT_MAPPER
+) -> DescriptorTable:
+    """Klassifiziert alle Datenpunkte einer BEAAM Konfiguration in einem Durchlauf.
+
+    Args:
+        beaam_config: Die Gerätestruktur des Gateways (oder None).
+        unit_mapper: Ordnet die Einheiten den Home Assistant Einheiten und Klassen zu.
+
+    Returns:
+        Die unveränderliche Tabelle aller Datenpunkte, die mindestens eine Plattform abbildet.
+    """
+    descriptors: List[DataPointDescriptor] = []
+    things: Mapping[str, Any] = (beaam_config or {}).get("things", {})
+    for thing_id, thing_data in things.items():
+        if not thing_data:
+            continue
+        thing_type: str = thing_data.get("type", "Unknown")
+        for dp_id, dp_data in thing_data.get("dataPoints", {}).items():
+            if not dp_data:
+                continue
+            descriptor = _describe(thing_id, thing_type, dp_id, dp_data, unit_mapper)
+            if descriptor is not None:
+                descriptors.append(descriptor)
+    return DescriptorTable(descriptors)
@@ -0,0 +1,161 @@
+"""Geräte-Beschreibungen (DeviceInfo) der neoom AI Integration.
+
+Jedes Gerät (Cloud Site, BEAAM Gateway und jedes am Gateway angebundene "Thing")
+wird genau einmal beschrieben. Alle Entitäten eines Geräts verweisen auf dasselbe
+DeviceInfo-Objekt, statt bei jedem Zugriff ein neues zu erzeugen. Beim Einrichten
+werden alle Geräte in einem Durchgang im Device Registry angelegt, bevor die
+Plattformen ihre Entitäten registrieren.
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.util import slugify
+
+from .const import DOMAIN, STORAGE_KEY_BEAAM_CONFIG
+
+# Kennung des (ersten) BEAAM Gateways eines Eintrags im Device Registry. Die Geräte
+# am Gateway verweisen über 'via_device' darauf. Weitere Gateways desselben Eintrags
+# erhalten eine Kennung mit ihrer IP-Adresse (siehe gateway_id).
+PRIMARY_GATEWAY_ID: str = "BEAAM Gateway"
+
+
+def gateway_id(index: int, ip: str) -> str:
+    """Gibt die Kennung eines Gateways im Device Registry zurück.
+
+    Das erste Gateway behält die Kennung aus der Zeit, als ein Eintrag nur ein
+    Gateway kannte, damit bestehende Geräte und Entitäten erhalten bleiben.
+
+    Args:
+        index: Die Position des Gateways in der Konfiguration des Eintrags.
+        ip: Die IP-Adresse des Gateways.
+    """
+    return PRIMARY_GATEWAY_ID if index == 0 else f"{PRIMARY_GATEWAY_ID} {ip}"
+
+
+def beaam_config_storage_key(entry_id: str, gateway: str, ip: str) -> str:
+    """Gibt den Schlüssel des Konfigurations-Caches eines Gateways zurück.
+
+    Args:
+        entry_id: Die ID des Konfigurationseintrags.
+        gateway: Die Kennung des Gateways (siehe gateway_id).
+        ip: Die IP-Adresse des Gateways.
+    """
+    if gateway == PRIMARY_GATEWAY_ID:
+        return STORAGE_KEY_BEAAM_CONFIG.format(entry_id=entry_id)
+    return STORAGE_KEY_BEAAM_CONFIG.format(entry_id=f"{entry_id}_{slugify(ip)}")
+
+
+def gateway_device_info(ip: str, gateway: str = PRIMARY_GATEWAY_ID) -> DeviceInfo:
+    """Beschreibt ein BEAAM Gateway.
+
+    Args:
+        ip: Die IP-Adresse des Gateways (für den Link zur Weboberfläche).
+        gateway: Die Kennung des Gateways (siehe gateway_id).
+    """
+    return DeviceInfo(
+        identifiers={(DOMAIN, gateway)},
+        manufacturer="neoom",
+        name=gateway,
+        model="BEAAM Edge Controller",
+        configuration_url=f"http://{ip}",
+    )
+
+
+def site_device_info(site_id: str) -> DeviceInfo:
+    """Beschreibt das virtuelle Cloud-Gerät, unter dem die Cloud-Sensoren gruppiert werden.
+
+    Args:
+        site_id: Die ID des Standorts (Site).
+    """
+    return DeviceInfo(
+        identifiers={(DOMAIN, site_id)},
+        name="neoom AI Cloud Site",
+        manufacturer="neoom",
+        model="Cloud API",
+    )
+
+
+def build_thing_device_infos(
+    beaam_config: Optional[Mapping[str, Any]], gateway: str = PRIMARY_GATEWAY_ID
+) -> Dict[str, DeviceInfo]:
+    """Beschreibt alle Geräte ("Things") einer BEAAM Konfiguration.
+
+    'via_device' zeigt an, dass die Kommunikation über das BEAAM Gateway läuft.
+
+    Args:
+        beaam_config: Die Gerätestruktur des Gateways (oder None).
+        gateway: Die Kennung des Gateways, an dem die Geräte hängen.
+
+    Returns:
+        Die Beschreibung je Thing-ID.
+    """
+    device_infos: Dict[str, DeviceInfo] = {}
+    for thing_id, thing_data in (beaam_config or {}).get("things", {}).items():
+        if not thing_data:
+            continue
+        thing_type: str = thing_data.get("type", "Unknown")
+        device_infos[thing_id] = DeviceInfo(
+            identifiers={(DOMAIN, thing_id)},
+            name=f"neoom {thing_type}",
+            manufacturer="neoom",
+            model=thing_type,
+            via_device=(DOMAIN, gateway),
+        )
+    return device_infos
+
+
+@callback
+def async_register_devices(
+    hass: HomeAssistant, entry: ConfigEntry, device_infos: Iterable[DeviceInfo]
+) -> None:
+    """Legt die Geräte in einem Durchgang im Device Registry an bzw. aktualisiert sie.
+
+    Die Gateways müssen vor den Geräten stehen, die über 'via_device' darauf verweisen,
+    sonst warnt Home Assistant vor einem ungültigen via_device.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag, dem die Geräte zugeordnet werden.
+        device_infos: Die Beschreibungen der Geräte.
+    """
+    device_registry = dr.async_get(hass)
+    for device_info in device_infos:
+        device_registry.async_get_or_create(config_entry_id=entry.entry_id, **device_info)
+
+
+@callback
+def async_remove_gateway_devices(hass: HomeAssistant, entry: ConfigEntry, gateway: str) -> None:
+    """Entfernt ein Gateway und alle Geräte, die über 'via_device' daran hängen.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag, dem die Geräte zugeordnet sind.
+        gateway: Die Kennung des Gateways (siehe gateway_id).
+    """
+    device_registry = dr.async_get(hass)
+    gateway_device = device_registry.async_get_device(identifiers={(DOMAIN, gateway)})
+    if gateway_device is None:
+        return
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if device.via_device_id == gateway_device.id:
+            device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+    device_registry.async_update_device(gateway_device.id, remove_config_entry_id=entry.entry_id)
+
+
+@callback
+def async_remove_site_device(hass: HomeAssistant, entry: ConfigEntry, site_id: str) -> None:
+    """Entfernt das Cloud-Gerät einer Site.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag, dem das Gerät zugeordnet ist.
+        site_id: Die ID des Standorts (Site).
+    """
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, site_id)})
+    if device is not None:
+        device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
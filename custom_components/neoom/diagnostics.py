@@ -0,0 +1,66 @@
+"""Diagnose-Download für die neoom AI Integration.
+
+Home Assistant bietet für jeden Konfigurationseintrag unter "Diagnosedaten herunterladen"
+eine JSON-Datei an. Sie enthält hier die Kennzahlen der Kommunikation mit Cloud und
+Gateway (Antwortzeiten je Endpunkt und Gerät, Fehler, Timeouts, Zyklusdauer) sowie den
+Zustand von Abfrage-Plan, Circuit Breaker und Push-Kanal. Zugangsdaten werden entfernt.
+"""
+
+from typing import Any, Dict, List
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_BEAAM_IP, CONF_BEAAM_KEY, CONF_CLOUD_TOKEN, CONF_SITE_ID, DOMAIN
+from .coordinator import NeoomCloudCoordinator, NeoomLocalCoordinator
+from .state_store import QUALITY_UNAVAILABLE
+
+# Diese Felder werden im Download durch "**REDACTED**" ersetzt.
+TO_REDACT = {CONF_CLOUD_TOKEN, CONF_BEAAM_KEY, CONF_SITE_ID, CONF_BEAAM_IP}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Stellt die Diagnosedaten eines Konfigurationseintrags zusammen.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag.
+
+    Returns:
+        Die Diagnosedaten als Dictionary.
+    """
+    data: Dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
+    clouds: List[NeoomCloudCoordinator] = data["clouds"]
+    locals_: List[NeoomLocalCoordinator] = data["locals"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "clouds": [
+            {
+                "last_update_success": cloud.last_update_success,
+                "metrics": cloud.metrics.as_dict(),
+            }
+            for cloud in clouds
+        ],
+        "locals": [
+            {
+                "last_update_success": local.last_update_success,
+                "transport": type(local.transport).__name__,
+                "push_connected": local.push_connected,
+                "things": len((local.beaam_config or {}).get("things", {})),
+                "datapoints": len(local.state_store),
+                "stale_datapoints": local.state_store.qualities.count(QUALITY_UNAVAILABLE),
+                "poll_intervals": local.poll_intervals,
+                "adaptive_polling": local.adaptive.as_dict(),
+                "open_circuits": local.thing_health.open_things(),
+                "metrics": local.metrics.as_dict(),
+            }
+            for local in locals_
+        ],
+    }
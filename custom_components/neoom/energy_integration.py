@@ -0,0 +1,174 @@
+"""Integration von Leistungs-Datenpunkten zu Energiezählern.
+
+Manche Geräte am BEAAM liefern nur die momentane Leistung, aber keinen Energiezähler.
+Statt sie mit dem Helfer "Integral" von Home Assistant aus dem (gefilterten, groben)
+Zustand der Entität zu integrieren, integriert der Koordinator die Leistung bei jedem
+Abruf des Geräts, also im nativen Abfragetakt, nach der Trapezregel.
+
+Die Zähler liegen als zusätzliche Slots im Werte-Speicher (siehe state_store.py) und
+werden in kWh geführt und steigen monoton (TOTAL_INCREASING); der Zählerstand wird von
+der Entität über Neustarts hinweg wiederhergestellt.
+
+Integriert werden nur Leistungen, die in eine Richtung fließen (z.B. PV-Erzeugung oder
+Verbrauch einer Wärmepumpe). Speicher- und Netzleistungen wählt der Koordinator gar
+nicht erst aus. Negative Werte eines ausgewählten Datenpunkts (z.B. Eigenverbrauch
+eines Wechselrichters in der Nacht oder ein einzelner Ausreißer) zählen als 0 kW.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Set
+
+from .const import MAX_INTEGRATION_GAP
+from .state_store import QUALITY_GOOD, DataPointStore
+
+if TYPE_CHECKING:
+    # Nur für die Typprüfung: descriptors.py importiert Home Assistant.
+    from .descriptors import DataPointDescriptor
+
+# Umrechnung der Leistungseinheit des Gateways in kWh je Stunde.
+POWER_UNIT_TO_KW: Mapping[str, float] = {
+    "W": 0.001,
+    "kW": 1.0,
+    "MW": 1000.0,
+    "GW": 1000000.0,
+}
+
+
+class IntegratedPower:
+    """Zustand der Integration eines Leistungs-Datenpunkts."""
+
+    __slots__ = ("descriptor", "power_slot", "energy_slot", "scale", "total", "last_power", "last_time")
+
+    def __init__(
+        self, descriptor: "DataPointDescriptor", power_slot: int, energy_slot: int, scale: float
+    ) -> None:
+        """Initialisiert die Integration mit Zählerstand 0."""
+        self.descriptor = descriptor
+        self.power_slot = power_slot
+        self.energy_slot = energy_slot
+        # Faktor Leistungseinheit -> kW
+        self.scale = scale
+        # Zählerstand in kWh
+        self.total: float = 0.0
+        # Letzter Abtastwert (Leistung in kW, Zeitpunkt time.monotonic()); None = kein gültiger Wert.
+        self.last_power: Optional[float] = None
+        self.last_time: float = 0.0
+
+
+class PowerIntegrator:
+    """Integriert ausgewählte Leistungs-Datenpunkte eines Gateways zu Energiezählern in kWh."""
+
+    def __init__(self, store: DataPointStore) -> None:
+        """Initialisiert den Integrator ohne Datenpunkte.
+
+        Args:
+            store: Der Werte-Speicher des Gateways; die Zählerstände werden dort abgelegt.
+        """
+        self._store = store
+        # Integration je Datenpunkt-ID und je Slot der Leistung (für die Abtastung).
+        self.targets: Dict[str, IntegratedPower] = {}
+        self._by_power_slot: Dict[int, IntegratedPower] = {}
+
+    def configure(self, descriptors: Iterable["DataPointDescriptor"]) -> None:
+        """Legt fest, welche Leistungs-Datenpunkte integriert werden.
+
+        Bestehende Zählerstände bleiben für weiterhin vorhandene Datenpunkte erhalten.
+
+        Args:
+            descriptors: Die zu integrierenden Datenpunkte. Datenpunkte mit unbekannter
+                Leistungseinheit werden übersprungen.
+        """
+        store = self._store
+        targets: Dict[str, IntegratedPower] = {}
+        for descriptor in descriptors:
+            scale = POWER_UNIT_TO_KW.get(descriptor.unit_raw)
+            if scale is None:
+                continue
+            target = self.targets.get(descriptor.dp_id)
+            if target is None:
+                target = IntegratedPower(
+                    descriptor,
+                    store.resolve(descriptor.dp_id),
+                    store.resolve(f"energy:{descriptor.dp_id}"),
+                    scale,
+                )
+            else:
+                target.descriptor = descriptor
+                target.scale = scale
+            targets[descriptor.dp_id] = target
+        self.targets = targets
+        self._by_power_slot = {target.power_slot: target for target in targets.values()}
+
+    def sample(self, slots: Iterable[Optional[int]], now: float, changed: Set[int]) -> None:
+        """Tastet die Leistung der gerade vom Gateway gelesenen Datenpunkte ab.
+
+        Wird bei jedem Abruf aufgerufen, auch wenn sich der Wert nicht geändert hat, da
+        jeder Abruf ein Stützpunkt der Trapezregel ist.
+
+        Args:
+            slots: Die Slots der gelesenen Datenpunkte (None wird ignoriert).
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+            changed: Menge, in die die Slots geänderter Zählerstände eingetragen werden.
+        """
+        if not self._by_power_slot:
+            return
+        store = self._store
+        for slot in slots:
+            target = self._by_power_slot.get(slot) if slot is not None else None
+            if target is None:
+                continue
+
+            value = store.values[slot]
+            power: Optional[float] = None
+            if (
+                store.qualities[slot] == QUALITY_GOOD
+                and isinstance(value, (int, float))
+                and not isinstance(value, bool)
+            ):
+                # Der Zähler steigt nur: negative Werte zählen als 0 kW.
+                power = max(float(value) * target.scale, 0.0)
+
+            previous = target.last_power
+            elapsed = now - target.last_time
+            target.last_power = power
+            target.last_time = now
+            # Nach einer Lücke (Gerät nicht erreichbar, pausiert) beginnt die Integration neu,
+            # statt die Lücke mit einer Geraden zu überbrücken.
+            if power is None or previous is None or elapsed <= 0 or elapsed > MAX_INTEGRATION_GAP:
+                continue
+
+            target.total += (previous + power) / 2 * elapsed / 3600
+            if store.update(target.energy_slot, round(target.total, 3), None):
+                changed.add(target.energy_slot)
+
+    def interrupt(self, slots: Iterable[int]) -> None:
+        """Unterbricht die Integration der Datenpunkte eines Geräts, das nicht geantwortet hat.
+
+        Der letzte Wert bleibt im Speicher, bis er veraltet; als Stützpunkt taugt er nicht.
+        Die Integration beginnt mit dem nächsten gelesenen Wert neu.
+
+        Args:
+            slots: Die Slots der Datenpunkte des Geräts.
+        """
+        for slot in slots:
+            target = self._by_power_slot.get(slot)
+            if target is not None:
+                target.last_power = None
+
+    def restore(self, dp_id: str, total: float) -> None:
+        """Übernimmt den Zählerstand eines Datenpunkts nach einem Neustart.
+
+        Seit dem Start bereits integrierte Energie bleibt erhalten.
+
+        Args:
+            dp_id: Die ID des Leistungs-Datenpunkts.
+            total: Der Zählerstand (kWh) vor dem Neustart.
+        """
+        target = self.targets.get(dp_id)
+        if target is None:
+            return
+        target.total += total
+        self._store.update(target.energy_slot, round(target.total, 3), None)
+
+    def descriptors(self) -> List["DataPointDescriptor"]:
+        """Gibt die Beschreibungen der integrierten Leistungs-Datenpunkte zurück."""
+        return [target.descriptor for target in self.targets.values()]
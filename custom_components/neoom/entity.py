@@ -0,0 +1,138 @@
+"""Gemeinsame Basisklasse und Einrichtung für die lokalen BEAAM Entitäten.
+
+Sensor-, Number- und Select-Entitäten eines Datenpunkts teilen sich die Logik
+für Namen, Geräte-Zuordnung und den Zugriff auf den aktuellen Wert, sowie den
+Abgleich der Entitäten mit einer geänderten Gerätestruktur. Alle Eigenschaften
+einer Entität stammen aus der Datenpunkt-Beschreibung (siehe descriptors.py).
+"""
+
+from typing import Any, Callable, Dict, List
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import LOGGER
+from .coordinator import NeoomLocalCoordinator
+from .descriptors import DataPointDescriptor
+from .state_store import QUALITY_UNAVAILABLE
+
+
+@callback
+def async_setup_local_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: NeoomLocalCoordinator,
+    async_add_entities: Callable[[List[Any]], None],
+    platform: Platform,
+    entity_factory: Callable[[DataPointDescriptor], "NeoomLocalEntity"],
+) -> None:
+    """Legt die lokalen Entitäten einer Plattform an und hält sie mit der Gerätestruktur synchron.
+
+    Die Entitäten werden aus der Beschreibungstabelle des Koordinators erzeugt.
+    Ändert sich die Konfiguration später, werden nur für neue unique_ids Entitäten
+    erzeugt und hinzugefügt und die weggefallenen entfernt; bestehende Entitäten
+    (und ihre Statistiken) bleiben unangetastet und werden nicht neu erzeugt.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+        entry: Der Konfigurationseintrag.
+        coordinator: Der lokale Koordinator.
+        async_add_entities: Die Methode zum Registrieren der neuen Entitäten.
+        platform: Die Plattform, deren Datenpunkte abgebildet werden.
+        entity_factory: Erzeugt die Entität zu einer Datenpunkt-Beschreibung.
+    """
+    known: Dict[str, NeoomLocalEntity] = {}
+
+    @callback
+    def _async_reconcile() -> None:
+        wanted: Dict[str, DataPointDescriptor] = {
+            descriptor.unique_id(platform): descriptor
+            for descriptor in coordinator.descriptors.for_platform(platform)
+        }
+
+        new_entities = [
+            entity_factory(descriptor)
+            for unique_id, descriptor in wanted.items()
+            if unique_id not in known
+        ]
+        removed_ids = [unique_id for unique_id in known if unique_id not in wanted]
+
+        entity_registry = er.async_get(hass)
+        for unique_id in removed_ids:
+            entity = known.pop(unique_id)
+            if entity.registry_entry is not None:
+                # Das Entfernen aus der Registry entfernt auch die Entität selbst.
+                entity_registry.async_remove(entity.registry_entry.entity_id)
+            else:
+                hass.async_create_task(entity.async_remove(force_remove=True))
+
+        for entity in new_entities:
+            known[entity.descriptor.unique_id(platform)] = entity
+
+        if new_entities:
+            async_add_entities(new_entities)
+
+        if known and (new_entities or removed_ids):
+            LOGGER.debug(
+                "BEAAM Entitäten abgeglichen: %d hinzugefügt, %d entfernt.",
+                len(new_entities),
+                len(removed_ids),
+            )
+
+    _async_reconcile()
+    entry.async_on_unload(coordinator.async_add_config_listener(_async_reconcile))
+
+
+class NeoomLocalEntity(CoordinatorEntity):
+    """Basisklasse für alle Entitäten, die einen Datenpunkt des BEAAM Gateways abbilden.
+
+    Die Entität löst ihre Datenpunkt-ID einmalig in einen Slot des Werte-Speichers auf
+    und meldet sich mit diesem Slot als Kontext beim Koordinator an. Dadurch
+    benachrichtigt der Koordinator sie nur, wenn sich genau dieser Datenpunkt
+    geändert hat, statt bei jedem Abfragezyklus.
+    """
+
+    # Plattform der Entität; bestimmt den Suffix der unique_id.
+    _platform: Platform
+
+    def __init__(
+        self,
+        coordinator: NeoomLocalCoordinator,
+        descriptor: DataPointDescriptor,
+    ) -> None:
+        """Initialisiert die gemeinsamen Attribute einer lokalen Entität.
+
+        Args:
+            coordinator: Der lokale Koordinator.
+            descriptor: Die Beschreibung des Datenpunkts (aus der Tabelle des Koordinators).
+        """
+        self._slot: int = coordinator.state_store.resolve(descriptor.dp_id)
+        super().__init__(coordinator, context=self._slot)
+
+        self.descriptor = descriptor
+        self._thing_id = descriptor.thing_id
+        self._thing_type = descriptor.thing_type
+        self._dp_id = descriptor.dp_id
+        self._key = descriptor.key
+
+        self._attr_name = descriptor.name
+        self._attr_unique_id = descriptor.unique_id(self._platform)
+        # Verknüpft die Entität mit dem physischen Gerät (z.B. Wechselrichter). Die
+        # Beschreibung wird vom Koordinator einmal je Thing erzeugt und geteilt.
+        self._attr_device_info = coordinator.thing_device_infos[descriptor.thing_id]
+
+    @property
+    def available(self) -> bool:
+        """Nicht verfügbar, wenn das Gateway oder das zugehörige Gerät nicht antwortet."""
+        return (
+            super().available
+            and self.coordinator.state_store.qualities[self._slot] != QUALITY_UNAVAILABLE
+        )
+
+    @property
+    def _value(self) -> Any:
+        """Gibt den aktuellen Rohwert des Datenpunkts zurück (oder None)."""
+        return self.coordinator.state_store.values[self._slot]
@@ -0,0 +1,97 @@
+"""Verfügbarkeits-Überwachung ("Circuit Breaker") für einzelne BEAAM Geräte.
+
+Hängt ein Gerät am RS485-Bus, kostet jede Abfrage den vollen Timeout. Der Tracker
+merkt sich aufeinanderfolgende Fehler je Thing und pausiert dessen Abfrage mit
+exponentiell wachsender Wartezeit. Nach Ablauf der Wartezeit wird das Gerät mit
+genau einer Abfrage "probeweise" (half-open) wieder angesprochen: Antwortet es,
+ist es wieder gesund; sonst verdoppelt sich die Wartezeit.
+"""
+
+from typing import Dict, List
+
+from .const import CIRCUIT_BACKOFF_BASE, CIRCUIT_BACKOFF_MAX, CIRCUIT_FAILURE_THRESHOLD, LOGGER
+
+
+class ThingHealth:
+    """Gesundheitszustand eines einzelnen Things."""
+
+    __slots__ = ("failures", "open_until")
+
+    def __init__(self) -> None:
+        """Initialisiert einen gesunden Zustand."""
+        # Anzahl der aufeinanderfolgenden fehlgeschlagenen Abfragen.
+        self.failures: int = 0
+        # Zeitpunkt (time.monotonic()), bis zu dem das Thing nicht abgefragt wird. 0 = geschlossen.
+        self.open_until: float = 0.0
+
+
+class ThingHealthTracker:
+    """Verwaltet den Circuit Breaker aller Things eines Gateways."""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        backoff_base: float = CIRCUIT_BACKOFF_BASE,
+        backoff_max: float = CIRCUIT_BACKOFF_MAX,
+    ) -> None:
+        """Initialisiert den Tracker.
+
+        Args:
+            failure_threshold: Anzahl aufeinanderfolgender Fehler, ab der ein Thing pausiert wird.
+            backoff_base: Wartezeit (Sekunden) nach dem Erreichen der Schwelle.
+            backoff_max: Obergrenze der Wartezeit (Sekunden).
+        """
+        self._failure_threshold = failure_threshold
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._things: Dict[str, ThingHealth] = {}
+
+    def allow(self, thing_id: str, now: float) -> bool:
+        """Prüft, ob ein Thing in diesem Zyklus abgefragt werden darf.
+
+        Nach Ablauf der Wartezeit ist genau eine Probe-Abfrage erlaubt; deren
+        Ergebnis (record_success/record_failure) entscheidet über den weiteren Zustand.
+
+        Args:
+            thing_id: Die ID des Things.
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        health = self._things.get(thing_id)
+        return health is None or health.open_until <= now
+
+    def record_success(self, thing_id: str) -> None:
+        """Vermerkt eine erfolgreiche Abfrage und schließt den Circuit Breaker."""
+        health = self._things.pop(thing_id, None)
+        if health is not None and health.open_until:
+            LOGGER.info("BEAAM Thing '%s' antwortet wieder.", thing_id)
+
+    def record_failure(self, thing_id: str, now: float) -> None:
+        """Vermerkt eine fehlgeschlagene Abfrage und pausiert das Thing ggf. mit Backoff.
+
+        Args:
+            thing_id: Die ID des Things.
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        health = self._things.setdefault(thing_id, ThingHealth())
+        health.failures += 1
+        if health.failures < self._failure_threshold:
+            return
+
+        backoff = min(
+            self._backoff_base * 2 ** (health.failures - self._failure_threshold),
+            self._backoff_max,
+        )
+        if not health.open_until:
+            LOGGER.warning(
+                "BEAAM Thing '%s' antwortet nicht (%d Fehler in Folge), pausiere Abfrage für %d s.",
+                thing_id,
+                health.failures,
+                backoff,
+            )
+        else:
+            LOGGER.debug("BEAAM Thing '%s' weiterhin nicht erreichbar, nächste Probe in %d s.", thing_id, backoff)
+        health.open_until = now + backoff
+
+    def open_things(self) -> List[str]:
+        """Gibt die IDs aller Things zurück, die aktuell pausiert sind."""
+        return [thing_id for thing_id, health in self._things.items() if health.open_until]
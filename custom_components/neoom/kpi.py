@@ -0,0 +1,197 @@
+"""Abgeleitete Kennzahlen aus dem Energiefluss der Site.
+
+Eigenverbrauchsquote, Autarkiegrad, Netzsaldo und Wirkungsgrad des Speichers werden
+direkt im Koordinator berechnet, statt über Template-Sensoren, die bei jeder
+Zustandsänderung der zugrunde liegenden Entitäten neu gerendert werden.
+
+Die Kennzahlen liegen als zusätzliche Slots im Werte-Speicher (siehe state_store.py).
+Ihre Entitäten melden sich damit wie alle anderen mit ihrem Slot beim Koordinator an
+und durchlaufen denselben Totband-Filter. Neu berechnet wird nur, wenn sich einer der
+Eingangswerte im Zyklus geändert hat.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from .const import (
+    FLOW_KEY_CONSUMPTION,
+    FLOW_KEY_GRID,
+    FLOW_KEY_PRODUCTION,
+    FLOW_KEY_STORAGE,
+    MAX_INTEGRATION_GAP,
+)
+from .state_store import QUALITY_GOOD, DataPointStore
+
+# Schlüssel der Kennzahlen.
+KPI_SELF_CONSUMPTION: str = "self_consumption"
+KPI_AUTARKY: str = "autarky"
+KPI_NET_GRID_POWER: str = "net_grid_power"
+KPI_BATTERY_EFFICIENCY: str = "battery_round_trip_efficiency"
+
+# Benötigte Datenpunkte des Energieflusses je Kennzahl.
+KPI_INPUTS: Mapping[str, Tuple[str, ...]] = {
+    KPI_SELF_CONSUMPTION: (FLOW_KEY_PRODUCTION, FLOW_KEY_GRID),
+    KPI_AUTARKY: (FLOW_KEY_CONSUMPTION, FLOW_KEY_GRID),
+    KPI_NET_GRID_POWER: (FLOW_KEY_GRID,),
+    KPI_BATTERY_EFFICIENCY: (FLOW_KEY_STORAGE,),
+}
+
+
+def _number(store: DataPointStore, slot: Optional[int]) -> Optional[float]:
+    """Gibt den Wert eines Slots als Zahl zurück (None, wenn ungültig oder fehlend)."""
+    if slot is None or store.qualities[slot] != QUALITY_GOOD:
+        return None
+    value = store.values[slot]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _percent(part: float, total: float) -> float:
+    """Gibt einen auf 0..100 begrenzten, gerundeten Anteil in Prozent zurück."""
+    return round(min(max(part / total * 100, 0.0), 100.0), 1)
+
+
+class EnergyKpiCalculator:
+    """Berechnet die Kennzahlen eines Gateways inkrementell aus dem Energiefluss."""
+
+    def __init__(self, store: DataPointStore) -> None:
+        """Initialisiert den Rechner und vergibt die Slots der Kennzahlen.
+
+        Args:
+            store: Der Werte-Speicher des Gateways; die Kennzahlen werden dort abgelegt.
+        """
+        self._store = store
+        # Slot je Kennzahl; die IDs können nicht mit Datenpunkt-IDs des Gateways kollidieren.
+        self.slots: Dict[str, int] = {key: store.resolve(f"kpi:{key}") for key in KPI_INPUTS}
+        # Slot je Schlüssel des Energieflusses (aus der Konfiguration) und die Menge aller
+        # Eingangs-Slots, um Zyklen ohne relevante Änderung schnell zu überspringen.
+        self._flow_slots: Dict[str, int] = {}
+        self._flow_units: Dict[str, str] = {}
+        self._input_slots: Set[int] = set()
+        # Geladene und entladene Energie des Speichers (in Einheit der Leistung × Stunden)
+        # sowie der letzte Wert der Speicherleistung mit Zeitpunkt (time.monotonic()).
+        self.charged: float = 0.0
+        self.discharged: float = 0.0
+        self._storage_sample: Optional[Tuple[float, float]] = None
+
+    def configure(self, beaam_config: Optional[Mapping[str, Any]]) -> None:
+        """Ordnet die Datenpunkte des Energieflusses ihren Slots zu.
+
+        Args:
+            beaam_config: Die Gerätestruktur des Gateways (oder None).
+        """
+        datapoints: Mapping[str, Any] = (
+            ((beaam_config or {}).get("energyFlow") or {}).get("dataPoints") or {}
+        )
+        self._flow_slots = {
+            dp_data["key"]: self._store.resolve(dp_id)
+            for dp_id, dp_data in datapoints.items()
+            if dp_data and dp_data.get("key")
+        }
+        self._flow_units = {
+            dp_data["key"]: dp_data.get("unitOfMeasure", "")
+            for dp_data in datapoints.values()
+            if dp_data and dp_data.get("key")
+        }
+        self._input_slots = set(self._flow_slots.values())
+
+    def flow_unit(self, key: str) -> str:
+        """Gibt die Einheit eines Datenpunkts des Energieflusses laut Gateway zurück ("" = unbekannt)."""
+        return self._flow_units.get(key, "")
+
+    def available(self) -> List[str]:
+        """Gibt die Kennzahlen zurück, deren Eingangswerte das Gateway liefert."""
+        return [
+            key for key, inputs in KPI_INPUTS.items() if all(name in self._flow_slots for name in inputs)
+        ]
+
+    def restore(self, charged: float, discharged: float) -> None:
+        """Übernimmt die Lade- und Entlademenge des Speichers nach einem Neustart.
+
+        Seit dem Start bereits aufsummierte Mengen bleiben erhalten.
+
+        Args:
+            charged: Vor dem Neustart geladene Energie.
+            discharged: Vor dem Neustart entladene Energie.
+        """
+        self.charged += charged
+        self.discharged += discharged
+        self._update_efficiency(set())
+
+    def update(self, changed: Set[int], now: float, flow_refreshed: bool = False) -> None:
+        """Berechnet die Kennzahlen neu, sofern sich einer ihrer Eingangswerte geändert hat.
+
+        Args:
+            changed: Die Slots der im Zyklus geänderten Datenpunkte. Die Slots geänderter
+                Kennzahlen werden ergänzt.
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+            flow_refreshed: True, wenn der Energiefluss gerade vom Gateway gelesen wurde
+                (auch ohne Änderung). Nur dann wird die Speicherleistung aufsummiert, damit
+                ein Ausfall des Gateways nicht als gehaltener Wert mitgezählt wird.
+        """
+        store = self._store
+        flow = self._flow_slots
+
+        storage_slot = flow.get(FLOW_KEY_STORAGE)
+        if flow_refreshed and storage_slot is not None:
+            self._integrate_storage(_number(store, storage_slot), now)
+            self._update_efficiency(changed)
+
+        if self._input_slots.isdisjoint(changed):
+            return
+
+        production = _number(store, flow.get(FLOW_KEY_PRODUCTION))
+        consumption = _number(store, flow.get(FLOW_KEY_CONSUMPTION))
+        grid = _number(store, flow.get(FLOW_KEY_GRID))
+
+        grid_import = max(grid, 0.0) if grid is not None else None
+        grid_export = max(-grid, 0.0) if grid is not None else None
+
+        # Eigenverbrauchsquote: Anteil der Erzeugung, der nicht eingespeist wird.
+        self_consumption: Optional[float] = None
+        if production is not None and grid_export is not None and production > 0:
+            self_consumption = _percent(production - grid_export, production)
+
+        # Autarkiegrad: Anteil des Verbrauchs, der nicht aus dem Netz bezogen wird.
+        autarky: Optional[float] = None
+        if consumption is not None and grid_import is not None and consumption > 0:
+            autarky = _percent(consumption - grid_import, consumption)
+
+        self._set(KPI_SELF_CONSUMPTION, self_consumption, changed)
+        self._set(KPI_AUTARKY, autarky, changed)
+        self._set(KPI_NET_GRID_POWER, grid, changed)
+
+    def _integrate_storage(self, storage: Optional[float], now: float) -> None:
+        """Summiert Lade- und Entlademenge aus der Speicherleistung auf.
+
+        Das Gateway liefert die Leistung als Folge von Werten, die jeweils bis zum
+        nächsten gelten; der vorherige Wert wird daher über die verstrichene Zeit gehalten.
+        Nach einer Lücke von mehr als MAX_INTEGRATION_GAP Sekunden wird neu begonnen.
+        """
+        previous = self._storage_sample
+        self._storage_sample = (storage, now) if storage is not None else None
+        if previous is None:
+            return
+        power, since = previous
+        elapsed = now - since
+        if elapsed <= 0 or elapsed > MAX_INTEGRATION_GAP:
+            return
+        energy = power * elapsed / 3600
+        if energy >= 0:
+            self.discharged += energy
+        else:
+            self.charged -= energy
+
+    def _update_efficiency(self, changed: Set[int]) -> None:
+        """Setzt den Wirkungsgrad des Speichers (entladene / geladene Energie)."""
+        efficiency = _percent(self.discharged, self.charged) if self.charged > 0 else None
+        self._set(KPI_BATTERY_EFFICIENCY, efficiency, changed)
+
+    def _set(self, key: str, value: Optional[float], changed: Set[int]) -> None:
+        """Legt eine Kennzahl im Speicher ab und merkt den Slot bei Änderung vor."""
+        slot = self.slots[key]
+        if value is None:
+            if self._store.clear(slot):
+                changed.add(slot)
+        elif self._store.update(slot, value, None):
+            changed.add(slot)
@@ -0,0 +1,235 @@
+"""Laufzeit-Kennzahlen der Kommunikation mit Gateway und Cloud.
+
+Erfasst je Endpunkt und je BEAAM Gerät ("Thing") die Antwortzeiten als Histogramm,
+Fehler, Timeouts und empfangene Bytes sowie die Dauer der Abfragezyklen. Die Werte
+werden als Diagnose-Sensoren am BEAAM Gateway und im Diagnose-Download angezeigt,
+z.B. um ein Gerät zu finden, das den RS485-Bus ausbremst.
+"""
+
+import asyncio
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Obergrenzen (Sekunden) der Histogramm-Klassen. Werte darüber landen in einer Überlauf-Klasse.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Name des Endpunkts, unter dem die Bytes des Push-Kanals gezählt werden.
+STREAM_ENDPOINT: str = "stream"
+
+
+class LatencyHistogram:
+    """Histogramm von Dauern mit festen Klassen (konstanter Speicherbedarf)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialisiert ein leeres Histogramm."""
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Erfasst eine Dauer (Sekunden)."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mittlere Dauer (Sekunden) oder None, solange nichts erfasst wurde."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """Schätzt ein Quantil als Obergrenze der Klasse, in die es fällt.
+
+        Args:
+            quantile: Das Quantil zwischen 0 und 1 (z.B. 0.95).
+        """
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt das Histogramm in Millisekunden als Dictionary zurück (für Attribute und Diagnosen)."""
+        mean = self.mean
+        p95 = self.percentile(0.95)
+        buckets = {f"<={bound * 1000:g}ms": n for bound, n in zip(LATENCY_BUCKETS, self.counts)}
+        buckets[f">{LATENCY_BUCKETS[-1] * 1000:g}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 1) if mean is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "max_ms": round(self.max * 1000, 1),
+            "buckets": buckets,
+        }
+
+
+class RequestStats:
+    """Kennzahlen der Anfragen an einen Endpunkt bzw. ein Gerät."""
+
+    __slots__ = ("latency", "errors", "timeouts", "bytes_received", "last_error")
+
+    def __init__(self) -> None:
+        """Initialisiert leere Kennzahlen."""
+        self.latency = LatencyHistogram()
+        self.errors: int = 0
+        self.timeouts: int = 0
+        self.bytes_received: int = 0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt die Kennzahlen als Dictionary zurück."""
+        return {
+            "latency": self.latency.as_dict(),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_received": self.bytes_received,
+            "last_error": self.last_error,
+        }
+
+
+def _stats(collection: Dict[str, RequestStats], name: str) -> RequestStats:
+    """Gibt die Kennzahlen eines Endpunkts bzw. Geräts zurück und legt sie beim ersten Mal an."""
+    stats = collection.get(name)
+    if stats is None:
+        stats = collection[name] = RequestStats()
+    return stats
+
+
+class GatewayMetrics:
+    """Sammelt die Kennzahlen eines Koordinators."""
+
+    def __init__(self, cycle_timeout: Optional[float] = None) -> None:
+        """Initialisiert die Sammlung.
+
+        Args:
+            cycle_timeout: Das Gesamt-Timeout eines Abfragezyklus (Sekunden), um den
+                Abstand der Zyklusdauer zu diesem Grenzwert angeben zu können.
+        """
+        self.cycle_timeout = cycle_timeout
+        self.endpoints: Dict[str, RequestStats] = {}
+        self.things: Dict[str, RequestStats] = {}
+        self.cycles = LatencyHistogram()
+        self.last_cycle_duration: Optional[float] = None
+
+    def _targets(self, endpoint: str, thing_id: Optional[str]) -> List[RequestStats]:
+        """Gibt die Kennzahlen des Endpunkts und ggf. des Geräts zurück (und legt sie an)."""
+        targets = [_stats(self.endpoints, endpoint)]
+        if thing_id is not None:
+            targets.append(_stats(self.things, thing_id))
+        return targets
+
+    def record_success(
+        self, endpoint: str, seconds: float, nbytes: int, thing_id: Optional[str] = None
+    ) -> None:
+        """Erfasst eine erfolgreiche Anfrage.
+
+        Args:
+            endpoint: Der Name des Endpunkts (z.B. "site_state").
+            seconds: Die Dauer der Anfrage (ohne Wartezeit auf einen freien Verbindungsplatz).
+            nbytes: Die Größe der Antwort in Bytes.
+            thing_id: Das abgefragte Gerät (falls zutreffend).
+        """
+        for stats in self._targets(endpoint, thing_id):
+            stats.latency.observe(seconds)
+            stats.bytes_received += nbytes
+
+    def record_failure(
+        self, endpoint: str, err: BaseException, thing_id: Optional[str] = None
+    ) -> None:
+        """Erfasst eine fehlgeschlagene Anfrage (Timeouts werden getrennt gezählt).
+
+        Args:
+            endpoint: Der Name des Endpunkts.
+            err: Die aufgetretene Ausnahme.
+            thing_id: Das abgefragte Gerät (falls zutreffend).
+        """
+        timeout = isinstance(err, asyncio.TimeoutError)
+        for stats in self._targets(endpoint, thing_id):
+            if timeout:
+                stats.timeouts += 1
+            else:
+                stats.errors += 1
+            stats.last_error = "Timeout" if timeout else f"{type(err).__name__}: {err}"
+
+    def record_stream_bytes(self, nbytes: int) -> None:
+        """Erfasst über den Push-Kanal empfangene Bytes (Endpunkt "stream").
+
+        Args:
+            nbytes: Die Größe der empfangenen Zeile in Bytes.
+        """
+        _stats(self.endpoints, STREAM_ENDPOINT).bytes_received += nbytes
+
+    def record_cycle(self, seconds: float) -> None:
+        """Erfasst die Gesamtdauer eines Abfragezyklus."""
+        self.cycles.observe(seconds)
+        self.last_cycle_duration = seconds
+
+    @property
+    def errors(self) -> int:
+        """Summe der Fehler über alle Endpunkte."""
+        return sum(stats.errors for stats in self.endpoints.values())
+
+    @property
+    def timeouts(self) -> int:
+        """Summe der Timeouts über alle Endpunkte."""
+        return sum(stats.timeouts for stats in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Summe der empfangenen Bytes über alle Endpunkte."""
+        return sum(stats.bytes_received for stats in self.endpoints.values())
+
+    def request_snapshot(self, endpoint: str) -> Tuple[int, float, int]:
+        """Gibt die bisherigen Summen eines Endpunkts zurück, um einzelne Zyklen auszuwerten.
+
+        Args:
+            endpoint: Der Name des Endpunkts (z.B. "thing_states").
+
+        Returns:
+            (Anzahl erfolgreicher Anfragen, deren Gesamtdauer in Sekunden, Anzahl Fehler und Timeouts)
+        """
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            return 0, 0.0, 0
+        return stats.latency.count, stats.latency.total, stats.errors + stats.timeouts
+
+    @property
+    def cycle_headroom(self) -> Optional[float]:
+        """Anteil (Prozent) des Zyklus-Timeouts, den der letzte Zyklus verbraucht hat."""
+        if self.cycle_timeout is None or self.last_cycle_duration is None:
+            return None
+        return round(self.last_cycle_duration / self.cycle_timeout * 100, 1)
+
+    def slowest_thing(self) -> Optional[Tuple[str, float]]:
+        """Gibt das Gerät mit der höchsten mittleren Antwortzeit (ID, Sekunden) zurück."""
+        candidates = [
+            (thing_id, stats.latency.mean)
+            for thing_id, stats in self.things.items()
+            if stats.latency.mean is not None
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda item: item[1])
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt alle Kennzahlen als Dictionary zurück (für den Diagnose-Download)."""
+        return {
+            "cycles": self.cycles.as_dict(),
+            "last_cycle_duration_ms": (
+                round(self.last_cycle_duration * 1000, 1) if self.last_cycle_duration is not None else None
+            ),
+            "cycle_timeout_s": self.cycle_timeout,
+            "cycle_timeout_used_percent": self.cycle_headroom,
+            "endpoints": {name: stats.as_dict() for name, stats in self.endpoints.items()},
+            "things": {thing_id: stats.as_dict() for thing_id, stats in self.things.items()},
+        }
@@ -0,0 +1,202 @@
+"""Totband-Filter für die Benachrichtigung der Entitäten.
+
+Bei schneller Abfrage ändert sich z.B. eine Leistung in fast jedem Zyklus um wenige
+Watt. Jede Benachrichtigung führt zu einer Zustandsänderung in Home Assistant, einem
+Event auf dem Event-Bus und einem Eintrag in der Recorder-Datenbank. Der Filter
+entscheidet daher im Koordinator, bevor Entitäten benachrichtigt werden, ob eine
+Änderung veröffentlicht wird:
+
+* Totband mit Hysterese: Ein Zahlenwert wird erst veröffentlicht, wenn er sich vom
+  zuletzt *veröffentlichten* Wert um mehr als max(absolut, relativ × |Wert|)
+  unterscheidet. Langsames Driften wird so nicht verschluckt, da die Referenz erst
+  beim Veröffentlichen nachgezogen wird.
+* Mindestabstand: Zwischen zwei Veröffentlichungen eines Datenpunkts liegen mindestens
+  `min_interval` Sekunden. Zurückgehaltene Werte werden nachgereicht, sobald der
+  Abstand erreicht ist.
+
+Wechsel der Verfügbarkeit sowie nicht-numerische Werte werden immer veröffentlicht.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set
+
+from .const import LOGGER
+from .state_store import QUALITY_GOOD, DataPointStore
+
+
+class DeadBand(NamedTuple):
+    """Totband eines Datenpunkts: absolut (in der Einheit des Gateways) und relativ (Anteil)."""
+
+    absolute: float
+    relative: float
+
+
+def parse_dead_bands(text: Optional[str]) -> Dict[str, DeadBand]:
+    """Liest die Totbänder je Device Class aus dem Options-Text.
+
+    Einträge werden durch ";" oder Zeilenumbrüche getrennt und haben die Form
+    `device_class=Grenze[:Grenze]`. Eine Grenze mit "%" ist relativ zum zuletzt
+    veröffentlichten Wert, sonst absolut in der Einheit des Gateways, z.B.
+    `power=1%; voltage=0.5; current=0.05:1%`.
+
+    Args:
+        text: Der Text aus den Optionen (leer oder None = keine Totbänder).
+
+    Returns:
+        Das Totband je Device Class.
+
+    Raises:
+        ValueError: Wenn ein Eintrag nicht dem Format entspricht.
+    """
+    result: Dict[str, DeadBand] = {}
+    for entry in (text or "").replace("\n", ";").split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        device_class, sep, limits = entry.partition("=")
+        device_class = device_class.strip().lower()
+        parts = [part.strip() for part in limits.split(":")]
+        if not sep or not device_class or len(parts) > 2:
+            raise ValueError(f"Ungültiger Eintrag '{entry}'")
+
+        absolute = relative = 0.0
+        for part in parts:
+            try:
+                if part.endswith("%"):
+                    relative = float(part[:-1]) / 100
+                else:
+                    absolute = float(part)
+            except ValueError as err:
+                raise ValueError(f"Ungültige Grenze '{part}' in '{entry}'") from err
+        if absolute < 0 or relative < 0:
+            raise ValueError(f"Negative Grenze in '{entry}'")
+        result[device_class] = DeadBand(absolute, relative)
+    return result
+
+
+def dead_bands_from_option(text: Optional[str]) -> Dict[str, DeadBand]:
+    """Liest die Totbänder aus dem Options-Text; ist er ungültig, wird ohne Totband gefiltert.
+
+    Der Text wird bereits beim Speichern der Optionen geprüft. Ist er dennoch ungültig
+    (z.B. von Hand geändert), werden alle Änderungen veröffentlicht.
+
+    Args:
+        text: Der Text aus den Optionen.
+    """
+    try:
+        return parse_dead_bands(text)
+    except ValueError as err:
+        LOGGER.warning("Totbänder werden ignoriert: %s", err)
+        return {}
+
+
+class PublishFilter:
+    """Entscheidet je Datenpunkt, ob eine Änderung an die Entitäten weitergegeben wird."""
+
+    __slots__ = ("_dead_bands", "_min_interval", "_published", "_published_at", "_pending")
+
+    def __init__(self, min_interval: float = 0.0) -> None:
+        """Initialisiert den Filter ohne Totbänder.
+
+        Args:
+            min_interval: Mindestabstand (Sekunden) zwischen zwei Veröffentlichungen
+                eines Datenpunkts. 0 = kein Mindestabstand.
+        """
+        self._dead_bands: Dict[int, DeadBand] = {}
+        self._min_interval = min_interval
+        # Zuletzt veröffentlichter Wert und Zeitpunkt (time.monotonic()) je Slot.
+        self._published: Dict[int, Any] = {}
+        self._published_at: Dict[int, float] = {}
+        # Slots mit zurückgehaltener Änderung, die erneut geprüft werden.
+        self._pending: Set[int] = set()
+
+    def set_dead_bands(self, dead_bands: Mapping[int, DeadBand]) -> None:
+        """Setzt die Totbänder je Slot (z.B. nach dem Laden der Konfiguration).
+
+        Args:
+            dead_bands: Das Totband je Slot. Slots ohne Eintrag werden nur durch den
+                Mindestabstand gefiltert.
+        """
+        self._dead_bands = dict(dead_bands)
+
+    @property
+    def active(self) -> bool:
+        """Gibt an, ob der Filter überhaupt etwas zurückhalten kann."""
+        return bool(self._dead_bands) or self._min_interval > 0
+
+    @property
+    def pending(self) -> bool:
+        """Gibt an, ob zurückgehaltene Änderungen auf ihre Veröffentlichung warten."""
+        return bool(self._pending)
+
+    def filter(self, store: DataPointStore, changed: Set[int], now: float) -> Set[int]:
+        """Gibt die Slots zurück, deren Änderung veröffentlicht werden soll.
+
+        Zuvor zurückgehaltene Slots werden dabei erneut geprüft.
+
+        Args:
+            store: Der Speicher mit den aktuellen Werten.
+            changed: Die Slots, deren Wert sich im Speicher geändert hat.
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+
+        Returns:
+            Die zu veröffentlichenden Slots.
+        """
+        if not self.active:
+            return changed
+
+        candidates = changed | self._pending if self._pending else changed
+        values = store.values
+        qualities = store.qualities
+        published = self._published
+        published_at = self._published_at
+        dead_bands = self._dead_bands
+        min_interval = self._min_interval
+
+        result: Set[int] = set()
+        held: List[int] = []
+        for slot in candidates:
+            reference = published.get(slot)
+            if qualities[slot] == QUALITY_GOOD and reference is not None:
+                dead_band = dead_bands.get(slot)
+                if dead_band is not None and _within(values[slot], reference, dead_band):
+                    # Innerhalb des Totbands: nichts zu veröffentlichen, auch später nicht.
+                    continue
+                if min_interval > 0 and now - published_at.get(slot, 0.0) < min_interval:
+                    held.append(slot)
+                    continue
+            result.add(slot)
+
+        self._pending = set(held)
+        return result
+
+    def mark_published(self, slots: Iterable[int], store: DataPointStore, now: float) -> None:
+        """Übernimmt die Werte benachrichtigter Datenpunkte als neue Referenz.
+
+        Wird für jede Benachrichtigung aufgerufen, auch für solche am Filter vorbei
+        (z.B. nach einem Steuerungsbefehl oder wenn alle Entitäten benachrichtigt werden).
+
+        Args:
+            slots: Die veröffentlichten Slots.
+            store: Der Speicher mit den aktuellen Werten.
+            now: Der aktuelle Zeitpunkt (time.monotonic()).
+        """
+        if not self.active:
+            return
+        values = store.values
+        qualities = store.qualities
+        for slot in slots:
+            # Nur gültige Werte dienen als Referenz; nach einem Ausfall wird der erste
+            # Wert wieder sofort veröffentlicht.
+            self._published[slot] = values[slot] if qualities[slot] == QUALITY_GOOD else None
+            self._published_at[slot] = now
+            self._pending.discard(slot)
+
+
+def _within(value: Any, reference: Any, dead_band: DeadBand) -> bool:
+    """Prüft, ob ein Zahlenwert im Totband um den Referenzwert liegt."""
+    try:
+        delta = abs(float(value) - float(reference))
+        limit = max(dead_band.absolute, dead_band.relative * abs(float(reference)))
+    except (TypeError, ValueError):
+        return False
+    return delta <= limit
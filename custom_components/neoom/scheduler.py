@@ -0,0 +1,137 @@
+"""Gemeinsamer Taktgeber für alle Abfragen der Integration.
+
+Jeder Koordinator (Cloud Sites, BEAAM Gateways, schneller Pfad des Energieflusses)
+bräuchte sonst einen eigenen Timer. Timer mit gleichem Intervall laufen dann im
+Gleichtakt und lösen ihre Anfragen im selben Moment aus, was Lastspitzen in der
+Event-Loop von Home Assistant und im Netzwerk erzeugt.
+
+Der Taktgeber führt alle Aufgaben auf einer gemeinsamen Zeitachse aus und gibt jeder
+Aufgabe einen eigenen Phasenversatz innerhalb ihres Intervalls. Die Versätze folgen
+dem goldenen Schnitt, sodass sie für jede Anzahl an Aufgaben gleichmäßig verteilt
+sind, ohne dass bestehende Aufgaben beim Hinzufügen neuer verschoben werden müssen.
+"""
+
+import asyncio
+import math
+from typing import Awaitable, Callable, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, LOGGER
+
+# Schlüssel in hass.data, unter dem der gemeinsame Taktgeber abgelegt wird.
+DATA_SCHEDULER: str = f"{DOMAIN}_scheduler"
+
+# Nachkommateil des goldenen Schnitts; aufeinanderfolgende Vielfache modulo 1
+# verteilen sich maximal gleichmäßig auf das Intervall.
+_GOLDEN_RATIO_FRACTION: float = (math.sqrt(5) - 1) / 2
+
+
+class _ScheduledJob:
+    """Eine periodische Aufgabe des Taktgebers."""
+
+    __slots__ = ("name", "interval", "phase", "job", "handle", "task")
+
+    def __init__(
+        self, name: str, interval: float, phase: float, job: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Initialisiert die Aufgabe."""
+        self.name = name
+        self.interval = interval
+        self.phase = phase
+        self.job = job
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task[None]] = None
+
+
+class PollScheduler:
+    """Führt periodische Abfragen mit versetzten Phasen auf einer gemeinsamen Zeitachse aus."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialisiert den Taktgeber.
+
+        Args:
+            hass: Die Home Assistant Instanz.
+        """
+        self._hass = hass
+        # Gemeinsamer Nullpunkt aller Aufgaben (Zeit der Event-Loop).
+        self._epoch: float = hass.loop.time()
+        self._count: int = 0
+
+    @callback
+    def async_schedule(
+        self, name: str, interval: float, job: Callable[[], Awaitable[None]]
+    ) -> CALLBACK_TYPE:
+        """Führt eine Aufgabe ab sofort periodisch aus.
+
+        Läuft die vorherige Ausführung noch, wird der Takt übersprungen, damit sich
+        bei einem langsamen Gateway keine Abfragen aufstauen.
+
+        Args:
+            name: Name der Aufgabe (für Task-Namen und Log-Meldungen).
+            interval: Das Intervall in Sekunden.
+            job: Die auszuführende Coroutine-Funktion.
+
+        Returns:
+            Funktion, die die Aufgabe beendet (eine laufende Ausführung wird abgebrochen).
+        """
+        phase = (self._count * _GOLDEN_RATIO_FRACTION) % 1.0 * interval
+        self._count += 1
+        scheduled = _ScheduledJob(name, interval, phase, job)
+        self._schedule_next(scheduled)
+        LOGGER.debug("Aufgabe '%s' alle %.1f s mit Versatz %.2f s eingeplant.", name, interval, phase)
+
+        @callback
+        def cancel() -> None:
+            if scheduled.handle is not None:
+                scheduled.handle.cancel()
+                scheduled.handle = None
+            if scheduled.task is not None:
+                scheduled.task.cancel()
+                scheduled.task = None
+
+        return cancel
+
+    def _schedule_next(self, scheduled: _ScheduledJob) -> None:
+        """Plant die nächste Ausführung auf der gemeinsamen Zeitachse ein."""
+        loop = self._hass.loop
+        elapsed = loop.time() - self._epoch - scheduled.phase
+        periods = math.floor(elapsed / scheduled.interval) + 1
+        scheduled.handle = loop.call_at(
+            self._epoch + scheduled.phase + periods * scheduled.interval, self._run, scheduled
+        )
+
+    @callback
+    def _run(self, scheduled: _ScheduledJob) -> None:
+        """Startet eine Ausführung und plant die nächste ein."""
+        self._schedule_next(scheduled)
+        if scheduled.task is not None:
+            LOGGER.debug("Aufgabe '%s' läuft noch, Takt übersprungen.", scheduled.name)
+            return
+        scheduled.task = self._hass.async_create_background_task(
+            self._execute(scheduled), name=f"{DOMAIN} {scheduled.name}"
+        )
+
+    async def _execute(self, scheduled: _ScheduledJob) -> None:
+        """Führt die Aufgabe aus; Fehler werden protokolliert und beenden den Takt nicht."""
+        try:
+            await scheduled.job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Unerwarteter Fehler in Aufgabe '%s'", scheduled.name)
+        finally:
+            scheduled.task = None
+
+
+def async_get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Gibt den gemeinsamen Taktgeber zurück und legt ihn beim ersten Aufruf an.
+
+    Alle Konfigurationseinträge teilen sich denselben Taktgeber.
+
+    Args:
+        hass: Die Home Assistant Instanz.
+    """
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = PollScheduler(hass)
+    return hass.data[DATA_SCHEDULER]
@@ -4,9 +4,12 @@ Diese Datei definiert die "nur-lesen" Sensoren, die Daten aus der neoom AI Cloud
 und dem lokalen BEAAM Gateway in Home Assistant anzeigen.
 """
 
-from typing import Any, Callable, Dict, List, Optional
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
@@ -14,19 +17,23 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
-    UnitOfElectricCurrent,
-    UnitOfElectricPotential,
+    EntityCategory,
+    Platform,
     UnitOfEnergy,
-    UnitOfFrequency,
-    UnitOfPower,
+    UnitOfInformation,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DIAGNOSTIC_UPDATE_INTERVAL, DOMAIN, FLOW_KEY_GRID, LISTENER_CONTEXT_CYCLE
 from .coordinator import NeoomCloudCoordinator, NeoomLocalCoordinator
+from .descriptors import DataPointDescriptor
+from .kpi import KPI_AUTARKY, KPI_BATTERY_EFFICIENCY, KPI_NET_GRID_POWER, KPI_SELF_CONSUMPTION
+from .metrics import GatewayMetrics
+from .entity import NeoomLocalEntity, async_setup_local_entities
+from .state_store import QUALITY_UNAVAILABLE
 
 
 async def async_setup_entry(
@@ -46,71 +53,263 @@ async def async_setup_entry(
     
     # Hole die Koordinatoren, die wir in __init__.py gespeichert haben
     data: Dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
-    cloud_coordinator: NeoomCloudCoordinator = data["cloud"]
-    local_coordinator: NeoomLocalCoordinator = data["local"]
+    cloud_coordinators: List[NeoomCloudCoordinator] = data["clouds"]
+    local_coordinators: List[NeoomLocalCoordinator] = data["locals"]
 
     entities: List[SensorEntity] = []
 
     # --- CLOUD SENSOREN ---
-    # Diese Sensoren werden manuell erstellt, da wir wissen, 
+    # Diese Sensoren werden manuell erstellt (je Site), da wir wissen,
     # welche Tarifdaten die Cloud standardmäßig zurückgibt.
-    entities.append(
-        NeoomCloudSensor(
-            coordinator=cloud_coordinator,
-            key="electricity_price",
-            name="Electricity Price",
-            unit="EUR/kWh",
-            icon="mdi:currency-eur",
+    for cloud_coordinator in cloud_coordinators:
+        entities.append(
+            NeoomCloudSensor(
+                coordinator=cloud_coordinator,
+                key="electricity_price",
+                name="Electricity Price",
+                unit="EUR/kWh",
+                icon="mdi:currency-eur",
+            )
         )
-    )
-    entities.append(
-        NeoomCloudSensor(
-            coordinator=cloud_coordinator,
-            key="feed_in_tariff",
-            name="Feed-in Tariff",
-            unit="ct/kWh",
-            icon="mdi:cash-plus",
+        entities.append(
+            NeoomCloudSensor(
+                coordinator=cloud_coordinator,
+                key="feed_in_tariff",
+                name="Feed-in Tariff",
+                unit="ct/kWh",
+                icon="mdi:cash-plus",
+            )
         )
-    )
+
+    # --- DIAGNOSE-SENSOREN ---
+    # Kennzahlen der Kommunikation mit jedem BEAAM Gateway (Antwortzeiten, Fehler,
+    # Zyklusdauer). Sie hängen am jeweiligen Gateway Gerät und sind als Diagnose markiert.
+    for local_coordinator in local_coordinators:
+        entities.extend(_build_diagnostic_sensors(local_coordinator))
+
+    # Füge die Cloud- und Diagnose-Sensoren zu Home Assistant hinzu
+    async_add_entities(entities)
 
     # --- LOKALE SENSOREN (Dynamisch) ---
     # Da das BEAAM Gateway je nach Standort unterschiedliche Geräte 
     # (Wechselrichter, Speicher, E-Ladestation) angebunden hat,
     # generieren wir diese Sensoren dynamisch anhand der BEAAM Konfiguration.
-    beaam_config: Dict[str, Any] = (
-        local_coordinator.data.get("config", {}) if local_coordinator.data else {}
-    )
-
-    if beaam_config:
-        things: Dict[str, Any] = beaam_config.get("things", {})
-
-        for thing_id, thing_data in things.items():
-            if not thing_data:
-                continue
-
-            # Jeder Datenpunkt (DP) eines Geräts (Thing) wird zu einem eigenen Home Assistant Sensor
-            datapoints: Dict[str, Any] = thing_data.get("dataPoints", {})
-
-            for dp_id, dp_data in datapoints.items():
-                if not dp_data:
-                    continue
-
-                dtype: str = dp_data.get("dataType", "")
-
-                # Wir erstellen Sensoren für Zahlen (Leistung, Prozente) und Strings (Betriebsmodi)
-                if dtype in ["NUMBER", "STRING"]:
-                    entities.append(
-                        NeoomLocalSensor(
-                            coordinator=local_coordinator,
-                            thing_id=thing_id,
-                            thing_data=thing_data,
-                            dp_id=dp_id,
-                            dp_data=dp_data,
-                        )
-                    )
-
-    # Füge alle generierten Sensoren zu Home Assistant hinzu
-    async_add_entities(entities)
+    # Welche Datenpunkte (Zahlen und Texte) zu Sensoren werden, wurde beim Laden der
+    # Konfiguration einmalig klassifiziert (siehe descriptors.py). Die Konfiguration
+    # stammt entweder vom Gateway oder aus dem Cache, sodass Entitäten auch bei nicht
+    # erreichbarem Gateway angelegt werden.
+    # Ändert sich die Gerätestruktur später, werden Sensoren automatisch ergänzt oder entfernt.
+    for local_coordinator in local_coordinators:
+        async_setup_local_entities(
+            hass,
+            entry,
+            local_coordinator,
+            async_add_entities,
+            Platform.SENSOR,
+            partial(NeoomLocalSensor, local_coordinator),
+        )
+        # Energiezähler für Geräte, die nur ihre Leistung liefern (siehe energy_integration.py).
+        _async_setup_energy_sensors(entry, local_coordinator, async_add_entities)
+        # Eigenverbrauch, Autarkie, Netzsaldo und Speicher-Wirkungsgrad, berechnet vom
+        # Koordinator aus dem Energiefluss (nur, sofern das Gateway die Werte liefert).
+        _async_setup_kpi_sensors(entry, local_coordinator, async_add_entities)
+
+
+@callback
+def _async_setup_energy_sensors(
+    entry: ConfigEntry,
+    coordinator: NeoomLocalCoordinator,
+    async_add_entities: Callable[[List[SensorEntity]], None],
+) -> None:
+    """Legt die Energiezähler der integrierten Leistungen an und ergänzt neue nach Konfigurationsänderungen.
+
+    Weggefallene Zähler werden nicht entfernt, damit ihre Statistiken erhalten bleiben.
+    """
+    known: Set[str] = set()
+
+    @callback
+    def _async_add_new() -> None:
+        new_entities = [
+            NeoomLocalEnergySensor(coordinator, descriptor)
+            for descriptor in coordinator.energy_integrator.descriptors()
+            if descriptor.dp_id not in known
+        ]
+        known.update(entity.descriptor.dp_id for entity in new_entities)
+        if new_entities:
+            async_add_entities(new_entities)
+
+    _async_add_new()
+    entry.async_on_unload(coordinator.async_add_config_listener(_async_add_new))
+
+
+@callback
+def _async_setup_kpi_sensors(
+    entry: ConfigEntry,
+    coordinator: NeoomLocalCoordinator,
+    async_add_entities: Callable[[List[SensorEntity]], None],
+) -> None:
+    """Legt die Sensoren der Kennzahlen an und ergänzt neue nach Konfigurationsänderungen.
+
+    Liegt die Konfiguration beim Start noch nicht vor (Gateway ohne Cache nicht
+    erreichbar) oder liefert das Gateway später weitere Datenpunkte des Energieflusses,
+    entstehen die Sensoren, sobald die Konfiguration geladen ist. Weggefallene Kennzahlen
+    werden nicht entfernt, damit ihre Statistiken erhalten bleiben.
+    """
+    known: Set[str] = set()
+
+    @callback
+    def _async_add_new() -> None:
+        new_entities = _build_kpi_sensors(
+            coordinator, [key for key in coordinator.kpis.available() if key not in known]
+        )
+        known.update(entity.kpi_key for entity in new_entities)
+        if new_entities:
+            async_add_entities(new_entities)
+
+    _async_add_new()
+    entry.async_on_unload(coordinator.async_add_config_listener(_async_add_new))
+
+
+def _mean_ms(metrics: GatewayMetrics, endpoint: str) -> Optional[float]:
+    """Gibt die mittlere Antwortzeit eines Endpunkts in Millisekunden zurück."""
+    stats = metrics.endpoints.get(endpoint)
+    mean = stats.latency.mean if stats is not None else None
+    return round(mean * 1000, 1) if mean is not None else None
+
+
+def _build_diagnostic_sensors(coordinator: NeoomLocalCoordinator) -> List["NeoomDiagnosticSensor"]:
+    """Erzeugt die Diagnose-Sensoren des BEAAM Gateways."""
+    metrics = coordinator.metrics
+
+    def _slowest_thing() -> Optional[str]:
+        slowest = metrics.slowest_thing()
+        if slowest is None:
+            return None
+        thing_data = ((coordinator.beaam_config or {}).get("things", {}).get(slowest[0])) or {}
+        return f"neoom {thing_data.get('type', slowest[0])}"
+
+    def _slowest_thing_attributes() -> Dict[str, Any]:
+        slowest = metrics.slowest_thing()
+        if slowest is None:
+            return {}
+        return {"thing_id": slowest[0], "mean_ms": round(slowest[1] * 1000, 1)}
+
+    return [
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="cycle_duration",
+            name="Cycle Duration",
+            unit=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            icon="mdi:timer-outline",
+            value_fn=lambda: (
+                round(metrics.last_cycle_duration * 1000, 1)
+                if metrics.last_cycle_duration is not None
+                else None
+            ),
+            attributes_fn=lambda: {
+                "timeout_s": metrics.cycle_timeout,
+                "timeout_used_percent": metrics.cycle_headroom,
+            },
+        ),
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="site_state_latency",
+            name="Site State Latency",
+            unit=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            icon="mdi:timer-sand",
+            value_fn=lambda: _mean_ms(metrics, "site_state"),
+        ),
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="thing_latency",
+            name="Device Latency",
+            unit=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            icon="mdi:timer-sand",
+            value_fn=lambda: _mean_ms(metrics, "thing_states"),
+        ),
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="slowest_device",
+            name="Slowest Device",
+            icon="mdi:snail",
+            value_fn=_slowest_thing,
+            attributes_fn=_slowest_thing_attributes,
+        ),
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="request_errors",
+            name="Request Errors",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            icon="mdi:alert-circle-outline",
+            value_fn=lambda: metrics.errors,
+        ),
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="request_timeouts",
+            name="Request Timeouts",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            icon="mdi:timer-alert-outline",
+            value_fn=lambda: metrics.timeouts,
+        ),
+        NeoomDiagnosticSensor(
+            coordinator,
+            key="bytes_received",
+            name="Data Received",
+            unit=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            icon="mdi:download-network-outline",
+            value_fn=lambda: metrics.bytes_received,
+        ),
+    ]
+
+
+def _build_kpi_sensors(coordinator: NeoomLocalCoordinator, keys: List[str]) -> List["NeoomKpiSensor"]:
+    """Erzeugt die Sensoren der angegebenen Kennzahlen.
+
+    Args:
+        coordinator: Der lokale Koordinator, der die Kennzahlen berechnet.
+        keys: Die Schlüssel der Kennzahlen (siehe kpi.py).
+    """
+    grid_unit = coordinator.unit_mapper.resolve(coordinator.kpis.flow_unit(FLOW_KEY_GRID), FLOW_KEY_GRID)
+    sensors: Dict[str, NeoomKpiSensor] = {
+        KPI_SELF_CONSUMPTION: NeoomKpiSensor(
+            coordinator,
+            key=KPI_SELF_CONSUMPTION,
+            name="Self-Consumption Rate",
+            unit=PERCENTAGE,
+            icon="mdi:home-lightning-bolt-outline",
+        ),
+        KPI_AUTARKY: NeoomKpiSensor(
+            coordinator,
+            key=KPI_AUTARKY,
+            name="Autarky",
+            unit=PERCENTAGE,
+            icon="mdi:home-battery-outline",
+        ),
+        KPI_NET_GRID_POWER: NeoomKpiSensor(
+            coordinator,
+            key=KPI_NET_GRID_POWER,
+            name="Net Grid Power",
+            unit=grid_unit.unit,
+            device_class=grid_unit.device_class,
+            icon="mdi:transmission-tower",
+        ),
+        KPI_BATTERY_EFFICIENCY: NeoomBatteryEfficiencySensor(
+            coordinator,
+            key=KPI_BATTERY_EFFICIENCY,
+            name="Battery Round-Trip Efficiency",
+            unit=PERCENTAGE,
+            icon="mdi:battery-sync-outline",
+        ),
+    }
+    return [sensors[key] for key in keys]
 
 
 class NeoomCloudSensor(CoordinatorEntity, SensorEntity):
@@ -137,6 +336,8 @@ class NeoomCloudSensor(CoordinatorEntity, SensorEntity):
         
         # Eindeutige ID ist entscheidend für Home Assistant, um die Entität wiederzuerkennen
         self._attr_unique_id = f"{coordinator.site_id}_{key}"
+        # Gruppiert die Cloud-Sensoren unter einem gemeinsamen "Gerät" in der UI.
+        self._attr_device_info = coordinator.device_info
 
     @property
     def name(self) -> str:
@@ -152,61 +353,31 @@ class NeoomCloudSensor(CoordinatorEntity, SensorEntity):
         # Holt den Wert aus dem vom Coordinator bereitgestellten Dictionary
         return self.coordinator.data.get("site", {}).get(self._key)
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Gibt Informationen zum virtuellen Cloud-Gerät zurück.
-        
-        Gruppiert die Cloud-Sensoren zusammen unter einem "Gerät" in der UI.
-        """
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.site_id)},
-            name="neoom AI Cloud Site",
-            manufacturer="neoom",
-            model="Cloud API",
-        )
-
-
-class NeoomLocalSensor(CoordinatorEntity, SensorEntity):
+class NeoomLocalSensor(NeoomLocalEntity, SensorEntity):
     """Repräsentation eines lokalen BEAAM Sensors (z.B. Leistung, Temperatur)."""
 
+    _platform = Platform.SENSOR
+
     def __init__(
         self,
         coordinator: NeoomLocalCoordinator,
-        thing_id: str,
-        thing_data: Dict[str, Any],
-        dp_id: str,
-        dp_data: Dict[str, Any],
+        descriptor: DataPointDescriptor,
     ) -> None:
         """Initialisiert den lokalen Sensor."""
-        super().__init__(coordinator)
-        
-        self._thing_id = thing_id
-        self._thing_type: str = thing_data.get("type", "Unknown")
-        self._dp_id = dp_id
-        self._key: str = dp_data.get("key", "")
-        self._uom_raw: str = dp_data.get("unitOfMeasure", "")
-
-        # Mache den Namen benutzerfreundlich (z.B. BATT_INVERTER -> Batt Inverter)
-        friendly_thing_name = self._thing_type.replace("_", " ").title()
-        friendly_dp_name = self._key.replace("_", " ").title()
-        
-        self._attr_name = f"{friendly_thing_name} {friendly_dp_name}"
-        self._attr_unique_id = f"{thing_id}_{dp_id}"
+        super().__init__(coordinator, descriptor)
 
-        # Weise HA-spezifische Device Classes (Typ des Sensors, z.B. Leistung) 
-        # und State Classes (Verhalten über Zeit, z.B. kumulativ) zu
-        self._attr_device_class = self._map_device_class(self._key, self._uom_raw)
-        self._attr_state_class = self._map_state_class(self._key, self._uom_raw)
-        
-        # Leite die richtige Einheit (z.B. kW, W) aus der rohen API-Einheit ab
-        self._attr_native_unit_of_measurement = self._map_unit(self._uom_raw)
+        # Einheit, Device Class (Typ des Sensors, z.B. Leistung) und State Class
+        # (Verhalten über Zeit, z.B. kumulativ) stammen aus der Datenpunkt-Beschreibung.
+        self._attr_native_unit_of_measurement = descriptor.native_unit
+        self._attr_device_class = descriptor.device_class
+        self._attr_state_class = descriptor.state_class
         
         # Initialen Status beim Erstellen setzen
         self._update_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Wird von der CoordinatorEntity-Basisklasse aufgerufen, wenn neue Daten ankommen.
+        """Wird vom Koordinator aufgerufen, wenn sich dieser Datenpunkt geändert hat.
         
         Wir aktualisieren unseren internen Wert und leiten dann das Update an Home Assistant weiter.
         """
@@ -214,112 +385,219 @@ class NeoomLocalSensor(CoordinatorEntity, SensorEntity):
         super()._handle_coordinator_update()
 
     def _update_state(self) -> None:
-        """Liest den aktuellen Wert aus den Coordinator-Daten aus und setzt ihn als Status."""
-        if not self.coordinator.data:
-            self._attr_native_value = None
-            return
+        """Liest den aktuellen Wert aus dem Werte-Speicher aus und setzt ihn als Status."""
+        raw_value = self._value
+
+        # Gib Nummern als float, Texte als string zurück.
+        # Wir verzichten hier bewusst auf manuelle Skalierungs-Magie (wie Kilo/Mega präfixe).
+        # Home Assistant handhabt natives Skalieren in der UI automatisch viel besser,
+        # wenn die Einheit und Device Class stimmen.
+        if raw_value is not None and isinstance(raw_value, (int, float)):
+            self._attr_native_value = float(raw_value)
+        else:
+            self._attr_native_value = raw_value
 
-        state_map: Dict[str, Any] = self.coordinator.data.get("states", {})
-        data_point: Optional[Dict[str, Any]] = state_map.get(self._dp_id)
 
-        if data_point:
-            raw_value = data_point.get("value")
+class NeoomLocalEnergySensor(CoordinatorEntity, RestoreSensor):
+    """Energiezähler (kWh), den der Koordinator aus einem Leistungs-Datenpunkt integriert.
 
-            # Gib Nummern als float, Texte als string zurück.
-            # Wir verzichten hier bewusst auf manuelle Skalierungs-Magie (wie Kilo/Mega präfixe).
-            # Home Assistant handhabt natives Skalieren in der UI automatisch viel besser,
-            # wenn die Einheit und Device Class stimmen.
-            if raw_value is not None and isinstance(raw_value, (int, float)):
-                self._attr_native_value = float(raw_value)
-            else:
-                self._attr_native_value = raw_value
-        else:
-            self._attr_native_value = None
+    Der Zählerstand wird nach einem Neustart aus dem letzten Zustand wiederhergestellt
+    und danach weiter aufsummiert.
+    """
+
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator: NeoomLocalCoordinator, descriptor: DataPointDescriptor) -> None:
+        """Initialisiert den Energiezähler.
+
+        Args:
+            coordinator: Der lokale Koordinator, der die Leistung integriert.
+            descriptor: Die Beschreibung des integrierten Leistungs-Datenpunkts.
+        """
+        self._slot: int = coordinator.energy_integrator.targets[descriptor.dp_id].energy_slot
+        super().__init__(coordinator, context=self._slot)
+        self.descriptor = descriptor
+        self._attr_name = f"{descriptor.name} Energy"
+        self._attr_unique_id = f"{descriptor.unique_id(Platform.SENSOR)}_energy"
+        self._attr_icon = "mdi:lightning-bolt"
+        # Der Zähler gehört zum selben Gerät wie die Leistung.
+        self._attr_device_info = coordinator.thing_device_infos[descriptor.thing_id]
+
+    async def async_added_to_hass(self) -> None:
+        """Stellt den Zählerstand aus dem letzten Zustand wieder her."""
+        await super().async_added_to_hass()
+        last_data = await self.async_get_last_sensor_data()
+        if last_data is None or last_data.native_value is None:
+            return
+        try:
+            total = float(last_data.native_value)
+        except (TypeError, ValueError):
+            return
+        self.coordinator.energy_integrator.restore(self.descriptor.dp_id, total)
 
     @property
-    def device_info(self) -> DeviceInfo:
-        """Gibt Informationen zum zugrundeliegenden Gerät zurück.
-        
-        Verknüpft diesen Sensor mit dem physischen Gerät (z.B. Wechselrichter).
-        'via_device' zeigt an, dass die Kommunikation über das BEAAM Gateway läuft.
+    def native_value(self) -> Optional[float]:
+        """Gibt den aktuellen Zählerstand in kWh zurück."""
+        return self.coordinator.state_store.values[self._slot]
+
+
+class NeoomKpiSensor(CoordinatorEntity, SensorEntity):
+    """Kennzahl, die der Koordinator aus dem Energiefluss des Gateways ableitet.
+
+    Der Wert liegt in einem eigenen Slot des Werte-Speichers. Wie die lokalen Sensoren
+    meldet sich die Entität mit diesem Slot als Kontext an und wird nur benachrichtigt,
+    wenn sich die Kennzahl geändert hat.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: NeoomLocalCoordinator,
+        key: str,
+        name: str,
+        icon: str,
+        unit: Optional[str] = None,
+        device_class: Optional[SensorDeviceClass] = None,
+    ) -> None:
+        """Initialisiert den Sensor der Kennzahl.
+
+        Args:
+            coordinator: Der lokale Koordinator, der die Kennzahl berechnet.
+            key: Schlüssel der Kennzahl (siehe kpi.py, Teil der unique_id).
+            name: Der Anzeigename.
+            icon: Das Symbol.
+            unit: Die Einheit (falls vorhanden).
+            device_class: Die Home Assistant Device Class (falls vorhanden).
         """
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thing_id)},
-            name=f"neoom {self._thing_type}",
-            manufacturer="neoom",
-            model=self._thing_type,
-            via_device=(DOMAIN, "BEAAM Gateway"),
+        self.kpi_key = key
+        self._slot: int = coordinator.kpis.slots[key]
+        super().__init__(coordinator, context=self._slot)
+        self._attr_name = f"BEAAM {name}"
+        self._attr_unique_id = f"{coordinator.ip}_kpi_{key}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        # Die Kennzahlen beschreiben die gesamte Site und hängen daher am Gateway.
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Nicht verfügbar, wenn das Gateway nicht antwortet."""
+        return (
+            super().available
+            and self.coordinator.state_store.qualities[self._slot] != QUALITY_UNAVAILABLE
         )
 
-    def _map_unit(self, unit_str: str) -> Optional[str]:
-        """Konvertiert die BEAAM String-Einheit in die offizielle Home Assistant Konstante."""
-        if not unit_str or unit_str.lower() in ["none", "null"]:
-            return None
+    @property
+    def native_value(self) -> Optional[float]:
+        """Gibt den aktuellen Wert der Kennzahl zurück (None, solange er nicht berechnet werden kann)."""
+        return self.coordinator.state_store.values[self._slot]
+
+
+class NeoomBatteryEfficiencySensor(NeoomKpiSensor, RestoreEntity):
+    """Wirkungsgrad des Speichers (entladene / geladene Energie).
+
+    Die aufsummierten Energiemengen werden als Attribute gespeichert und nach einem
+    Neustart von Home Assistant wiederhergestellt, sodass der Wirkungsgrad über die
+    gesamte Laufzeit gilt und nicht bei jedem Neustart neu beginnt.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Stellt die aufsummierten Energiemengen aus dem letzten Zustand wieder her."""
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state is None:
+            return
+        try:
+            charged = float(last_state.attributes["charged"])
+            discharged = float(last_state.attributes["discharged"])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.coordinator.kpis.restore(charged, discharged)
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Gibt die aufsummierte Lade- und Entlademenge (Einheit der Leistung × h) zurück."""
+        kpis = self.coordinator.kpis
+        return {"charged": round(kpis.charged, 3), "discharged": round(kpis.discharged, 3)}
 
-        # Leistung (Power)
-        if unit_str == "W":
-            return UnitOfPower.WATT
-        if unit_str == "kW":
-            return UnitOfPower.KILO_WATT
-        if unit_str == "MW":
-            return UnitOfPower.MEGA_WATT
-        if unit_str == "GW":
-            return UnitOfPower.GIGA_WATT
-
-        # Energie (Energy)
-        if unit_str == "Wh":
-            return UnitOfEnergy.WATT_HOUR
-        if unit_str == "kWh":
-            return UnitOfEnergy.KILO_WATT_HOUR
-        if unit_str == "MWh":
-            return UnitOfEnergy.MEGA_WATT_HOUR
-        if unit_str == "GWh":
-            return UnitOfEnergy.GIGA_WATT_HOUR
-
-        # Elektrische Werte
-        if unit_str == "V":
-            return UnitOfElectricPotential.VOLT
-        if unit_str == "A":
-            return UnitOfElectricCurrent.AMPERE
-        if unit_str == "Hz":
-            return UnitOfFrequency.HERTZ
-            
-        # Sonstiges
-        if unit_str == "%":
-            return PERCENTAGE
-        if unit_str == "s":
-            return UnitOfTime.SECONDS
-
-        # Fallback auf den rohen String, wenn unbekannt
-        return unit_str
-
-    def _map_device_class(self, key: str, unit: str) -> Optional[SensorDeviceClass]:
-        """Weist basierend auf dem Datentyp / der Einheit die richtige Home Assistant Sensor-Klasse zu.
-        Dies beeinflusst die Darstellung und die verfügbaren Einheitenumrechnungen in der UI.
+
+class NeoomDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnose-Sensor mit einer Kennzahl der Kommunikation mit dem BEAAM Gateway.
+
+    Wird nur nach dem regulären Zyklus benachrichtigt (nicht nach jedem Abruf des
+    schnellen Pfads oder jeder Push-Nachricht) und schreibt seinen Zustand höchstens
+    alle DIAGNOSTIC_UPDATE_INTERVAL Sekunden. Histogramme und Werte je Endpunkt bzw.
+    Gerät enthält nur der Diagnose-Download; die wenigen Attribute werden nicht
+    aufgezeichnet. Bleibt auch verfügbar, wenn das Gateway nicht antwortet, da gerade
+    dann die Fehler- und Timeout-Zähler interessant sind.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"timeout_s", "timeout_used_percent", "thing_id", "mean_ms"})
+
+    def __init__(
+        self,
+        coordinator: NeoomLocalCoordinator,
+        key: str,
+        name: str,
+        value_fn: Callable[[], Any],
+        icon: str,
+        attributes_fn: Optional[Callable[[], Dict[str, Any]]] = None,
+        unit: Optional[str] = None,
+        device_class: Optional[SensorDeviceClass] = None,
+        state_class: Optional[SensorStateClass] = None,
+    ) -> None:
+        """Initialisiert den Diagnose-Sensor.
+
+        Args:
+            coordinator: Der lokale Koordinator, dessen Kennzahlen angezeigt werden.
+            key: Eindeutiger Schlüssel der Kennzahl (Teil der unique_id).
+            name: Der Anzeigename.
+            value_fn: Liefert den aktuellen Wert.
+            icon: Das Symbol.
+            attributes_fn: Liefert die zusätzlichen Attribute (falls vorhanden).
+            unit: Die Einheit (falls vorhanden).
+            device_class: Die Home Assistant Device Class (falls vorhanden).
+            state_class: Die Home Assistant State Class (falls vorhanden).
         """
-        if unit in ["W", "kW", "MW", "GW"]:
-            return SensorDeviceClass.POWER
-        if unit in ["Wh", "kWh", "MWh", "GWh"]:
-            return SensorDeviceClass.ENERGY
-        if unit == "V":
-            return SensorDeviceClass.VOLTAGE
-        if unit == "A":
-            return SensorDeviceClass.CURRENT
-        if unit == "%" and "SOC" in key:
-            # SOC steht in der Branche für "State of Charge" (Batteriestand)
-            return SensorDeviceClass.BATTERY
-            
-        return None
-
-    def _map_state_class(self, key: str, unit: str) -> Optional[SensorStateClass]:
-        """Bestimmt das Langzeit-Aufzeichnungsverhalten (Statistics) des Sensors in HA."""
-        # Energiemengen (produziert/verbraucht) steigen kontinuierlich an
-        if "ENERGY" in key or unit in ["Wh", "kWh", "MWh", "GWh"]:
-            return SensorStateClass.TOTAL_INCREASING
-            
-        # Wenn es sich um eine Zahl ohne Einheit (None) handelt oder einen Text-Status
-        if not unit or unit.lower() in ["none", "null"]:
-            return None
-            
-        # Normalfall für Messwerte wie Leistung, Spannung, Temperatur
-        return SensorStateClass.MEASUREMENT
+        super().__init__(coordinator, context=LISTENER_CONTEXT_CYCLE)
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+        # Zeitpunkt (time.monotonic()) des letzten geschriebenen Zustands.
+        self._written_at: Optional[float] = None
+        self._attr_name = f"BEAAM {name}"
+        self._attr_unique_id = f"{coordinator.ip}_diagnostic_{key}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        # Ordnet den Sensor dem BEAAM Gateway Gerät zu.
+        self._attr_device_info = coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Schreibt den Zustand höchstens alle DIAGNOSTIC_UPDATE_INTERVAL Sekunden."""
+        now = time.monotonic()
+        if self._written_at is not None and now - self._written_at < DIAGNOSTIC_UPDATE_INTERVAL:
+            return
+        self._written_at = now
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Diagnose-Werte sind immer verfügbar."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Gibt den aktuellen Wert der Kennzahl zurück."""
+        return self._value_fn()
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Gibt Details der Kennzahl zurück (z.B. das langsamste Gerät)."""
+        return self._attributes_fn() if self._attributes_fn is not None else None
@@ -0,0 +1,184 @@
+"""Kompakter Speicher für die aktuellen Werte der BEAAM Datenpunkte.
+
+Statt bei jedem Abfragezyklus eine neue Map `dataPointId -> komplettes JSON-Objekt`
+aufzubauen, wird jede Datenpunkt-ID einmalig einem festen Index ("Slot") zugeordnet.
+Werte, Zeitstempel und Qualität liegen in parallelen Listen; Entitäten merken sich
+ihren Slot und lesen ihren Wert ohne Dictionary-Verschachtelung.
+
+Zu jedem Slot wird außerdem festgehalten, wann das Gateway ihn zuletzt geliefert hat
+(auch ohne Änderung). Damit lässt sich je Datenpunkt erkennen, ob sein Wert veraltet ist.
+
+Der Benchmark unter `tools/bench_state_store.py` lädt das Modul ohne Home Assistant.
+"""
+
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Qualität eines Datenpunkts.
+# Für diesen Datenpunkt liegt (noch) kein Wert vor, z.B. weil das Gerät nicht antwortet.
+QUALITY_MISSING: int = 0
+# Der Wert wurde vom Gateway geliefert.
+QUALITY_GOOD: int = 1
+# Das zugehörige Gerät antwortet nicht; die Entität soll als "nicht verfügbar" gelten.
+QUALITY_UNAVAILABLE: int = 2
+
+# Zustand eines Datenpunkts, wie er vom Gateway kommt, reduziert auf die benötigten
+# Felder: (dataPointId, value, timestamp).
+StateItem = Tuple[str, Any, Optional[str]]
+
+
+class DataPointState:
+    """Momentaufnahme eines einzelnen Datenpunkts (Wert, Zeitstempel, Qualität)."""
+
+    __slots__ = ("value", "timestamp", "quality")
+
+    def __init__(self, value: Any, timestamp: Optional[str], quality: int) -> None:
+        """Initialisiert die Momentaufnahme."""
+        self.value = value
+        self.timestamp = timestamp
+        self.quality = quality
+
+    def __repr__(self) -> str:
+        """Gibt eine lesbare Darstellung für Logs und Diagnosen zurück."""
+        return f"DataPointState(value={self.value!r}, timestamp={self.timestamp!r}, quality={self.quality})"
+
+
+class DataPointStore:
+    """Speichert die Werte aller Datenpunkte in Listen, adressiert über feste Slots.
+
+    Slots werden nur angehängt, nie entfernt. Ein einmal vergebener Index bleibt
+    damit für die Lebensdauer des Speichers gültig, auch wenn sich die
+    Gerätestruktur ändert.
+    """
+
+    __slots__ = ("_slots", "dp_ids", "values", "timestamps", "qualities", "updated_at")
+
+    def __init__(self) -> None:
+        """Initialisiert einen leeren Speicher."""
+        self._slots: Dict[str, int] = {}
+        self.dp_ids: List[str] = []
+        self.values: List[Any] = []
+        self.timestamps: List[Optional[str]] = []
+        self.qualities: List[int] = []
+        # Zeitpunkt (time.monotonic()) des letzten gelieferten Werts je Slot; 0 = noch keiner.
+        self.updated_at: List[float] = []
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der vergebenen Slots zurück."""
+        return len(self.dp_ids)
+
+    def resolve(self, dp_id: str) -> int:
+        """Gibt den Slot einer Datenpunkt-ID zurück und legt ihn bei Bedarf an.
+
+        Args:
+            dp_id: Die Datenpunkt-ID des Gateways.
+        """
+        slot = self._slots.get(dp_id)
+        if slot is None:
+            slot = len(self.dp_ids)
+            self._slots[dp_id] = slot
+            self.dp_ids.append(dp_id)
+            self.values.append(None)
+            self.timestamps.append(None)
+            self.qualities.append(QUALITY_MISSING)
+            self.updated_at.append(0.0)
+        return slot
+
+    def slot(self, dp_id: str) -> Optional[int]:
+        """Gibt den Slot einer Datenpunkt-ID zurück, ohne ihn anzulegen (sonst None)."""
+        return self._slots.get(dp_id)
+
+    def update(self, slot: int, value: Any, timestamp: Optional[str]) -> bool:
+        """Setzt einen vom Gateway gelieferten Wert.
+
+        Args:
+            slot: Der Slot des Datenpunkts.
+            value: Der neue Wert.
+            timestamp: Der Zeitstempel des Werts laut Gateway (falls vorhanden).
+
+        Returns:
+            True, wenn sich Wert oder Qualität geändert haben.
+        """
+        self.timestamps[slot] = timestamp
+        self.updated_at[slot] = time.monotonic()
+        if self.values[slot] == value and self.qualities[slot] == QUALITY_GOOD:
+            return False
+        self.values[slot] = value
+        self.qualities[slot] = QUALITY_GOOD
+        return True
+
+    def apply(self, items: Iterable[StateItem], changed: Set[int]) -> None:
+        """Übernimmt eine Liste von Zuständen des Gateways in einem Durchlauf.
+
+        Entspricht `resolve()` + `update()` je Zustand, vermeidet aber die Methodenaufrufe
+        im inneren Schleifenkörper, da dies bei jedem Zyklus für alle Datenpunkte läuft.
+
+        Args:
+            items: Die Zustände als (dataPointId, value, timestamp).
+            changed: Menge, in die die Slots geänderter Datenpunkte eingetragen werden.
+        """
+        slots = self._slots
+        values = self.values
+        timestamps = self.timestamps
+        qualities = self.qualities
+        updated_at = self.updated_at
+        now = time.monotonic()
+
+        for dp_id, value, timestamp in items:
+            slot = slots.get(dp_id)
+            if slot is None:
+                slot = self.resolve(dp_id)
+            timestamps[slot] = timestamp
+            updated_at[slot] = now
+            if values[slot] != value or qualities[slot] != QUALITY_GOOD:
+                values[slot] = value
+                qualities[slot] = QUALITY_GOOD
+                changed.add(slot)
+
+    def clear(self, slot: int, quality: int = QUALITY_MISSING) -> bool:
+        """Verwirft den Wert eines Datenpunkts (z.B. wenn das Gerät nicht antwortet).
+
+        Args:
+            slot: Der Slot des Datenpunkts.
+            quality: Die neue Qualität (QUALITY_MISSING oder QUALITY_UNAVAILABLE).
+
+        Returns:
+            True, wenn sich Wert oder Qualität dadurch geändert haben.
+        """
+        if self.qualities[slot] == quality and self.values[slot] is None:
+            return False
+        self.values[slot] = None
+        self.timestamps[slot] = None
+        self.qualities[slot] = quality
+        return True
+
+    def expire(self, slots: Iterable[int], oldest: float, changed: Set[int]) -> None:
+        """Markiert Datenpunkte als nicht verfügbar, deren Wert zu alt ist.
+
+        Args:
+            slots: Die zu prüfenden Slots.
+            oldest: Werte, die vor diesem Zeitpunkt (time.monotonic()) zuletzt geliefert
+                wurden, gelten als veraltet.
+            changed: Menge, in die die Slots verworfener Werte eingetragen werden.
+        """
+        qualities = self.qualities
+        updated_at = self.updated_at
+        for slot in slots:
+            if qualities[slot] == QUALITY_GOOD and updated_at[slot] < oldest:
+                self.clear(slot, QUALITY_UNAVAILABLE)
+                changed.add(slot)
+
+    def get(self, dp_id: str) -> Optional[DataPointState]:
+        """Gibt eine Momentaufnahme des Datenpunkts zurück (oder None, falls unbekannt).
+
+        Gedacht für Diagnosen und seltene Zugriffe; Entitäten lesen direkt über ihren Slot.
+        """
+        slot = self._slots.get(dp_id)
+        if slot is None:
+            return None
+        return DataPointState(self.values[slot], self.timestamps[slot], self.qualities[slot])
+
+    def items(self) -> Iterator[Tuple[str, DataPointState]]:
+        """Iteriert über alle Datenpunkte mit ihrer aktuellen Momentaufnahme."""
+        for slot, dp_id in enumerate(self.dp_ids):
+            yield dp_id, DataPointState(self.values[slot], self.timestamps[slot], self.qualities[slot])
@@ -0,0 +1,404 @@
+"""Zugriff auf die lokale API des BEAAM Gateways ("Transport").
+
+Der Koordinator spricht das Gateway ausschließlich über diese Schnittstelle an.
+Es gibt zwei Umsetzungen:
+- `BeaamPollingTransport`: klassische HTTP-Abfragen (`/api/v1/...`).
+- `BeaamPushTransport`: wie oben, zusätzlich ein Server-Sent-Events Kanal, über den
+  das Gateway neue Werte von sich aus schickt. Ob das Gateway diesen Kanal anbietet,
+  wird beim Start geprüft ("Probe"); andernfalls bleibt es beim Polling.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import async_timeout
+
+from .const import (
+    LOCAL_REQUEST_TIMEOUT,
+    LOGGER,
+    PUSH_IDLE_TIMEOUT,
+    TRANSPORT_POLLING,
+)
+from .metrics import GatewayMetrics
+from .state_store import StateItem
+
+try:
+    # Home Assistant bringt orjson mit; es dekodiert die Antworten ein Vielfaches schneller.
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - nur außerhalb von Home Assistant (z.B. tools/)
+    from json import loads as json_loads
+
+# Pfad des Push-Kanals (Server-Sent Events). Jede Nachricht ("data:") ist ein JSON-Objekt
+# im Format von `/site/state` ({"energyFlow": {"states": [...]}}) oder von
+# `/things/{id}/states` ({"thingId": ..., "states": [...]}).
+STREAM_PATH: str = "/api/v1/site/stream"
+
+
+class BeaamAuthError(Exception):
+    """Das Gateway hat den API Key abgewiesen (Status 401)."""
+
+
+class BeaamPayloadError(aiohttp.ClientError):
+    """Die Antwort des Gateways ist kein gültiges JSON-Objekt.
+
+    Leitet von aiohttp.ClientError ab, damit sie überall wie ein Verbindungsfehler
+    behandelt wird (schneller Pfad, regulärer Zyklus, Konfigurationsabruf).
+    """
+
+
+def decode_object(body: bytes) -> Dict[str, Any]:
+    """Dekodiert eine Antwort des Gateways, die ein JSON-Objekt sein muss.
+
+    Args:
+        body: Der Rumpf der Antwort.
+
+    Returns:
+        Das dekodierte Objekt.
+
+    Raises:
+        BeaamPayloadError: Wenn der Rumpf kein gültiges JSON oder kein Objekt ist.
+    """
+    try:
+        payload = json_loads(body)
+    except ValueError as err:
+        raise BeaamPayloadError(f"Ungültiges JSON in der Antwort des Gateways: {err}") from err
+    if not isinstance(payload, dict):
+        raise BeaamPayloadError(
+            f"Unerwartete Antwort des Gateways ({type(payload).__name__} statt Objekt)"
+        )
+    return payload
+
+
+def extract_states(states: Any) -> List[StateItem]:
+    """Reduziert die Zustandsobjekte einer Antwort auf (dataPointId, value, timestamp).
+
+    Die übrigen Felder der Objekte werden nicht weiter benötigt und sind nach dem
+    Auslesen sofort wieder freigegeben.
+
+    Args:
+        states: Die Liste "states" einer Antwort (ungültige Einträge werden übersprungen).
+    """
+    if not isinstance(states, list):
+        return []
+    return [
+        (item["dataPointId"], item.get("value"), item.get("timestamp"))
+        for item in states
+        if isinstance(item, dict) and "dataPointId" in item
+    ]
+
+
+# Felder eines Datenpunkts in der Konfiguration, die die Integration auswertet.
+_CONFIG_DATAPOINT_FIELDS: Tuple[str, ...] = ("key", "dataType", "controllable", "unitOfMeasure")
+
+
+def _extract_datapoints(raw_datapoints: Any) -> Dict[str, Any]:
+    """Reduziert die Datenpunkte eines Geräts bzw. des Energieflusses auf die benötigten Felder."""
+    datapoints: Dict[str, Any] = {}
+    for dp_id, dp_data in (raw_datapoints or {}).items():
+        if isinstance(dp_data, dict):
+            datapoints[dp_id] = {
+                field: dp_data[field] for field in _CONFIG_DATAPOINT_FIELDS if field in dp_data
+            }
+    return datapoints
+
+
+def extract_configuration(config: Any) -> Dict[str, Any]:
+    """Reduziert die Gerätestruktur auf die Felder, die die Integration auswertet.
+
+    Die Konfiguration wird im Speicher gehalten und im Cache abgelegt; Beschreibungen,
+    Metadaten usw. der Geräte werden daher gar nicht erst übernommen.
+
+    Args:
+        config: Die Antwort von `/site/configuration`.
+
+    Returns:
+        {"energyFlow": {"dataPoints": {dp_id: {...}}},
+         "things": {thing_id: {"type": ..., "dataPoints": {dp_id: {...}}}}}
+    """
+    if not isinstance(config, dict):
+        config = {}
+    things: Dict[str, Any] = {}
+    for thing_id, thing_data in (config.get("things") or {}).items():
+        if not isinstance(thing_data, dict):
+            continue
+        things[thing_id] = {
+            "type": thing_data.get("type", "Unknown"),
+            "dataPoints": _extract_datapoints(thing_data.get("dataPoints")),
+        }
+    # Die Datenpunkte des Energieflusses der Site (Erzeugung, Verbrauch, Netz, Speicher)
+    # gehören zu keinem Gerät; sie werden für die abgeleiteten Kennzahlen benötigt.
+    energy_flow = config.get("energyFlow")
+    flow_datapoints = _extract_datapoints(
+        energy_flow.get("dataPoints") if isinstance(energy_flow, dict) else None
+    )
+    return {"energyFlow": {"dataPoints": flow_datapoints}, "things": things}
+
+
+class _Response:
+    """Nimmt die Größe der Antwort einer gemessenen Anfrage auf."""
+
+    __slots__ = ("nbytes",)
+
+    def __init__(self) -> None:
+        """Initialisiert eine leere Messung."""
+        self.nbytes: int = 0
+
+
+class BeaamTransport:
+    """Schnittstelle für den Zugriff auf ein BEAAM Gateway."""
+
+    # Gibt an, ob die Umsetzung grundsätzlich Push-Nachrichten unterstützt.
+    supports_push: bool = False
+
+    async def async_get_configuration(
+        self, etag: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Ruft die Gerätestruktur ab.
+
+        Args:
+            etag: Das zuletzt bekannte ETag. Ist es gesetzt und die Konfiguration
+                unverändert, wird None als Konfiguration zurückgegeben.
+
+        Returns:
+            Ein Tupel aus Konfiguration (None bei "304 Not Modified") und ETag.
+        """
+        raise NotImplementedError
+
+    async def async_get_site_state(self) -> List[StateItem]:
+        """Ruft den globalen Site-Status ab und gibt die Zustände des Energieflusses zurück."""
+        raise NotImplementedError
+
+    async def async_get_thing_states(self, thing_id: str) -> List[StateItem]:
+        """Ruft die Zustände aller Datenpunkte eines Geräts ab.
+
+        Args:
+            thing_id: Die ID des Geräts.
+        """
+        raise NotImplementedError
+
+    async def async_send_commands(self, thing_id: str, commands: List[Dict[str, Any]]) -> None:
+        """Sendet eine Liste von Befehlen ({"key", "value"}) an ein Gerät.
+
+        Args:
+            thing_id: Die ID des Zielgeräts.
+            commands: Die zu sendenden Befehle.
+        """
+        raise NotImplementedError
+
+    async def async_probe_push(self) -> bool:
+        """Prüft, ob das Gateway den Push-Kanal anbietet."""
+        return False
+
+    async def async_listen(self, on_message: Callable[[List[StateItem], bool], None]) -> None:
+        """Empfängt Push-Nachrichten, bis die Verbindung endet.
+
+        Args:
+            on_message: Wird je Nachricht mit den enthaltenen Zuständen aufgerufen; das
+                zweite Argument gibt an, ob es sich um den Energiefluss der Site handelt.
+        """
+        raise NotImplementedError
+
+
+class BeaamPollingTransport(BeaamTransport):
+    """Greift per HTTP-Abfragen auf das Gateway zu."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        host_limit: AsyncContextManager[Any],
+        ip: str,
+        key: str,
+        metrics: Optional[GatewayMetrics] = None,
+    ) -> None:
+        """Initialisiert den Transport.
+
+        Args:
+            session: Die gemeinsame HTTP-Session.
+            host_limit: Begrenzt die gleichzeitigen Anfragen an das Gateway (wie eine Semaphore).
+            ip: Die IP-Adresse (oder Host:Port) des Gateways.
+            key: Der Local-API-Key für die Authentifizierung.
+            metrics: Sammlung, in der Antwortzeiten, Fehler und Bytes je Anfrage erfasst werden.
+        """
+        self.session = session
+        self.metrics = metrics if metrics is not None else GatewayMetrics()
+        self._host_limit = host_limit
+        self.base_url = f"http://{ip}"
+        self._headers: Dict[str, str] = {"Authorization": f"Bearer {key}"}
+
+    @asynccontextmanager
+    async def _observe(self, endpoint: str, thing_id: Optional[str] = None) -> AsyncIterator[_Response]:
+        """Misst eine Anfrage und erfasst Dauer, Antwortgröße bzw. Fehler in den Kennzahlen.
+
+        Wird innerhalb der Semaphore betreten, damit die Wartezeit auf einen freien
+        Verbindungsplatz nicht als Antwortzeit des Gateways zählt.
+
+        Args:
+            endpoint: Der Name des Endpunkts (z.B. "thing_states").
+            thing_id: Das abgefragte Gerät (falls zutreffend).
+        """
+        response = _Response()
+        start = time.perf_counter()
+        try:
+            yield response
+        except Exception as err:
+            self.metrics.record_failure(endpoint, err, thing_id)
+            raise
+        self.metrics.record_success(endpoint, time.perf_counter() - start, response.nbytes, thing_id)
+
+    async def async_get_configuration(
+        self, etag: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Ruft die Gerätestruktur ab (siehe BeaamTransport)."""
+        headers = dict(self._headers)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        # Längeres Timeout für den Konfigurationsabruf
+        async with self._host_limit, self._observe("configuration") as measured, async_timeout.timeout(10):
+            async with self.session.get(
+                f"{self.base_url}/api/v1/site/configuration", headers=headers
+            ) as resp:
+                if resp.status == 401:
+                    raise BeaamAuthError("Lokaler BEAAM API Key ist ungültig oder abgewiesen.")
+                if resp.status == 304:
+                    return None, etag
+
+                resp.raise_for_status()
+                body = await resp.read()
+                measured.nbytes = len(body)
+                return extract_configuration(decode_object(body)), resp.headers.get("ETag")
+
+    async def async_get_site_state(self) -> List[StateItem]:
+        """Ruft den globalen Site-Status ab (siehe BeaamTransport)."""
+        async with self._host_limit, self._observe("site_state") as measured, async_timeout.timeout(
+            LOCAL_REQUEST_TIMEOUT
+        ):
+            async with self.session.get(
+                f"{self.base_url}/api/v1/site/state", headers=self._headers
+            ) as resp:
+                if resp.status == 401:
+                    raise BeaamAuthError("Lokaler BEAAM API Key ist ungültig.")
+                resp.raise_for_status()
+                body = await resp.read()
+                measured.nbytes = len(body)
+                # Verwendet wird nur der Energiefluss ("energyFlow"), der Rest wird verworfen.
+                energy_flow = decode_object(body).get("energyFlow")
+                if not isinstance(energy_flow, dict):
+                    return []
+                return extract_states(energy_flow.get("states"))
+
+    async def async_get_thing_states(self, thing_id: str) -> List[StateItem]:
+        """Ruft die Zustände eines Geräts ab (siehe BeaamTransport)."""
+        # Wir geben einzelnen Geräten einen kurzen Timeout (LOCAL_REQUEST_TIMEOUT, 5 Sekunden).
+        # Wenn ein Gerät im rs485 Bus hängt, soll es nicht den Rest blockieren.
+        # Die Wartezeit auf einen freien Verbindungsplatz zählt nicht zum Timeout.
+        async with self._host_limit, self._observe("thing_states", thing_id) as measured, async_timeout.timeout(
+            LOCAL_REQUEST_TIMEOUT
+        ):
+            async with self.session.get(
+                f"{self.base_url}/api/v1/things/{thing_id}/states", headers=self._headers
+            ) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+                measured.nbytes = len(body)
+                return extract_states(decode_object(body).get("states"))
+
+    async def async_send_commands(self, thing_id: str, commands: List[Dict[str, Any]]) -> None:
+        """Sendet Befehle an ein Gerät (siehe BeaamTransport)."""
+        # Die BEAAM API erwartet eine Liste von Befehlen als JSON Array
+        async with self._host_limit, self._observe("commands", thing_id), async_timeout.timeout(10):
+            async with self.session.post(
+                f"{self.base_url}/api/v1/things/{thing_id}/commands",
+                headers=self._headers,
+                json=commands,
+            ) as resp:
+                resp.raise_for_status()
+
+
+class BeaamPushTransport(BeaamPollingTransport):
+    """Wie BeaamPollingTransport, zusätzlich mit Push-Kanal (Server-Sent Events).
+
+    Abfragen und Befehle laufen weiterhin per HTTP; der Push-Kanal liefert neue
+    Werte ohne Polling. Die dauerhafte Verbindung belegt keinen Platz in der
+    Semaphore des Gateways, da sie die regulären Abfragen sonst blockieren würde.
+    """
+
+    supports_push = True
+
+    async def async_probe_push(self) -> bool:
+        """Prüft, ob das Gateway den Push-Kanal anbietet (siehe BeaamTransport)."""
+        headers = {**self._headers, "Accept": "text/event-stream"}
+        try:
+            async with async_timeout.timeout(5):
+                async with self.session.get(f"{self.base_url}{STREAM_PATH}", headers=headers) as resp:
+                    return resp.status == 200 and resp.content_type == "text/event-stream"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            LOGGER.debug("BEAAM Push-Kanal nicht erreichbar: %s", err)
+            return False
+
+    async def async_listen(self, on_message: Callable[[List[StateItem], bool], None]) -> None:
+        """Empfängt Push-Nachrichten, bis die Verbindung endet (siehe BeaamTransport).
+
+        Raises:
+            BeaamAuthError: Wenn der API Key abgewiesen wird.
+            aiohttp.ClientError: Bei Verbindungsfehlern oder wenn das Gateway länger
+                als PUSH_IDLE_TIMEOUT Sekunden nichts sendet (auch keine Keep-Alives).
+        """
+        headers = {**self._headers, "Accept": "text/event-stream"}
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=PUSH_IDLE_TIMEOUT)
+        async with self.session.get(
+            f"{self.base_url}{STREAM_PATH}", headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status == 401:
+                raise BeaamAuthError("Lokaler BEAAM API Key ist ungültig.")
+            resp.raise_for_status()
+
+            # Server-Sent Events: "data:" Zeilen werden gesammelt, eine Leerzeile
+            # schließt die Nachricht ab. Zeilen mit ":" am Anfang sind Keep-Alives.
+            data_lines: List[str] = []
+            async for raw_line in resp.content:
+                self.metrics.record_stream_bytes(len(raw_line))
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                elif not line and data_lines:
+                    payload = "\n".join(data_lines)
+                    data_lines = []
+                    try:
+                        message = json_loads(payload)
+                    except ValueError:
+                        LOGGER.debug("Ungültige BEAAM Push-Nachricht verworfen: %s", payload[:200])
+                        continue
+                    if not isinstance(message, dict):
+                        continue
+                    energy_flow = message.get("energyFlow")
+                    if isinstance(energy_flow, dict) and "states" in energy_flow:
+                        on_message(extract_states(energy_flow["states"]), True)
+                    if "states" in message:
+                        on_message(extract_states(message["states"]), False)
+
+
+def create_transport(
+    session: aiohttp.ClientSession,
+    host_limit: AsyncContextManager[Any],
+    ip: str,
+    key: str,
+    mode: str,
+    metrics: Optional[GatewayMetrics] = None,
+) -> BeaamTransport:
+    """Erzeugt den Transport für die gewählte Betriebsart.
+
+    Args:
+        session: Die gemeinsame HTTP-Session.
+        host_limit: Begrenzt die gleichzeitigen Anfragen an das Gateway (wie eine Semaphore).
+        ip: Die IP-Adresse des Gateways.
+        key: Der Local-API-Key.
+        mode: TRANSPORT_AUTO (Push, falls verfügbar) oder TRANSPORT_POLLING.
+        metrics: Sammlung für die Kennzahlen der Anfragen.
+    """
+    if mode == TRANSPORT_POLLING:
+        return BeaamPollingTransport(session, host_limit, ip, key, metrics)
+    return BeaamPushTransport(session, host_limit, ip, key, metrics)
@@ -0,0 +1,266 @@
+"""Zuordnung der BEAAM Einheiten zu Home Assistant Einheiten und Klassen.
+
+Das Gateway liefert je Datenpunkt nur eine Einheit als Text (z.B. "kWh") und den
+Schlüssel (z.B. "ENERGY_IMPORTED"). Welche Home Assistant Einheit, Device Class und
+State Class daraus folgt, ist hier als Tabelle hinterlegt statt als Abfolge von
+Bedingungen. Eine neue Einheit zu unterstützen ist damit eine Änderung der Daten:
+eine Zeile in `UNIT_MAPPINGS` oder, für herstellerspezifische Einheiten, ein Eintrag
+in den Optionen der Integration ("Eigene Einheiten").
+
+Die Auflösung (Einheit, Schlüssel) -> Zuordnung wird je `UnitMapper` zwischengespeichert,
+da sich dieselben Kombinationen über alle Geräte einer Anlage vielfach wiederholen.
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
+
+from homeassistant.components.number import NumberDeviceClass, NumberMode
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfApparentPower,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfFrequency,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+from .const import LOGGER
+
+# Blindleistung: Home Assistant kennt "var" als Einheit der Device Class REACTIVE_POWER.
+# Als Text angegeben, da die zugehörige Enum erst in neueren Versionen existiert.
+VOLT_AMPERE_REACTIVE: str = "var"
+
+
+class UnitMapping(NamedTuple):
+    """Home Assistant Einheit und Klassen, die einer BEAAM Einheit entsprechen."""
+
+    # Einheit in Home Assistant (None = einheitenlos)
+    unit: Optional[str]
+    # Device Class für Sensoren
+    device_class: Optional[SensorDeviceClass]
+    # Langzeit-Aufzeichnungsverhalten (Statistics) für Sensoren
+    state_class: Optional[SensorStateClass]
+    # Device Class für Number-Entitäten
+    number_device_class: Optional[NumberDeviceClass] = None
+
+
+class KeyOverride(NamedTuple):
+    """Überschreibt Klassen für Datenpunkte, deren Schlüssel ein Muster enthält."""
+
+    # Teilstring des Schlüssels, z.B. "SOC"
+    pattern: str
+    # Nur für diese BEAAM Einheiten anwenden (None = für alle)
+    units: Optional[FrozenSet[str]]
+    # Zu setzende Klassen (None = nicht überschreiben)
+    device_class: Optional[SensorDeviceClass] = None
+    state_class: Optional[SensorStateClass] = None
+
+
+class NumberRange(NamedTuple):
+    """Grenzen, Schrittweite und Darstellung einer Number-Entität."""
+
+    min_value: float
+    max_value: float
+    step: float
+    mode: NumberMode
+
+
+_POWER = (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, NumberDeviceClass.POWER)
+_ENERGY = (SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, NumberDeviceClass.ENERGY)
+
+# BEAAM Einheit -> Home Assistant Einheit und Klassen.
+UNIT_MAPPINGS: Mapping[str, UnitMapping] = MappingProxyType({
+    # Leistung (Power)
+    "W": UnitMapping(UnitOfPower.WATT, *_POWER),
+    "kW": UnitMapping(UnitOfPower.KILO_WATT, *_POWER),
+    "MW": UnitMapping(UnitOfPower.MEGA_WATT, *_POWER),
+    "GW": UnitMapping(UnitOfPower.GIGA_WATT, *_POWER),
+    # Schein- und Blindleistung
+    "VA": UnitMapping(
+        UnitOfApparentPower.VOLT_AMPERE, SensorDeviceClass.APPARENT_POWER,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.APPARENT_POWER,
+    ),
+    "var": UnitMapping(
+        VOLT_AMPERE_REACTIVE, SensorDeviceClass.REACTIVE_POWER,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.REACTIVE_POWER,
+    ),
+    "VAr": UnitMapping(
+        VOLT_AMPERE_REACTIVE, SensorDeviceClass.REACTIVE_POWER,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.REACTIVE_POWER,
+    ),
+    # Energie (Energy)
+    "Wh": UnitMapping(UnitOfEnergy.WATT_HOUR, *_ENERGY),
+    "kWh": UnitMapping(UnitOfEnergy.KILO_WATT_HOUR, *_ENERGY),
+    "MWh": UnitMapping(UnitOfEnergy.MEGA_WATT_HOUR, *_ENERGY),
+    "GWh": UnitMapping(UnitOfEnergy.GIGA_WATT_HOUR, *_ENERGY),
+    # Elektrische Werte
+    "V": UnitMapping(
+        UnitOfElectricPotential.VOLT, SensorDeviceClass.VOLTAGE,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.VOLTAGE,
+    ),
+    "A": UnitMapping(
+        UnitOfElectricCurrent.AMPERE, SensorDeviceClass.CURRENT,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.CURRENT,
+    ),
+    "Hz": UnitMapping(
+        UnitOfFrequency.HERTZ, SensorDeviceClass.FREQUENCY,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.FREQUENCY,
+    ),
+    # Temperatur
+    "°C": UnitMapping(
+        UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.TEMPERATURE,
+    ),
+    "degC": UnitMapping(
+        UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT, NumberDeviceClass.TEMPERATURE,
+    ),
+    # Sonstiges. Steuerbare Prozentwerte sind beim BEAAM Ladegrenzen der Batterie.
+    "%": UnitMapping(PERCENTAGE, None, SensorStateClass.MEASUREMENT, NumberDeviceClass.BATTERY),
+    "s": UnitMapping(UnitOfTime.SECONDS, None, SensorStateClass.MEASUREMENT),
+})
+
+# Texte, mit denen das Gateway "keine Einheit" ausdrückt.
+NO_UNIT: FrozenSet[str] = frozenset({"", "none", "null"})
+
+# Überschreibungen anhand des Schlüssels, in dieser Reihenfolge angewendet.
+KEY_OVERRIDES: Tuple[KeyOverride, ...] = (
+    # SOC steht in der Branche für "State of Charge" (Batteriestand)
+    KeyOverride("SOC", frozenset({"%"}), device_class=SensorDeviceClass.BATTERY),
+    # Energiemengen (produziert/verbraucht) steigen kontinuierlich an, auch ohne Einheit
+    KeyOverride("ENERGY", None, state_class=SensorStateClass.TOTAL_INCREASING),
+)
+
+# Grenzen je BEAAM Einheit für Number-Entitäten.
+NUMBER_RANGES: Mapping[str, NumberRange] = MappingProxyType({
+    # Prozentwerte (Slider 0-100)
+    "%": NumberRange(0, 100, 1, NumberMode.SLIDER),
+    # Leistungswerte in Watt (Eingabebox für präzise Werte, auch negativ).
+    # Standardgrenzwerte für übliche Heimsysteme (+/- 20kW)
+    "W": NumberRange(-20000, 20000, 100, NumberMode.BOX),
+})
+# Fallback für alle anderen Einheiten (Standard: Eingabebox)
+DEFAULT_NUMBER_RANGE = NumberRange(0, 100000, 1, NumberMode.BOX)
+
+
+class UnitMapper:
+    """Löst BEAAM Einheiten über die Tabelle (plus eigene Einheiten) auf, mit Zwischenspeicher."""
+
+    def __init__(self, custom_units: Optional[Mapping[str, UnitMapping]] = None) -> None:
+        """Initialisiert den Mapper.
+
+        Args:
+            custom_units: Zusätzliche bzw. abweichende Zuordnungen (z.B. aus den Optionen).
+                Sie haben Vorrang vor `UNIT_MAPPINGS`.
+        """
+        self._units: Mapping[str, UnitMapping] = MappingProxyType({**UNIT_MAPPINGS, **(custom_units or {})})
+        # Der Zwischenspeicher gehört zur Instanz, da eigene Einheiten je Eintrag abweichen können.
+        self.resolve: Callable[[str, str], UnitMapping] = lru_cache(maxsize=1024)(self._resolve)
+
+    def _resolve(self, unit_raw: str, key: str) -> UnitMapping:
+        """Bestimmt Einheit und Klassen eines Datenpunkts.
+
+        Args:
+            unit_raw: Die Einheit, wie sie das Gateway liefert.
+            key: Der Schlüssel des Datenpunkts (für die Überschreibungen).
+
+        Returns:
+            Die Home Assistant Einheit und Klassen.
+        """
+        mapping = self._units.get(unit_raw)
+        if mapping is None:
+            if unit_raw.lower() in NO_UNIT:
+                # Zahl ohne Einheit oder Text-Status: keine Statistik
+                mapping = UnitMapping(None, None, None)
+            else:
+                # Unbekannte Einheit: roher Text, aber als Messwert aufzeichnen
+                mapping = UnitMapping(unit_raw, None, SensorStateClass.MEASUREMENT)
+
+        for override in KEY_OVERRIDES:
+            if override.pattern not in key:
+                continue
+            if override.units is not None and unit_raw not in override.units:
+                continue
+            mapping = mapping._replace(
+                device_class=override.device_class or mapping.device_class,
+                state_class=override.state_class or mapping.state_class,
+            )
+        return mapping
+
+    @staticmethod
+    def number_range(unit_raw: str) -> NumberRange:
+        """Gibt Grenzen, Schrittweite und Darstellung einer Number-Entität zurück."""
+        return NUMBER_RANGES.get(unit_raw, DEFAULT_NUMBER_RANGE)
+
+
+# Gemeinsamer Mapper aller Einträge ohne eigene Einheiten.
+DEFAULT_UNIT_MAPPER = UnitMapper()
+
+
+def parse_custom_units(text: Optional[str]) -> Dict[str, UnitMapping]:
+    """Liest eigene Einheiten aus dem Options-Text.
+
+    Einträge werden durch ";" oder Zeilenumbrüche getrennt und haben die Form
+    `BEAAM-Einheit=HA-Einheit[:device_class[:state_class]]`, z.B.
+    `degF=°F:temperature; m3=m³:gas:total_increasing`.
+    Ohne State Class wird ein Messwert (measurement) angenommen.
+
+    Args:
+        text: Der Text aus den Optionen (leer oder None = keine eigenen Einheiten).
+
+    Returns:
+        Die Zuordnungen je BEAAM Einheit.
+
+    Raises:
+        ValueError: Wenn ein Eintrag nicht dem Format entspricht oder eine
+            unbekannte Device Class bzw. State Class enthält.
+    """
+    result: Dict[str, UnitMapping] = {}
+    for entry in (text or "").replace("\n", ";").split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        raw, sep, target = entry.partition("=")
+        raw = raw.strip()
+        if not sep or not raw:
+            raise ValueError(f"Ungültiger Eintrag '{entry}'")
+
+        parts = [part.strip() for part in target.split(":")]
+        if len(parts) > 3:
+            raise ValueError(f"Ungültiger Eintrag '{entry}'")
+        unit = parts[0] or None
+        device_class = SensorDeviceClass(parts[1].lower()) if len(parts) > 1 and parts[1] else None
+        state_class = (
+            SensorStateClass(parts[2].lower()) if len(parts) > 2 and parts[2] else SensorStateClass.MEASUREMENT
+        )
+        # Number-Entitäten übernehmen die Device Class, sofern es sie dort gibt
+        number_device_class: Optional[NumberDeviceClass] = None
+        if device_class is not None:
+            try:
+                number_device_class = NumberDeviceClass(device_class.value)
+            except ValueError:
+                pass
+        result[raw] = UnitMapping(unit, device_class, state_class, number_device_class)
+    return result
+
+
+def unit_mapper_from_option(text: Optional[str]) -> UnitMapper:
+    """Erzeugt den Mapper für den Options-Text (ohne eigene Einheiten den gemeinsamen Mapper).
+
+    Der Text wird bereits beim Speichern der Optionen geprüft. Ist er dennoch ungültig
+    (z.B. von Hand geändert), werden die eigenen Einheiten ignoriert.
+
+    Args:
+        text: Der Text aus den Optionen.
+    """
+    try:
+        custom_units = parse_custom_units(text)
+    except ValueError as err:
+        LOGGER.warning("Eigene Einheiten werden ignoriert: %s", err)
+        return DEFAULT_UNIT_MAPPER
+    return UnitMapper(custom_units) if custom_units else DEFAULT_UNIT_MAPPER
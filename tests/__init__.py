@@ -0,0 +1 @@
+"""Tests der neoom Integration."""
@@ -0,0 +1,122 @@
+"""Gemeinsame Hilfen der Tests: Test-Gateway im Speicher und Warten auf Hintergrundabläufe."""
+
+import asyncio
+import copy
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Gerätestruktur des Test-Gateways (bereits auf die ausgewerteten Felder reduziert,
+# wie sie BeaamTransport liefert): ein Wechselrichter mit steuerbarem Grenzwert und ein
+# Zähler, beide in der schnellen Stufe, sowie die Netzleistung im Energiefluss.
+FAKE_CONFIG: Dict[str, Any] = {
+    "energyFlow": {
+        "dataPoints": {
+            "flow-grid": {"key": "POWER_GRID", "dataType": "NUMBER", "unitOfMeasure": "W"},
+        }
+    },
+    "things": {
+        "inverter": {
+            "type": "INVERTER",
+            "dataPoints": {
+                "inverter-power": {"key": "POWER", "dataType": "NUMBER", "unitOfMeasure": "W"},
+                "inverter-limit": {
+                    "key": "MAX_POWER_CHARGE",
+                    "dataType": "NUMBER",
+                    "controllable": True,
+                    "unitOfMeasure": "W",
+                },
+            },
+        },
+        "meter": {
+            "type": "ELECTRICITY_METER",
+            "dataPoints": {
+                "meter-power": {"key": "POWER", "dataType": "NUMBER", "unitOfMeasure": "W"},
+            },
+        },
+    },
+}
+
+
+class FakeTransport:
+    """Test-Gateway im Speicher mit der Schnittstelle von BeaamTransport (siehe transport.py).
+
+    Anders als `tools/fake_beaam.py` läuft es ohne HTTP-Server; Antworten, Fehler und
+    hängende Anfragen lassen sich je Gerät gezielt steuern.
+    """
+
+    def __init__(self) -> None:
+        self.supports_push = False
+        self.config: Dict[str, Any] = copy.deepcopy(FAKE_CONFIG)
+        # Aktuelle Werte je Datenpunkt-ID.
+        self.values: Dict[str, Any] = {
+            "flow-grid": 100.0,
+            "inverter-power": 1000.0,
+            "inverter-limit": 500.0,
+            "meter-power": 200.0,
+        }
+        # Anzahl der Anfragen je Endpunkt bzw. Gerät.
+        self.requests: Counter = Counter()
+        # Geräte (bzw. "site"), deren Abfrage fehlschlägt bzw. nie antwortet.
+        self.failing: Set[str] = set()
+        self.hanging: Set[str] = set()
+        # Gesendete Befehle; ist `command_error` gesetzt, schlägt das Senden fehl.
+        self.commands: List[Tuple[str, List[Dict[str, Any]]]] = []
+        self.command_error: Optional[BaseException] = None
+        # Push-Kanal: je Verbindung eine Liste von Nachrichten (Zustände, Energiefluss?)
+        # oder eine Ausnahme. Sind alle verbraucht, bleibt die letzte Verbindung offen.
+        self.push_sessions: List[Any] = []
+
+    def _states(self, dp_ids: Any) -> List[Tuple[str, Any, Optional[str]]]:
+        return [(dp_id, self.values[dp_id], None) for dp_id in dp_ids]
+
+    async def _respond(self, name: str) -> None:
+        self.requests[name] += 1
+        if name in self.hanging:
+            await asyncio.Event().wait()
+        if name in self.failing:
+            raise asyncio.TimeoutError()
+
+    async def async_get_configuration(
+        self, etag: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        self.requests["configuration"] += 1
+        return copy.deepcopy(self.config), None
+
+    async def async_get_site_state(self) -> List[Tuple[str, Any, Optional[str]]]:
+        await self._respond("site")
+        return self._states(self.config["energyFlow"]["dataPoints"])
+
+    async def async_get_thing_states(self, thing_id: str) -> List[Tuple[str, Any, Optional[str]]]:
+        await self._respond(thing_id)
+        return self._states(self.config["things"][thing_id]["dataPoints"])
+
+    async def async_send_commands(self, thing_id: str, commands: List[Dict[str, Any]]) -> None:
+        self.commands.append((thing_id, commands))
+        if self.command_error is not None:
+            raise self.command_error
+        by_key = {
+            dp_data["key"]: dp_id
+            for dp_id, dp_data in self.config["things"][thing_id]["dataPoints"].items()
+        }
+        for command in commands:
+            self.values[by_key[command["key"]]] = command["value"]
+
+    async def async_probe_push(self) -> bool:
+        return self.supports_push
+
+    async def async_listen(self, on_message: Callable[[List[Any], bool], None]) -> None:
+        self.requests["listen"] += 1
+        if not self.push_sessions:
+            await asyncio.Event().wait()
+        session = self.push_sessions.pop(0)
+        if isinstance(session, BaseException):
+            raise session
+        for states, energy_flow in session:
+            on_message(states, energy_flow)
+
+
+async def wait_until(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    """Wartet, bis eine Bedingung erfüllt ist (für Abläufe im Hintergrund)."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
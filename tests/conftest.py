@@ -0,0 +1,85 @@
+"""Gemeinsame Einrichtung der Tests.
+
+Das Paket wird als `neoom` registriert, ohne `__init__.py` auszuführen (das Home
+Assistant importiert); die Module werden dann wie gewohnt importiert, z.B.
+`from neoom.health import ...`. Tests der Module mit Home Assistant überspringen
+sich selbst, wenn Home Assistant nicht installiert ist.
+"""
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+import pytest
+
+from .common import FakeTransport
+
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "neoom"
+
+if "neoom" not in sys.modules:
+    _package = types.ModuleType("neoom")
+    _package.__path__ = [str(_PACKAGE_DIR)]
+    sys.modules["neoom"] = _package
+
+
+@pytest.fixture
+def run_in_hass(tmp_path: Path) -> Callable[[Callable[[Any], Awaitable[None]]], None]:
+    """Führt ein Szenario mit einer minimalen Home Assistant Instanz (ohne Integrationen) aus.
+
+    Wie in `tools/bench_coordinator.py` wird keine Integration geladen; die Tests
+    erzeugen Koordinatoren und Hilfsklassen direkt.
+    """
+    pytest.importorskip("homeassistant")
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import frame
+
+    def run(scenario: Callable[[Any], Awaitable[None]]) -> None:
+        async def main() -> None:
+            try:
+                hass = HomeAssistant(str(tmp_path))
+            except TypeError:
+                # Ältere Versionen erwarten das Konfigurationsverzeichnis als Attribut.
+                hass = HomeAssistant()  # type: ignore[call-arg]
+                hass.config.config_dir = str(tmp_path)
+            if hasattr(frame, "async_setup"):
+                frame.async_setup(hass)
+            try:
+                await scenario(hass)
+            finally:
+                await hass.async_stop(force=True)
+
+        asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def make_coordinator() -> Callable[..., Any]:
+    """Erzeugt lokale Koordinatoren, die statt des Gateways einen FakeTransport ansprechen.
+
+    Ohne weitere Angaben: feste Intervalle (keine adaptive Abfrage) und kein schneller
+    Pfad, d.h. der reguläre Zyklus liest auch den Site-Status.
+    """
+    pytest.importorskip("homeassistant")
+    from neoom.const import TRANSPORT_POLLING
+    from neoom.coordinator import NeoomLocalCoordinator
+
+    def make(hass: Any, transport: Optional[FakeTransport] = None, **options: Any) -> Any:
+        coordinator = NeoomLocalCoordinator(
+            hass,
+            entry_id="test",
+            ip="127.0.0.1",
+            key="test-key",
+            **{
+                "transport_mode": TRANSPORT_POLLING,
+                "flow_interval": 0,
+                "adaptive_polling": False,
+                **options,
+            },
+        )
+        coordinator.transport = transport if transport is not None else FakeTransport()
+        return coordinator
+
+    return make
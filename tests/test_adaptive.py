@@ -0,0 +1,51 @@
+"""Tests des adaptiven Abfrage-Intervalls."""
+
+from neoom.adaptive import AdaptivePollController
+from neoom.const import ADAPTIVE_FACTOR_MAX, ADAPTIVE_FACTOR_MIN
+
+
+def test_failures_back_off_up_to_max_factor() -> None:
+    controller = AdaptivePollController()
+    assert controller.record(0.1, 0.5, failed=True) == 2.0
+    for _ in range(10):
+        controller.record(0.1, 0.5, failed=True)
+    assert controller.factor == ADAPTIVE_FACTOR_MAX
+
+
+def test_slow_gateway_backs_off() -> None:
+    controller = AdaptivePollController()
+    assert controller.record(3.0, 0.5, failed=False) == 2.0
+
+
+def test_idle_site_grows_slowly() -> None:
+    controller = AdaptivePollController()
+    assert controller.record(0.1, 0.0, failed=False) == 1.25
+    for _ in range(50):
+        controller.record(0.1, 0.0, failed=False)
+    assert controller.factor == ADAPTIVE_FACTOR_MAX
+
+
+def test_active_site_speeds_up_down_to_min_factor() -> None:
+    controller = AdaptivePollController()
+    assert controller.record(0.1, 1.0, failed=False) == 0.8
+    for _ in range(50):
+        controller.record(0.1, 1.0, failed=False)
+    assert controller.factor == ADAPTIVE_FACTOR_MIN
+
+
+def test_moderate_activity_returns_towards_one() -> None:
+    controller = AdaptivePollController()
+    controller.record(0.1, 0.1, failed=True)
+    assert controller.record(0.1, 0.1, failed=False) == 1.75
+
+
+def test_cycle_without_things_keeps_factor() -> None:
+    controller = AdaptivePollController()
+    assert controller.record(0.1, None, failed=False) == 1.0
+    assert controller.record(0.1, None, failed=True) == 2.0
+
+
+def test_disabled_controller_keeps_factor_one() -> None:
+    controller = AdaptivePollController(enabled=False)
+    assert controller.record(5.0, 0.0, failed=True) == 1.0
+    assert controller.min_factor == 1.0
@@ -0,0 +1,116 @@
+"""Tests der Bündelung von Steuerungsbefehlen."""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+from neoom.commands import CommandBatcher  # noqa: E402
+
+Commands = List[Dict[str, Any]]
+
+
+class _Gateway:
+    """Nimmt gesendete Stapel auf; einzelne Things können fehlschlagen."""
+
+    def __init__(self) -> None:
+        self.sent: List[Tuple[str, Commands]] = []
+        self.batches: List[List[str]] = []
+        self.failing: set = set()
+
+    async def send(self, thing_id: str, commands: Commands) -> None:
+        self.sent.append((thing_id, commands))
+        if thing_id in self.failing:
+            raise ConnectionError("Gateway nicht erreichbar")
+
+    async def after_batch(self, thing_ids: List[str]) -> None:
+        self.batches.append(sorted(thing_ids))
+
+
+def test_commands_are_coalesced_per_thing(run_in_hass) -> None:
+    async def scenario(hass) -> None:
+        gateway = _Gateway()
+        batcher = CommandBatcher(hass, gateway.send, gateway.after_batch, delay=0.01)
+        await asyncio.gather(
+            batcher.async_send("a", "TARGET_POWER", 1),
+            batcher.async_send("a", "TARGET_POWER", 2),
+            batcher.async_send("a", "MODE", "AUTO"),
+            batcher.async_send("b", "TARGET_POWER", 3),
+        )
+        assert sorted(gateway.sent) == [
+            ("a", [{"key": "TARGET_POWER", "value": 2}, {"key": "MODE", "value": "AUTO"}]),
+            ("b", [{"key": "TARGET_POWER", "value": 3}]),
+        ]
+        assert gateway.batches == [["a", "b"]]
+
+    run_in_hass(scenario)
+
+
+def test_command_queued_during_batch_is_sent_afterwards(run_in_hass) -> None:
+    async def scenario(hass) -> None:
+        sent: List[Commands] = []
+        posting = asyncio.Event()
+        release = asyncio.Event()
+
+        async def send(thing_id: str, commands: Commands) -> None:
+            sent.append(commands)
+            posting.set()
+            if len(sent) == 1:
+                await release.wait()
+
+        async def after_batch(thing_ids: List[str]) -> None:
+            pass
+
+        batcher = CommandBatcher(hass, send, after_batch, delay=0.01)
+        first = asyncio.ensure_future(batcher.async_send("a", "TARGET_POWER", 1))
+        await asyncio.wait_for(posting.wait(), 1)
+
+        # Der erste Stapel wartet noch auf den POST.
+        second = asyncio.ensure_future(batcher.async_send("a", "TARGET_POWER", 2))
+        await asyncio.sleep(0.05)
+        assert len(sent) == 1
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, second), 1)
+        assert sent == [
+            [{"key": "TARGET_POWER", "value": 1}],
+            [{"key": "TARGET_POWER", "value": 2}],
+        ]
+
+    run_in_hass(scenario)
+
+
+def test_failure_is_raised_only_for_its_thing(run_in_hass) -> None:
+    async def scenario(hass) -> None:
+        gateway = _Gateway()
+        gateway.failing.add("a")
+        batcher = CommandBatcher(hass, gateway.send, gateway.after_batch, delay=0.01)
+        results = await asyncio.gather(
+            batcher.async_send("a", "TARGET_POWER", 1),
+            batcher.async_send("b", "TARGET_POWER", 2),
+            return_exceptions=True,
+        )
+        assert isinstance(results[0], ConnectionError)
+        assert results[1] is None
+        assert gateway.batches == [["b"]]
+
+    run_in_hass(scenario)
+
+
+def test_shutdown_rejects_pending_commands(run_in_hass) -> None:
+    async def scenario(hass) -> None:
+        gateway = _Gateway()
+        batcher = CommandBatcher(hass, gateway.send, gateway.after_batch, delay=0.01)
+        task = asyncio.ensure_future(batcher.async_send("a", "TARGET_POWER", 1))
+        await asyncio.sleep(0)
+        batcher.async_shutdown()
+        with pytest.raises(HomeAssistantError):
+            await task
+        await asyncio.sleep(0.05)
+        assert gateway.sent == []
+
+    run_in_hass(scenario)
@@ -0,0 +1,101 @@
+"""Tests des Options-Flows mit mehreren Gateways und Sites."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+import voluptuous as vol  # noqa: E402
+
+from neoom import config_flow  # noqa: E402
+from neoom.const import (  # noqa: E402
+    CONF_BEAAM_IP,
+    CONF_BEAAM_KEY,
+    CONF_CLOUD_TOKEN,
+    CONF_GATEWAYS,
+    CONF_SCAN_INTERVAL_FAST,
+    CONF_SITE_ID,
+    CONF_SITES,
+)
+from neoom.devices import gateway_id  # noqa: E402
+
+FIRST_GATEWAY = {CONF_BEAAM_IP: "192.168.1.10", CONF_BEAAM_KEY: "key-1"}
+SECOND_GATEWAY = {CONF_BEAAM_IP: "192.168.1.11", CONF_BEAAM_KEY: "key-2"}
+SITE = {CONF_SITE_ID: "site-1", CONF_CLOUD_TOKEN: "token"}
+
+
+def make_flow(gateways, sites=(SITE,)) -> config_flow.NeoomOptionsFlow:
+    entry = MagicMock()
+    entry.entry_id = "test"
+    entry.data = {CONF_GATEWAYS: list(gateways), CONF_SITES: list(sites)}
+    entry.options = {CONF_SCAN_INTERVAL_FAST: 5}
+    flow = config_flow.NeoomOptionsFlow(entry)
+    flow.hass = MagicMock()
+    return flow
+
+
+def updated_data(flow) -> dict:
+    flow.hass.config_entries.async_update_entry.assert_called_once()
+    return flow.hass.config_entries.async_update_entry.call_args.kwargs["data"]
+
+
+def test_menu_offers_removal_only_with_several_entries() -> None:
+    result = asyncio.run(make_flow([FIRST_GATEWAY]).async_step_init())
+    assert result["menu_options"] == ["settings", "add_gateway", "add_site"]
+
+    result = asyncio.run(make_flow([FIRST_GATEWAY, SECOND_GATEWAY], [SITE, SITE]).async_step_init())
+    assert result["menu_options"] == [
+        "settings",
+        "add_gateway",
+        "add_site",
+        "remove_gateway",
+        "remove_site",
+    ]
+
+
+def test_add_gateway_appends_and_keeps_options() -> None:
+    flow = make_flow([FIRST_GATEWAY])
+    result = asyncio.run(flow.async_step_add_gateway(dict(SECOND_GATEWAY)))
+
+    assert updated_data(flow)[CONF_GATEWAYS] == [FIRST_GATEWAY, SECOND_GATEWAY]
+    assert updated_data(flow)[CONF_SITES] == [SITE]
+    assert result["type"] == "create_entry"
+    assert result["data"] == {CONF_SCAN_INTERVAL_FAST: 5}
+
+
+def test_add_gateway_rejects_known_ip() -> None:
+    flow = make_flow([FIRST_GATEWAY])
+    result = asyncio.run(
+        flow.async_step_add_gateway({CONF_BEAAM_IP: "192.168.1.10", CONF_BEAAM_KEY: "other"})
+    )
+
+    assert result["type"] == "form"
+    assert result["errors"] == {CONF_BEAAM_IP: "already_configured"}
+    flow.hass.config_entries.async_update_entry.assert_not_called()
+
+
+def test_remove_gateway_drops_its_devices_and_cache(monkeypatch) -> None:
+    remove_devices = MagicMock()
+    store = MagicMock()
+    store.return_value.async_remove = AsyncMock()
+    monkeypatch.setattr(config_flow, "async_remove_gateway_devices", remove_devices)
+    monkeypatch.setattr(config_flow, "Store", store)
+
+    flow = make_flow([FIRST_GATEWAY, SECOND_GATEWAY])
+    asyncio.run(flow.async_step_remove_gateway({CONF_BEAAM_IP: "192.168.1.11"}))
+
+    assert updated_data(flow)[CONF_GATEWAYS] == [FIRST_GATEWAY]
+    remove_devices.assert_called_once_with(flow.hass, flow._entry, gateway_id(1, "192.168.1.11"))
+    store.return_value.async_remove.assert_awaited_once()
+
+
+def test_remove_gateway_offers_only_additional_gateways() -> None:
+    flow = make_flow([FIRST_GATEWAY, SECOND_GATEWAY])
+    result = asyncio.run(flow.async_step_remove_gateway())
+
+    assert result["type"] == "form"
+    assert result["data_schema"]({CONF_BEAAM_IP: "192.168.1.11"})
+    with pytest.raises(vol.Invalid):
+        result["data_schema"]({CONF_BEAAM_IP: "192.168.1.10"})
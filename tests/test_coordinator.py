@@ -0,0 +1,276 @@
+"""Tests des lokalen Koordinators gegen ein Test-Gateway im Speicher (siehe common.py)."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from neoom import coordinator as coordinator_module  # noqa: E402
+from neoom.const import LISTENER_CONTEXT_CYCLE  # noqa: E402
+from neoom.publish_filter import DeadBand  # noqa: E402
+from neoom.transport import BeaamAuthError  # noqa: E402
+
+from .common import wait_until  # noqa: E402
+
+
+def test_idle_tick_starts_no_cycle(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        await coordinator.async_refresh()
+        transport = coordinator.transport
+        requests = sum(transport.requests.values())
+        cycles = coordinator.metrics.cycles.count
+        notified = []
+        coordinator.async_add_listener(lambda: notified.append(None))
+
+        # Direkt nach dem Zyklus ist weder ein Gerät noch der Site-Status fällig.
+        await coordinator._async_tick()
+        assert sum(transport.requests.values()) == requests
+        assert coordinator.metrics.cycles.count == cycles
+        assert notified == []
+
+        coordinator.async_mark_all_due()
+        await coordinator._async_tick()
+        assert transport.requests["inverter"] == 2
+        assert transport.requests["site"] == 2
+        assert coordinator.metrics.cycles.count == cycles + 1
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_cycle_without_requests_is_not_recorded(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        await coordinator.async_refresh()
+        cycles = coordinator.metrics.cycles.count
+
+        # Alle Geräte pausiert, der Site-Status kommt über den Push-Kanal.
+        now = time.monotonic()
+        for thing_id in ("inverter", "meter"):
+            coordinator.thing_health.record_failure(thing_id, now)
+            coordinator.thing_health.record_failure(thing_id, now)
+        coordinator._push_connected = True
+        coordinator.async_mark_all_due()
+        await coordinator.async_refresh()
+        assert coordinator.metrics.cycles.count == cycles
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_push_reconnects_and_falls_back_to_polling(run_in_hass, make_coordinator, monkeypatch) -> None:
+    monkeypatch.setattr(coordinator_module, "PUSH_RECONNECT_MIN", 0.01)
+
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass, flow_interval=60)
+        transport = coordinator.transport
+        transport.supports_push = True
+        transport.push_sessions = [
+            [([("flow-grid", -300.0, None)], True)],
+            ConnectionResetError("Verbindung getrennt"),
+            [([("flow-grid", -400.0, None)], True)],
+        ]
+        await coordinator.async_refresh()
+        coordinator.async_start_flow_stream()
+
+        # Drei Verbindungen wurden beendet, die vierte bleibt offen.
+        await wait_until(lambda: transport.requests["listen"] == 4)
+        assert coordinator.state_store.get("flow-grid").value == -400.0
+        # Zwischen den Verbindungen übernimmt wieder das Polling des Energieflusses.
+        assert not coordinator.push_connected
+        assert coordinator._flow_unsub is not None
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_push_auth_error_stops_channel_and_starts_reauth(run_in_hass, make_coordinator, monkeypatch) -> None:
+    monkeypatch.setattr(coordinator_module, "PUSH_RECONNECT_MIN", 0.01)
+
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass, flow_interval=60)
+        coordinator.config_entry = MagicMock()
+        transport = coordinator.transport
+        transport.supports_push = True
+        transport.push_sessions = [
+            [([("flow-grid", -300.0, None)], True)],
+            BeaamAuthError("API Key abgewiesen"),
+        ]
+        await coordinator.async_refresh()
+        coordinator.async_start_flow_stream()
+
+        await wait_until(lambda: coordinator._push_task is None)
+        coordinator.config_entry.async_start_reauth.assert_called_once_with(hass)
+        assert transport.requests["listen"] == 2
+        assert not coordinator.push_connected
+        assert coordinator._flow_unsub is not None
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_command_is_shown_optimistically_and_confirmed(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        await coordinator.async_refresh()
+        transport = coordinator.transport
+        slot = coordinator.state_store.slot("inverter-limit")
+        notified = []
+        coordinator.async_add_listener(lambda: notified.append(None), slot)
+
+        send = asyncio.ensure_future(
+            coordinator.async_send_command("inverter", "MAX_POWER_CHARGE", 800.0)
+        )
+        await asyncio.sleep(0)
+        assert coordinator.state_store.values[slot] == 800.0
+        assert notified == [None]
+
+        await send
+        assert transport.commands == [("inverter", [{"key": "MAX_POWER_CHARGE", "value": 800.0}])]
+        # Nur das beschriebene Gerät wird neu gelesen; es bestätigt den Wert.
+        assert transport.requests["inverter"] == 2
+        assert transport.requests["meter"] == 1
+        assert coordinator.state_store.values[slot] == 800.0
+        assert notified == [None]
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_failed_command_is_rolled_back(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        await coordinator.async_refresh()
+        transport = coordinator.transport
+        transport.command_error = ConnectionError("POST fehlgeschlagen")
+        slot = coordinator.state_store.slot("inverter-limit")
+        notified = []
+        coordinator.async_add_listener(lambda: notified.append(None), slot)
+
+        with pytest.raises(ConnectionError):
+            await coordinator.async_send_command("inverter", "MAX_POWER_CHARGE", 800.0)
+        assert coordinator.state_store.values[slot] == 500.0
+        assert notified == [None, None]
+        assert transport.requests["inverter"] == 1
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_reread_after_command_runs_cycle_post_processing(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass, dead_bands={"power": DeadBand(50.0, 0.0)})
+        await coordinator.async_refresh()
+        transport = coordinator.transport
+        slot = coordinator.state_store.slot("inverter-power")
+        target = coordinator.energy_integrator.targets["inverter-power"]
+        sampled_at = target.last_time
+        notified = []
+        coordinator.async_add_listener(lambda: notified.append(None), slot)
+
+        transport.values["inverter-power"] = 1010.0
+        await coordinator.async_send_command("inverter", "MAX_POWER_CHARGE", 800.0)
+        assert coordinator.state_store.values[slot] == 1010.0
+        # Innerhalb des Totbands: gespeichert, aber nicht veröffentlicht.
+        assert notified == []
+        # Der neue Wert ist ein Stützpunkt des Energiezählers.
+        assert target.last_time > sampled_at
+        assert target.last_power == pytest.approx(1.01)
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_listeners_of_changed_datapoints_are_notified(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        transport = coordinator.transport
+        notified = []
+
+        def listen(context) -> None:
+            coordinator.async_add_listener(lambda: notified.append(context), context)
+
+        await coordinator._ensure_config_loaded()
+        store = coordinator.state_store
+        inverter, meter = store.slot("inverter-power"), store.slot("meter-power")
+        for context in (None, LISTENER_CONTEXT_CYCLE, inverter, meter):
+            listen(context)
+
+        # Beim ersten Abruf gibt es nichts zu vergleichen: alle werden benachrichtigt.
+        await coordinator.async_refresh()
+        assert sorted(notified, key=str) == sorted([None, LISTENER_CONTEXT_CYCLE, inverter, meter], key=str)
+
+        notified.clear()
+        transport.values["inverter-power"] = 1500.0
+        coordinator.async_mark_all_due()
+        await coordinator.async_refresh()
+        assert sorted(notified, key=str) == sorted([None, LISTENER_CONTEXT_CYCLE, inverter], key=str)
+
+        # Außerhalb des Zyklus (Push) bleiben die Listener des Zyklus außen vor.
+        notified.clear()
+        coordinator._async_handle_push([("meter-power", 250.0, None)], False)
+        assert sorted(notified, key=str) == sorted([None, meter], key=str)
+
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_all_listeners_are_notified_when_availability_changes(run_in_hass, make_coordinator) -> None:
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        transport = coordinator.transport
+        await coordinator.async_refresh()
+        slot = coordinator.state_store.slot("meter-power")
+        notified = []
+        coordinator.async_add_listener(lambda: notified.append(None), slot)
+
+        # Das Gateway antwortet nicht mehr und es liegen keine gültigen Werte mehr vor.
+        transport.failing.update(("site", "inverter", "meter"))
+        coordinator._has_valid_data = lambda: False
+        coordinator.async_mark_all_due()
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert notified == [None]
+
+        # Nach der Rückkehr ändert sich der Wert nicht, die Erreichbarkeit schon.
+        transport.failing.clear()
+        coordinator.async_mark_all_due()
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert notified == [None, None]
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
+
+
+def test_hanging_thing_does_not_block_the_cycle(run_in_hass, make_coordinator, monkeypatch) -> None:
+    monkeypatch.setattr(coordinator_module, "LOCAL_CYCLE_TIMEOUT", 0.05)
+
+    async def scenario(hass) -> None:
+        coordinator = make_coordinator(hass)
+        transport = coordinator.transport
+        await coordinator.async_refresh()
+        store = coordinator.state_store
+
+        transport.hanging.add("meter")
+        transport.values["inverter-power"] = 1500.0
+        transport.values["meter-power"] = 250.0
+        for _ in range(2):
+            coordinator.async_mark_all_due()
+            await coordinator.async_refresh()
+            # Was bis zur Frist geliefert wurde, wird übernommen; das hängende Gerät
+            # behält seinen letzten Wert.
+            assert coordinator.last_update_success
+            assert store.get("inverter-power").value == 1500.0
+            assert store.get("meter-power").value == 200.0
+
+        # Die abgebrochenen Abfragen zählen als Fehler des Geräts: Es wird pausiert.
+        assert coordinator.thing_health.open_things() == ["meter"]
+        await coordinator.async_shutdown()
+
+    run_in_hass(scenario)
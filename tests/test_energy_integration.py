@@ -0,0 +1,91 @@
+"""Tests der Integration von Leistung zu Energie."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from neoom.energy_integration import PowerIntegrator
+from neoom.state_store import QUALITY_UNAVAILABLE, DataPointStore
+
+
+def _integrator(unit: str = "W") -> PowerIntegrator:
+    integrator = PowerIntegrator(DataPointStore())
+    integrator.configure([SimpleNamespace(dp_id="pv", unit_raw=unit, name="PV")])
+    return integrator
+
+
+def _sample(integrator: PowerIntegrator, value, now: float) -> float:
+    """Liest einen Leistungswert ein und gibt den Zählerstand (kWh) zurück."""
+    store = integrator._store
+    store.apply([("pv", value, None)], set())
+    integrator.sample([store.slot("pv")], now, set())
+    return integrator.targets["pv"].total
+
+
+def test_unknown_unit_is_skipped() -> None:
+    assert _integrator("kWh").targets == {}
+
+
+def test_trapezoid_rule() -> None:
+    integrator = _integrator("W")
+    assert _sample(integrator, 1000, 0.0) == 0.0
+    assert _sample(integrator, 3000, 60.0) == pytest.approx(2.0 / 60)
+    assert _sample(integrator, 3000, 120.0) == pytest.approx(5.0 / 60)
+    store = integrator._store
+    assert store.values[store.slot("energy:pv")] == round(5.0 / 60, 3)
+
+
+def test_gap_restarts_integration() -> None:
+    integrator = _integrator("kW")
+    _sample(integrator, 1.0, 0.0)
+    assert _sample(integrator, 1.0, 1000.0) == 0.0
+    assert _sample(integrator, 1.0, 1036.0) == pytest.approx(0.01)
+
+
+def test_unavailable_value_restarts_integration() -> None:
+    integrator = _integrator("kW")
+    store = integrator._store
+    _sample(integrator, 1.0, 0.0)
+    store.clear(store.slot("pv"), QUALITY_UNAVAILABLE)
+    integrator.sample([store.slot("pv")], 36.0, set())
+    assert _sample(integrator, 1.0, 72.0) == 0.0
+    assert _sample(integrator, 1.0, 108.0) == pytest.approx(0.01)
+
+
+def test_interrupt_restarts_integration() -> None:
+    integrator = _integrator("kW")
+    store = integrator._store
+    _sample(integrator, 1.0, 0.0)
+    integrator.interrupt([store.slot("pv")])
+    assert _sample(integrator, 1.0, 36.0) == 0.0
+
+
+def test_negative_power_counts_as_zero() -> None:
+    integrator = _integrator("kW")
+    _sample(integrator, 1.0, 0.0)
+    assert _sample(integrator, 1.0, 36.0) == pytest.approx(0.01)
+    # Eigenverbrauch in der Nacht oder ein einzelner Ausreißer zählt als 0 und hält
+    # den Zähler nicht dauerhaft an.
+    assert _sample(integrator, -0.01, 72.0) == pytest.approx(0.015)
+    assert _sample(integrator, -5.0, 108.0) == pytest.approx(0.015)
+    assert _sample(integrator, 1.0, 144.0) == pytest.approx(0.02)
+    assert _sample(integrator, 1.0, 180.0) == pytest.approx(0.03)
+
+
+def test_restore_adds_to_running_total() -> None:
+    integrator = _integrator("kW")
+    _sample(integrator, 1.0, 0.0)
+    _sample(integrator, 1.0, 36.0)
+    integrator.restore("pv", 100.0)
+    integrator.restore("unknown", 5.0)
+    store = integrator._store
+    assert integrator.targets["pv"].total == pytest.approx(100.01)
+    assert store.values[store.slot("energy:pv")] == 100.01
+
+
+def test_reconfigure_keeps_totals() -> None:
+    integrator = _integrator("kW")
+    integrator.restore("pv", 7.0)
+    integrator.configure([SimpleNamespace(dp_id="pv", unit_raw="W", name="PV")])
+    assert integrator.targets["pv"].total == 7.0
+    assert integrator.targets["pv"].scale == 0.001
@@ -0,0 +1,52 @@
+"""Tests des Circuit Breakers je Thing."""
+
+from neoom.health import ThingHealthTracker
+
+
+def _tracker() -> ThingHealthTracker:
+    return ThingHealthTracker(failure_threshold=2, backoff_base=30, backoff_max=100)
+
+
+def test_stays_closed_below_threshold() -> None:
+    tracker = _tracker()
+    tracker.record_failure("thing", 0.0)
+    assert tracker.allow("thing", 0.0)
+    assert tracker.open_things() == []
+
+
+def test_opens_at_threshold_and_allows_probe_after_backoff() -> None:
+    tracker = _tracker()
+    tracker.record_failure("thing", 0.0)
+    tracker.record_failure("thing", 0.0)
+    assert tracker.open_things() == ["thing"]
+    assert not tracker.allow("thing", 29.9)
+    # Halb offen: nach Ablauf der Wartezeit ist eine Probe-Abfrage erlaubt.
+    assert tracker.allow("thing", 30.0)
+    assert tracker.allow("other", 0.0)
+
+
+def test_failed_probe_doubles_backoff_up_to_limit() -> None:
+    tracker = _tracker()
+    tracker.record_failure("thing", 0.0)
+    tracker.record_failure("thing", 0.0)
+
+    tracker.record_failure("thing", 30.0)
+    assert not tracker.allow("thing", 89.9)
+    assert tracker.allow("thing", 90.0)
+
+    tracker.record_failure("thing", 90.0)
+    assert not tracker.allow("thing", 189.9)
+    assert tracker.allow("thing", 190.0)
+
+
+def test_successful_probe_closes_breaker() -> None:
+    tracker = _tracker()
+    tracker.record_failure("thing", 0.0)
+    tracker.record_failure("thing", 0.0)
+    tracker.record_success("thing")
+    assert tracker.open_things() == []
+    assert tracker.allow("thing", 0.0)
+
+    # Die Fehler werden neu gezählt.
+    tracker.record_failure("thing", 1.0)
+    assert tracker.allow("thing", 1.0)
@@ -0,0 +1,106 @@
+"""Tests der Kennzahlen aus dem Energiefluss."""
+
+import pytest
+
+from neoom.const import FLOW_KEY_CONSUMPTION, FLOW_KEY_GRID, FLOW_KEY_PRODUCTION, FLOW_KEY_STORAGE
+from neoom.kpi import (
+    KPI_AUTARKY,
+    KPI_BATTERY_EFFICIENCY,
+    KPI_NET_GRID_POWER,
+    KPI_SELF_CONSUMPTION,
+    EnergyKpiCalculator,
+)
+from neoom.state_store import DataPointStore
+
+_CONFIG = {
+    "energyFlow": {
+        "dataPoints": {
+            "dp-production": {"key": FLOW_KEY_PRODUCTION, "unitOfMeasure": "kW"},
+            "dp-consumption": {"key": FLOW_KEY_CONSUMPTION, "unitOfMeasure": "kW"},
+            "dp-grid": {"key": FLOW_KEY_GRID, "unitOfMeasure": "kW"},
+            "dp-storage": {"key": FLOW_KEY_STORAGE, "unitOfMeasure": "kW"},
+        }
+    }
+}
+
+
+def _calculator() -> EnergyKpiCalculator:
+    calculator = EnergyKpiCalculator(DataPointStore())
+    calculator.configure(_CONFIG)
+    return calculator
+
+
+def _flow(calculator: EnergyKpiCalculator, now: float = 0.0, **values: float) -> None:
+    """Übernimmt Werte des Energieflusses (Schlüsselwort = Datenpunkt-ID ohne "dp-")."""
+    changed = set()
+    calculator._store.apply([(f"dp-{key}", value, None) for key, value in values.items()], changed)
+    calculator.update(changed, now, flow_refreshed=True)
+
+
+def _kpi(calculator: EnergyKpiCalculator, key: str):
+    return calculator._store.values[calculator.slots[key]]
+
+
+def test_available_and_units() -> None:
+    calculator = _calculator()
+    assert set(calculator.available()) == {
+        KPI_SELF_CONSUMPTION,
+        KPI_AUTARKY,
+        KPI_NET_GRID_POWER,
+        KPI_BATTERY_EFFICIENCY,
+    }
+    assert calculator.flow_unit(FLOW_KEY_GRID) == "kW"
+    assert EnergyKpiCalculator(DataPointStore()).available() == []
+
+
+def test_export_reduces_self_consumption() -> None:
+    calculator = _calculator()
+    # Netz < 0 = Einspeisung.
+    _flow(calculator, production=4.0, consumption=1.0, grid=-3.0, storage=0.0)
+    assert _kpi(calculator, KPI_SELF_CONSUMPTION) == 25.0
+    assert _kpi(calculator, KPI_AUTARKY) == 100.0
+    assert _kpi(calculator, KPI_NET_GRID_POWER) == -3.0
+
+
+def test_import_reduces_autarky() -> None:
+    calculator = _calculator()
+    # Netz > 0 = Bezug.
+    _flow(calculator, production=1.0, consumption=4.0, grid=3.0, storage=0.0)
+    assert _kpi(calculator, KPI_SELF_CONSUMPTION) == 100.0
+    assert _kpi(calculator, KPI_AUTARKY) == 25.0
+    assert _kpi(calculator, KPI_NET_GRID_POWER) == 3.0
+
+
+def test_no_production_leaves_self_consumption_unknown() -> None:
+    calculator = _calculator()
+    _flow(calculator, production=0.0, consumption=2.0, grid=2.0, storage=0.0)
+    assert _kpi(calculator, KPI_SELF_CONSUMPTION) is None
+    assert _kpi(calculator, KPI_AUTARKY) == 0.0
+
+
+def test_battery_efficiency_from_storage_power() -> None:
+    calculator = _calculator()
+    # Speicher < 0 = Laden, > 0 = Entladen; der Wert gilt bis zum nächsten Abruf.
+    _flow(calculator, 0.0, storage=-2.0)
+    _flow(calculator, 180.0, storage=1.0)
+    _flow(calculator, 360.0, storage=0.0)
+    assert calculator.charged == pytest.approx(0.1)
+    assert calculator.discharged == pytest.approx(0.05)
+    assert _kpi(calculator, KPI_BATTERY_EFFICIENCY) == 50.0
+
+
+def test_storage_gap_is_not_integrated() -> None:
+    calculator = _calculator()
+    _flow(calculator, 0.0, storage=-2.0)
+    _flow(calculator, 3600.0, storage=-2.0)
+    assert calculator.charged == 0.0
+    assert _kpi(calculator, KPI_BATTERY_EFFICIENCY) is None
+
+
+def test_restore_adds_to_running_totals() -> None:
+    calculator = _calculator()
+    calculator.charged = 1.0
+    calculator.restore(9.0, 8.0)
+    assert calculator.charged == 10.0
+    assert calculator.discharged == 8.0
+    assert _kpi(calculator, KPI_BATTERY_EFFICIENCY) == 80.0
@@ -0,0 +1,60 @@
+"""Tests des Latenz-Histogramms."""
+
+from neoom.metrics import LATENCY_BUCKETS, STREAM_ENDPOINT, GatewayMetrics, LatencyHistogram
+
+
+def test_empty_histogram() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.mean is None
+    assert histogram.percentile(0.95) is None
+    assert histogram.as_dict()["mean_ms"] is None
+
+
+def test_bucket_bounds_are_inclusive() -> None:
+    histogram = LatencyHistogram()
+    histogram.observe(0.01)
+    histogram.observe(0.011)
+    histogram.observe(10.0)
+    histogram.observe(12.0)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[1] == 1
+    assert histogram.counts[len(LATENCY_BUCKETS) - 1] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.count == 4
+    assert histogram.max == 12.0
+
+
+def test_percentile_and_dict() -> None:
+    histogram = LatencyHistogram()
+    for _ in range(19):
+        histogram.observe(0.02)
+    histogram.observe(0.3)
+    assert histogram.percentile(0.5) == 0.025
+    assert histogram.percentile(0.95) == 0.025
+    assert histogram.percentile(1.0) == 0.5
+
+    data = histogram.as_dict()
+    assert data["count"] == 20
+    assert data["mean_ms"] == 34.0
+    assert data["max_ms"] == 300.0
+    assert data["buckets"]["<=25ms"] == 19
+    assert data["buckets"]["<=500ms"] == 1
+    assert data["buckets"][">10000ms"] == 0
+    assert len(data["buckets"]) == len(LATENCY_BUCKETS) + 1
+
+
+def test_overflow_percentile_reports_max() -> None:
+    histogram = LatencyHistogram()
+    histogram.observe(15.0)
+    assert histogram.percentile(0.5) == 15.0
+
+
+def test_stream_bytes_accumulate_in_one_entry() -> None:
+    metrics = GatewayMetrics()
+    metrics.record_stream_bytes(10)
+    stats = metrics.endpoints[STREAM_ENDPOINT]
+    metrics.record_stream_bytes(5)
+    assert metrics.endpoints[STREAM_ENDPOINT] is stats
+    assert stats.bytes_received == 15
+    assert stats.latency.count == 0
+    assert metrics.bytes_received == 15
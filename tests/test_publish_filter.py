@@ -0,0 +1,92 @@
+"""Tests des Totband-Filters."""
+
+import pytest
+
+from neoom.publish_filter import DeadBand, PublishFilter, parse_dead_bands
+from neoom.state_store import QUALITY_UNAVAILABLE, DataPointStore
+
+
+def _publish(publish_filter: PublishFilter, store: DataPointStore, value: float, now: float) -> bool:
+    """Setzt den Wert von Slot 0 und gibt zurück, ob er veröffentlicht wurde."""
+    changed = set()
+    store.apply([("dp", value, None)], changed)
+    result = publish_filter.filter(store, changed, now)
+    publish_filter.mark_published(result, store, now)
+    return 0 in result
+
+
+def test_parse_dead_bands() -> None:
+    assert parse_dead_bands("power=1%; voltage=0.5\ncurrent=0.05:1%") == {
+        "power": DeadBand(0.0, 0.01),
+        "voltage": DeadBand(0.5, 0.0),
+        "current": DeadBand(0.05, 0.01),
+    }
+    assert parse_dead_bands(None) == {}
+    for text in ("power", "power=x", "power=-1", "power=1:2:3"):
+        with pytest.raises(ValueError):
+            parse_dead_bands(text)
+
+
+def test_dead_band_is_relative_to_last_published_value() -> None:
+    store = DataPointStore()
+    publish_filter = PublishFilter()
+    publish_filter.set_dead_bands({0: DeadBand(0.5, 0.0)})
+
+    assert _publish(publish_filter, store, 10.0, 0.0)
+    assert not _publish(publish_filter, store, 10.3, 1.0)
+    # Langsames Driften summiert sich gegenüber dem veröffentlichten Wert auf.
+    assert _publish(publish_filter, store, 10.6, 2.0)
+    assert not _publish(publish_filter, store, 10.2, 3.0)
+
+
+def test_relative_dead_band_uses_larger_limit() -> None:
+    store = DataPointStore()
+    publish_filter = PublishFilter()
+    publish_filter.set_dead_bands({0: DeadBand(1.0, 0.01)})
+
+    assert _publish(publish_filter, store, 1000.0, 0.0)
+    assert not _publish(publish_filter, store, 1009.0, 1.0)
+    assert _publish(publish_filter, store, 1011.0, 2.0)
+
+
+def test_first_value_after_outage_is_published() -> None:
+    store = DataPointStore()
+    publish_filter = PublishFilter()
+    publish_filter.set_dead_bands({0: DeadBand(0.5, 0.0)})
+    assert _publish(publish_filter, store, 10.0, 0.0)
+
+    store.clear(0, QUALITY_UNAVAILABLE)
+    result = publish_filter.filter(store, {0}, 1.0)
+    assert result == {0}
+    publish_filter.mark_published(result, store, 1.0)
+
+    assert _publish(publish_filter, store, 10.0, 2.0)
+
+
+def test_min_interval_holds_change_until_due() -> None:
+    store = DataPointStore()
+    publish_filter = PublishFilter(min_interval=10.0)
+
+    assert _publish(publish_filter, store, 1.0, 0.0)
+    assert not _publish(publish_filter, store, 2.0, 5.0)
+    # Der zurückgehaltene Wert wird ohne neue Änderung nachgereicht, sobald er fällig ist.
+    assert publish_filter.filter(store, set(), 9.0) == set()
+    assert publish_filter.filter(store, set(), 10.0) == {0}
+
+
+def test_inactive_filter_passes_changes_through() -> None:
+    publish_filter = PublishFilter()
+    changed = {1, 2}
+    assert not publish_filter.active
+    assert publish_filter.filter(DataPointStore(), changed, 0.0) is changed
+
+
+def test_pending_while_change_is_held() -> None:
+    store = DataPointStore()
+    publish_filter = PublishFilter(min_interval=10.0)
+    assert _publish(publish_filter, store, 1.0, 0.0)
+    assert not publish_filter.pending
+    assert not _publish(publish_filter, store, 2.0, 5.0)
+    assert publish_filter.pending
+    publish_filter.mark_published(publish_filter.filter(store, set(), 10.0), store, 10.0)
+    assert not publish_filter.pending
@@ -0,0 +1,62 @@
+"""Tests des Werte-Speichers."""
+
+import time
+
+from neoom.state_store import QUALITY_GOOD, QUALITY_MISSING, QUALITY_UNAVAILABLE, DataPointStore
+
+
+def test_resolve_assigns_stable_slots() -> None:
+    store = DataPointStore()
+    assert store.resolve("a") == 0
+    assert store.resolve("b") == 1
+    assert store.resolve("a") == 0
+    assert store.slot("c") is None
+    assert len(store) == 2
+    assert store.qualities == [QUALITY_MISSING, QUALITY_MISSING]
+
+
+def test_apply_reports_only_changes() -> None:
+    store = DataPointStore()
+    changed = set()
+    store.apply([("a", 1, "t1"), ("b", 2, "t1")], changed)
+    assert changed == {0, 1}
+
+    changed = set()
+    store.apply([("a", 1, "t2"), ("b", 3, "t2")], changed)
+    assert changed == {1}
+    # Der Zeitstempel wird auch ohne Wertänderung übernommen.
+    assert store.get("a").timestamp == "t2"
+    assert store.get("b").value == 3
+    assert store.get("b").quality == QUALITY_GOOD
+
+
+def test_apply_after_clear_reports_change() -> None:
+    store = DataPointStore()
+    store.apply([("a", 1, None)], set())
+    assert store.clear(0, QUALITY_UNAVAILABLE)
+    assert not store.clear(0, QUALITY_UNAVAILABLE)
+
+    changed = set()
+    store.apply([("a", 1, None)], changed)
+    assert changed == {0}
+    assert store.qualities[0] == QUALITY_GOOD
+
+
+def test_expire_marks_only_stale_good_values() -> None:
+    store = DataPointStore()
+    store.apply([("old", 1, None), ("fresh", 2, None)], set())
+    store.resolve("missing")
+    store.updated_at[0] -= 100
+
+    changed = set()
+    store.expire(range(len(store)), time.monotonic() - 50, changed)
+    assert changed == {0}
+    assert store.values[0] is None
+    assert store.qualities[0] == QUALITY_UNAVAILABLE
+    assert store.qualities[1] == QUALITY_GOOD
+    assert store.qualities[2] == QUALITY_MISSING
+
+    # Bereits verworfene Werte werden nicht erneut gemeldet.
+    changed = set()
+    store.expire(range(len(store)), time.monotonic() - 50, changed)
+    assert changed == set()
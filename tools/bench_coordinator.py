@@ -0,0 +1,212 @@
+"""Misst die Kosten eines Abfragezyklus des NeoomLocalCoordinator gegen das Test-Gateway.
+
+Startet `tools/fake_beaam.py` als eigenen Prozess (damit dessen Rechenzeit nicht
+mitgemessen wird) und führt gegen dieses Gateway vollständige Zyklen des lokalen
+Koordinators aus. Je Konfiguration werden gemessen:
+- Laufzeit je Zyklus (Mittelwert und 95. Perzentil),
+- CPU-Zeit des Koordinators je Zyklus,
+- Speicher (tracemalloc): Spitze und Anzahl der Allokationen je Zyklus,
+- Fan-out: Anzahl der benachrichtigten Entitäten-Listener je Zyklus.
+
+In jedem Zyklus sind alle Geräte fällig (ungünstigster Fall der gestaffelten Abfrage).
+Mehrere Werte je Parameter ergeben eine Messreihe, z.B. um Skalierungsgrenzen zu finden.
+
+Benötigt eine Entwicklungsumgebung mit installiertem Home Assistant:
+    python tools/bench_coordinator.py --things 10 50 200 --datapoints 20 --latency 0.02 --cycles 30
+"""
+
+import argparse
+import asyncio
+import itertools
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import frame  # noqa: E402
+
+from custom_components.neoom.const import TRANSPORT_POLLING  # noqa: E402
+from custom_components.neoom.coordinator import (  # noqa: E402
+    DEFAULT_POLL_INTERVALS,
+    NeoomLocalCoordinator,
+)
+
+API_KEY = "bench-key"
+
+
+def _free_port() -> int:
+    """Ermittelt einen freien TCP-Port auf der Loopback-Schnittstelle."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gateway(
+    things: int, datapoints: int, latency: float, failure_rate: float, change_rate: float
+) -> Tuple["subprocess.Popen[bytes]", int]:
+    """Startet das Test-Gateway als Prozess und wartet, bis es Verbindungen annimmt."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(_ROOT / "tools" / "fake_beaam.py"),
+            "--port", str(port),
+            "--things", str(things),
+            "--datapoints", str(datapoints),
+            "--latency", str(latency),
+            "--failure-rate", str(failure_rate),
+            "--change-rate", str(change_rate),
+            "--key", API_KEY,
+            "--no-push",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Test-Gateway ist nicht gestartet.")
+
+
+async def _create_hass(config_dir: str) -> HomeAssistant:
+    """Erzeugt eine minimale Home Assistant Instanz (ohne Integrationen)."""
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        # Ältere Versionen erwarten das Konfigurationsverzeichnis als Attribut.
+        hass = HomeAssistant()  # type: ignore[call-arg]
+        hass.config.config_dir = config_dir
+    if hasattr(frame, "async_setup"):
+        frame.async_setup(hass)
+    return hass
+
+
+async def run_case(port: int, cycles: int, warmup: int) -> Dict[str, Any]:
+    """Führt die Zyklen gegen ein laufendes Test-Gateway aus und sammelt die Messwerte."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _create_hass(config_dir)
+        coordinator = NeoomLocalCoordinator(
+            hass,
+            entry_id="bench",
+            ip=f"127.0.0.1:{port}",
+            key=API_KEY,
+            # Lange Intervalle, damit kein geplanter Refresh in die Messung fällt.
+            poll_intervals={tier: 3600 for tier in DEFAULT_POLL_INTERVALS},
+            flow_interval=0,
+            transport_mode=TRANSPORT_POLLING,
+            # Feste Intervalle: Der adaptive Faktor soll die Messung nicht verschieben.
+            adaptive_polling=False,
+        )
+
+        # Erster Zyklus lädt die Konfiguration; danach je Datenpunkt ein Listener wie bei den Entitäten.
+        await coordinator.async_refresh()
+        notified = itertools.count()
+        for dp_id in coordinator.state_store.dp_ids:
+            coordinator.async_add_listener(
+                lambda: next(notified), context=coordinator.state_store.slot(dp_id)
+            )
+
+        async def cycle() -> None:
+            # Alle Geräte fällig machen, damit jeder Zyklus die volle Abfrage enthält.
+            coordinator.async_mark_all_due()
+            await coordinator.async_refresh()
+
+        for _ in range(warmup):
+            await cycle()
+
+        # Durchlauf 1: Laufzeit und CPU-Zeit (ohne tracemalloc, das selbst Zeit kostet).
+        walls: List[float] = []
+        cpus: List[float] = []
+        fanout_start = next(notified)
+        for _ in range(cycles):
+            wall, cpu = time.perf_counter(), time.process_time()
+            await cycle()
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+        fanout = (next(notified) - fanout_start - 1) / cycles
+
+        # Durchlauf 2: Allokationen und Speicher-Spitze.
+        tracemalloc.start()
+        peaks: List[int] = []
+        blocks: List[int] = []
+        for _ in range(cycles):
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            base, _ = tracemalloc.get_traced_memory()
+            await cycle()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            peaks.append(peak - base)
+            blocks.append(
+                sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+            )
+        tracemalloc.stop()
+
+        failed = not coordinator.last_update_success
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    walls.sort()
+    return {
+        "wall_mean": statistics.mean(walls),
+        "wall_p95": walls[min(len(walls) - 1, int(len(walls) * 0.95))],
+        "cpu_mean": statistics.mean(cpus),
+        "peak": statistics.mean(peaks),
+        "blocks": statistics.mean(blocks),
+        "fanout": fanout,
+        "datapoints": len(coordinator.state_store),
+        "failed": failed,
+    }
+
+
+def main() -> None:
+    """Führt die Messreihe aus und gibt eine Tabelle aus."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--things", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--datapoints", type=int, nargs="+", default=[20], help="Datenpunkte je Gerät")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.0], help="Antwortzeit je Anfrage (s)")
+    parser.add_argument("--failure-rate", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--change-rate", type=float, default=0.3, help="Anteil geänderter Werte je Abfrage")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'Things':>6} {'DP/Thing':>8} {'Latenz':>7} {'Fehler':>6} | {'Zeit':>9} {'p95':>9}"
+        f" {'CPU':>9} {'Peak':>10} {'Allok.':>8} {'Fan-out':>8}"
+    )
+    for things, datapoints, latency, failure_rate in itertools.product(
+        args.things, args.datapoints, args.latency, args.failure_rate
+    ):
+        process, port = start_gateway(things, datapoints, latency, failure_rate, args.change_rate)
+        try:
+            result = asyncio.run(run_case(port, args.cycles, args.warmup))
+        finally:
+            process.terminate()
+            process.wait()
+
+        print(
+            f"{things:>6} {datapoints:>8} {latency * 1e3:>5.0f}ms {failure_rate:>6.0%} |"
+            f" {result['wall_mean'] * 1e3:>6.1f} ms {result['wall_p95'] * 1e3:>6.1f} ms"
+            f" {result['cpu_mean'] * 1e3:>6.1f} ms {result['peak'] / 1024:>6.0f} KiB"
+            f" {result['blocks']:>8.0f} {result['fanout']:>8.0f}"
+            + ("  (Zyklus fehlgeschlagen)" if result["failed"] else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
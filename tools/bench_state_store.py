@@ -0,0 +1,158 @@
+"""Vergleicht die alte dict-of-dicts `state_map` mit dem kompakten DataPointStore.
+
+Simuliert mehrere Abfragezyklen eines BEAAM Gateways mit vielen Datenpunkten und
+misst je Variante die Laufzeit und den Speicher (tracemalloc) für:
+- das Dekodieren und Übernehmen der Gateway-Antworten,
+- das Ermitteln der geänderten Datenpunkte,
+- das Lesen des Werts durch jede benachrichtigte Entität.
+
+"Gehalten" ist der Speicher, den der Zustand zwischen zwei Zyklen belegt;
+"Peak" die Spitze während eines Laufs.
+
+Aufruf (ohne Home Assistant lauffähig):
+    python tools/bench_state_store.py --things 40 --datapoints 25 --cycles 200
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+# Das Modul wird direkt aus der Datei geladen, damit das Paket (und damit
+# Home Assistant) für den Benchmark nicht importiert werden muss.
+_STORE_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "neoom" / "state_store.py"
+_spec = importlib.util.spec_from_file_location("neoom_state_store", _STORE_PATH)
+assert _spec is not None and _spec.loader is not None
+state_store = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(state_store)
+
+
+Payloads = List[List[bytes]]
+
+
+def build_payloads(
+    things: int, datapoints: int, cycles: int, change_rate: float, seed: int
+) -> Tuple[List[str], Payloads]:
+    """Erzeugt die Datenpunkt-IDs und je Zyklus die rohen `/states` Antworten aller Things."""
+    rng = random.Random(seed)
+    dp_ids = [f"thing{t}-dp{d}" for t in range(things) for d in range(datapoints)]
+    values = {dp_id: float(rng.randint(0, 5000)) for dp_id in dp_ids}
+
+    payloads: Payloads = []
+    for cycle in range(cycles):
+        cycle_payload: List[bytes] = []
+        for t in range(things):
+            items = []
+            for d in range(datapoints):
+                dp_id = dp_ids[t * datapoints + d]
+                if rng.random() < change_rate:
+                    values[dp_id] = float(rng.randint(0, 5000))
+                items.append(
+                    {
+                        "dataPointId": dp_id,
+                        "key": f"KEY_{d}",
+                        "value": values[dp_id],
+                        "timestamp": f"2026-01-01T00:00:{cycle % 60:02d}Z",
+                        "unitOfMeasure": "W",
+                    }
+                )
+            cycle_payload.append(json.dumps({"states": items}).encode())
+        payloads.append(cycle_payload)
+    return dp_ids, payloads
+
+
+def run_state_map(dp_ids: List[str], payloads: Payloads) -> Tuple[int, Any]:
+    """Bisheriges Verfahren: neue Map je Zyklus, Diff über die Objekte, verschachtelter Lesezugriff."""
+    data: Dict[str, Any] = {}
+    notified = 0
+    for cycle_payload in payloads:
+        state_map: Dict[str, Any] = dict(data.get("states", {}))
+        for raw in cycle_payload:
+            for item in json.loads(raw)["states"]:
+                state_map[item["dataPointId"]] = item
+
+        previous: Dict[str, Any] = data.get("states", {})
+        changed: Set[str] = {
+            dp_id
+            for dp_id, item in state_map.items()
+            if dp_id not in previous or previous[dp_id].get("value") != item.get("value")
+        }
+        data = {"config": None, "states": state_map}
+
+        for dp_id in dp_ids:
+            if dp_id in changed:
+                data_point = data.get("states", {}).get(dp_id)
+                if data_point:
+                    data_point.get("value")
+                notified += 1
+    return notified, data
+
+
+def run_store(dp_ids: List[str], payloads: Payloads) -> Tuple[int, Any]:
+    """Neues Verfahren: feste Slots, Änderungen direkt beim Übernehmen erkannt, Lesen über den Slot."""
+    store = state_store.DataPointStore()
+    entity_slots = [store.resolve(dp_id) for dp_id in dp_ids]
+    notified = 0
+    for cycle_payload in payloads:
+        changed: Set[int] = set()
+        for raw in cycle_payload:
+            store.apply(json.loads(raw)["states"], changed)
+
+        values = store.values
+        for slot in entity_slots:
+            if slot in changed:
+                values[slot]
+                notified += 1
+    return notified, store
+
+
+def measure(
+    func: Callable[[List[str], Payloads], Tuple[int, Any]],
+    dp_ids: List[str],
+    payloads: Payloads,
+) -> Tuple[float, int, int, int]:
+    """Misst Laufzeit, gehaltenen Speicher, Speicher-Spitze und die Anzahl der Benachrichtigungen."""
+    start = time.perf_counter()
+    func(dp_ids, payloads)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    notified, state = func(dp_ids, payloads)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+
+    return elapsed, retained - base, peak - base, notified
+
+
+def main() -> None:
+    """Führt den Vergleich aus und gibt eine Tabelle aus."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--things", type=int, default=40)
+    parser.add_argument("--datapoints", type=int, default=25, help="Datenpunkte je Thing")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--change-rate", type=float, default=0.2, help="Anteil geänderter Werte je Zyklus")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    dp_ids, payloads = build_payloads(args.things, args.datapoints, args.cycles, args.change_rate, args.seed)
+    print(
+        f"{len(dp_ids)} Datenpunkte, {args.cycles} Zyklen, Änderungsrate {args.change_rate:.0%}\n"
+    )
+    print(f"{'Variante':<12} {'Zeit/Zyklus':>12} {'Gehalten':>12} {'Peak':>12} {'Updates':>10}")
+
+    for name, func in (("state_map", run_state_map), ("store", run_store)):
+        elapsed, retained, peak, notified = measure(func, dp_ids, payloads)
+        print(
+            f"{name:<12} {elapsed / args.cycles * 1e3:>9.2f} ms {retained / 1024:>8.1f} KiB"
+            f" {peak / 1024:>8.1f} KiB {notified:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Lokales Test-Gateway, das die HTTP-API eines BEAAM Gateways nachbildet.
+
+Stellt die Endpunkte bereit, die die Integration verwendet:
+- GET  /api/v1/site/configuration   (mit ETag / "304 Not Modified")
+- GET  /api/v1/site/state           (Energiefluss der Site)
+- GET  /api/v1/things/{id}/states   (Zustände eines Geräts)
+- POST /api/v1/things/{id}/commands (Befehle als JSON-Array)
+- GET  /api/v1/site/stream          (Push-Kanal per Server-Sent Events, abschaltbar)
+
+Anzahl der Geräte und Datenpunkte, Antwortzeit und Fehlerquote sind einstellbar,
+sodass sich die Integration ohne echte Hardware testen und vermessen lässt
+(siehe auch `tools/bench_coordinator.py`).
+
+Aufruf:
+    python tools/fake_beaam.py --things 10 --datapoints 20 --latency 0.05 --port 8080
+
+In Home Assistant anschließend als BEAAM IP `127.0.0.1:8080` und als API Key
+den Wert von `--key` eintragen.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from aiohttp import web
+
+# Gerätetypen, die reihum vergeben werden.
+THING_TYPES: List[str] = ["INVERTER", "BATT_INVERTER", "ELECTRICITY_METER", "CHARGING_STATION"]
+
+# Vorlagen für Datenpunkte: (Schlüssel, Einheit, Datentyp, steuerbar)
+DATAPOINT_TEMPLATES: List[Tuple[str, str, str, bool]] = [
+    ("POWER", "W", "NUMBER", False),
+    ("ENERGY_IMPORTED", "Wh", "NUMBER", False),
+    ("ENERGY_EXPORTED", "Wh", "NUMBER", False),
+    ("VOLTAGE_L1", "V", "NUMBER", False),
+    ("CURRENT_L1", "A", "NUMBER", False),
+    ("FREQUENCY", "Hz", "NUMBER", False),
+    ("STATE_OF_CHARGE", "%", "NUMBER", False),
+    ("MAX_POWER_CHARGE", "W", "NUMBER", True),
+    ("PHASE_SWITCHING_MODE", "", "STRING", True),
+    ("SERIAL_NUMBER", "", "STRING", False),
+]
+
+# Schlüssel des Energieflusses der Site.
+ENERGY_FLOW_KEYS: List[Tuple[str, str]] = [
+    ("POWER_PRODUCTION", "W"),
+    ("POWER_CONSUMPTION", "W"),
+    ("POWER_GRID", "W"),
+    ("POWER_STORAGE", "W"),
+    ("STATE_OF_CHARGE", "%"),
+]
+
+
+class FakeBeaam:
+    """Zustand und Request-Handler des Test-Gateways."""
+
+    def __init__(
+        self,
+        things: int = 10,
+        datapoints: int = 10,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        change_rate: float = 0.3,
+        key: str = "test-key",
+        push: bool = True,
+        push_interval: float = 1.0,
+        seed: int = 1,
+    ) -> None:
+        """Initialisiert das Test-Gateway.
+
+        Args:
+            things: Anzahl der Geräte.
+            datapoints: Anzahl der Datenpunkte je Gerät.
+            latency: Mittlere Antwortzeit (Sekunden) je Anfrage.
+            failure_rate: Anteil der Geräte-Abfragen, die mit "503" beantwortet werden.
+            change_rate: Anteil der Werte, die sich zwischen zwei Abfragen ändern.
+            key: Der erwartete API Key.
+            push: Ob der Push-Kanal angeboten wird.
+            push_interval: Abstand (Sekunden) der Push-Nachrichten.
+            seed: Startwert des Zufallsgenerators (reproduzierbare Läufe).
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.change_rate = change_rate
+        self.key = key
+        self.push = push
+        self.push_interval = push_interval
+        self._rng = random.Random(seed)
+
+        # Zähler je Endpunkt und gesendete Bytes, z.B. für Benchmarks.
+        self.requests: Counter = Counter()
+        self.bytes_sent: int = 0
+
+        self.config: Dict[str, Any] = {"energyFlow": {"dataPoints": {}}, "things": {}}
+        # Aktuelle Werte je Datenpunkt-ID und die Datenpunkte je Gerät.
+        self.values: Dict[str, Any] = {}
+        self._keys: Dict[str, str] = {}
+        self._thing_dps: Dict[str, List[str]] = {}
+        self._flow_dps: List[str] = []
+
+        for key_name, unit in ENERGY_FLOW_KEYS:
+            dp_id = f"energy-flow-{key_name.lower()}"
+            self.config["energyFlow"]["dataPoints"][dp_id] = {
+                "key": key_name,
+                "unitOfMeasure": unit,
+                "dataType": "NUMBER",
+                "controllable": False,
+            }
+            self._flow_dps.append(dp_id)
+            self._keys[dp_id] = key_name
+            self.values[dp_id] = self._initial_value(key_name, "NUMBER")
+
+        for t in range(things):
+            thing_id = f"thing-{t:04d}"
+            thing_dps: Dict[str, Any] = {}
+            for d in range(datapoints):
+                key_name, unit, data_type, controllable = DATAPOINT_TEMPLATES[d % len(DATAPOINT_TEMPLATES)]
+                if d >= len(DATAPOINT_TEMPLATES):
+                    key_name = f"{key_name}_{d // len(DATAPOINT_TEMPLATES)}"
+                dp_id = f"{thing_id}-dp{d:03d}"
+                thing_dps[dp_id] = {
+                    "key": key_name,
+                    "unitOfMeasure": unit,
+                    "dataType": data_type,
+                    "controllable": controllable,
+                }
+                self._keys[dp_id] = key_name
+                self.values[dp_id] = self._initial_value(key_name, data_type)
+
+            self.config["things"][thing_id] = {
+                "type": THING_TYPES[t % len(THING_TYPES)],
+                "name": f"Fake {THING_TYPES[t % len(THING_TYPES)].title()} {t}",
+                "dataPoints": thing_dps,
+            }
+            self._thing_dps[thing_id] = list(thing_dps)
+
+        self._config_body = json.dumps(self.config).encode()
+        self.etag = '"' + hashlib.sha256(self._config_body).hexdigest()[:16] + '"'
+        self._timestamp = 0
+
+    def _initial_value(self, key_name: str, data_type: str) -> Any:
+        """Erzeugt einen plausiblen Startwert für einen Datenpunkt."""
+        if key_name.startswith("PHASE_SWITCHING_MODE"):
+            return "AUTO"
+        if data_type == "STRING":
+            return f"SN-{self._rng.randint(100000, 999999)}"
+        return float(self._rng.randint(0, 5000))
+
+    def _states(self, dp_ids: List[str]) -> List[Dict[str, Any]]:
+        """Ändert einen Teil der Werte zufällig und gibt die Zustandsobjekte zurück."""
+        self._timestamp += 1
+        timestamp = f"2026-01-01T00:00:00.{self._timestamp % 1000000:06d}Z"
+        states: List[Dict[str, Any]] = []
+        for dp_id in dp_ids:
+            value = self.values[dp_id]
+            if isinstance(value, float) and self._rng.random() < self.change_rate:
+                value = self.values[dp_id] = float(self._rng.randint(0, 5000))
+            states.append(
+                {"dataPointId": dp_id, "key": self._keys[dp_id], "value": value, "timestamp": timestamp}
+            )
+        return states
+
+    async def _delay(self) -> None:
+        """Simuliert die Antwortzeit des Gateways (±50 %)."""
+        if self.latency > 0:
+            await asyncio.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Prüft den Bearer Token der Anfrage."""
+        return request.headers.get("Authorization") == f"Bearer {self.key}"
+
+    def _json(self, payload: Any) -> web.Response:
+        """Serialisiert eine Antwort und zählt die gesendeten Bytes."""
+        body = json.dumps(payload).encode()
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    async def handle_configuration(self, request: web.Request) -> web.Response:
+        """GET /api/v1/site/configuration"""
+        self.requests["configuration"] += 1
+        if not self._authorized(request):
+            return web.Response(status=401)
+        await self._delay()
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers={"ETag": self.etag})
+        self.bytes_sent += len(self._config_body)
+        return web.Response(
+            body=self._config_body, content_type="application/json", headers={"ETag": self.etag}
+        )
+
+    async def handle_site_state(self, request: web.Request) -> web.Response:
+        """GET /api/v1/site/state"""
+        self.requests["site_state"] += 1
+        if not self._authorized(request):
+            return web.Response(status=401)
+        await self._delay()
+        return self._json({"energyFlow": {"states": self._states(self._flow_dps)}})
+
+    async def handle_thing_states(self, request: web.Request) -> web.Response:
+        """GET /api/v1/things/{thing_id}/states"""
+        self.requests["thing_states"] += 1
+        if not self._authorized(request):
+            return web.Response(status=401)
+        thing_id = request.match_info["thing_id"]
+        if thing_id not in self._thing_dps:
+            return web.Response(status=404)
+        await self._delay()
+        if self._rng.random() < self.failure_rate:
+            self.requests["thing_states_failed"] += 1
+            return web.Response(status=503)
+        return self._json({"states": self._states(self._thing_dps[thing_id])})
+
+    async def handle_commands(self, request: web.Request) -> web.Response:
+        """POST /api/v1/things/{thing_id}/commands"""
+        self.requests["commands"] += 1
+        if not self._authorized(request):
+            return web.Response(status=401)
+        thing_id = request.match_info["thing_id"]
+        if thing_id not in self._thing_dps:
+            return web.Response(status=404)
+        commands: List[Dict[str, Any]] = await request.json()
+        await self._delay()
+        by_key = {self._keys[dp_id]: dp_id for dp_id in self._thing_dps[thing_id]}
+        for command in commands:
+            dp_id = by_key.get(command.get("key", ""))
+            if dp_id is None:
+                return web.Response(status=400, text=f"Unbekannter Schlüssel {command.get('key')}")
+            self.values[dp_id] = command.get("value")
+        return self._json({})
+
+    async def handle_stream(self, request: web.Request) -> web.StreamResponse:
+        """GET /api/v1/site/stream (Server-Sent Events)"""
+        self.requests["stream"] += 1
+        if not self.push:
+            return web.Response(status=404)
+        if not self._authorized(request):
+            return web.Response(status=401)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        try:
+            while True:
+                payload = json.dumps({"energyFlow": {"states": self._states(self._flow_dps)}})
+                message = f"data: {payload}\n\n".encode()
+                self.bytes_sent += len(message)
+                await response.write(message)
+                await asyncio.sleep(self.push_interval)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        return response
+
+    def make_app(self) -> web.Application:
+        """Erzeugt die aiohttp Anwendung mit allen Endpunkten."""
+        app = web.Application()
+        app.router.add_get("/api/v1/site/configuration", self.handle_configuration)
+        app.router.add_get("/api/v1/site/state", self.handle_site_state)
+        app.router.add_get("/api/v1/site/stream", self.handle_stream)
+        app.router.add_get("/api/v1/things/{thing_id}/states", self.handle_thing_states)
+        app.router.add_post("/api/v1/things/{thing_id}/commands", self.handle_commands)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[web.AppRunner, int]:
+        """Startet das Gateway im laufenden Event-Loop.
+
+        Args:
+            host: Die Adresse, an die der Server gebunden wird.
+            port: Der Port (0 = freien Port wählen).
+
+        Returns:
+            Den Runner (zum Beenden per `runner.cleanup()`) und den tatsächlichen Port.
+        """
+        runner = web.AppRunner(self.make_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner, runner.addresses[0][1]
+
+
+def main() -> None:
+    """Startet das Test-Gateway auf der Kommandozeile."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--things", type=int, default=10)
+    parser.add_argument("--datapoints", type=int, default=10, help="Datenpunkte je Gerät")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mittlere Antwortzeit in Sekunden")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Anteil fehlschlagender Geräte-Abfragen")
+    parser.add_argument("--change-rate", type=float, default=0.3, help="Anteil geänderter Werte je Abfrage")
+    parser.add_argument("--key", default="test-key", help="Erwarteter API Key")
+    parser.add_argument("--no-push", action="store_true", help="Push-Kanal (SSE) nicht anbieten")
+    parser.add_argument("--push-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    gateway = FakeBeaam(
+        things=args.things,
+        datapoints=args.datapoints,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        change_rate=args.change_rate,
+        key=args.key,
+        push=not args.no_push,
+        push_interval=args.push_interval,
+        seed=args.seed,
+    )
+    web.run_app(gateway.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()